@@ -0,0 +1,217 @@
+"""
+Bootcamp F2025
+
+Main process running all the workers as tasks in one event loop,
+instead of one process each as in bootcamp_main.py
+"""
+
+import asyncio
+
+from modules.common.modules.logger import logger
+from modules.common.modules.logger import logger_main_setup
+from modules.common.modules.read_yaml import read_yaml
+
+from modules.command import command
+from modules.command import command_async_worker
+from modules.heartbeat import heartbeat_receiver_async_worker
+from modules.heartbeat import heartbeat_sender_async_worker
+from modules.router import async_mavlink_transport
+from modules.router import mavlink_transport_async_worker
+from modules.telemetry import telemetry_async_worker
+from utilities.workers import async_worker_controller
+from utilities.workers import async_worker_manager
+from utilities.workers import worker_manager
+
+
+# MAVLink connection, only TCP is supported
+CONNECTION_STRING = "tcp:localhost:12345"
+# Time to wait for the drone's first heartbeat
+CONNECTION_TIMEOUT = 30  # seconds
+
+# Set queue max sizes (> 0, a full heartbeat or telemetry queue drops its oldest item)
+HEARTBEAT_TO_MAIN_QUEUE_SIZE = 1
+TELEMETRY_TO_COMMAND_QUEUE_SIZE = 5
+COMMAND_TO_MAIN_QUEUE_SIZE = 5
+
+# Set worker counts
+HEARTBEAT_SENDER_COUNT = 1
+HEARTBEAT_RECEIVER_COUNT = 1
+TELEMETRY_COUNT = 1
+COMMAND_COUNT = 1
+
+# Run time before stopping
+RUN_TIME = 100  # seconds
+# Time to wait for workers to finish when stopping, then they are cancelled
+SHUTDOWN_TIMEOUT = 1  # seconds
+
+TARGET = command.Position(0, 0, 0)
+
+
+async def run(main_logger: logger.Logger) -> int:
+    """
+    Runs the workers until the run time is over or the drone disconnects.
+    """
+    try:
+        transport = await async_mavlink_transport.AsyncMavlinkTransport.open(CONNECTION_STRING)
+    except (ValueError, OSError) as e:
+        main_logger.error(f"Failed to connect: {e}")
+        return -1
+
+    controller = async_worker_controller.AsyncWorkerController()
+    # Only the transport worker receives, the other workers subscribe to message types
+    startup_connection = transport.subscribe(["HEARTBEAT"], 1)
+    heartbeat_sender_connection = transport.subscribe([])
+    # Only the newest heartbeat matters, older ones would hide a disconnect
+    heartbeat_receiver_connection = transport.subscribe(["HEARTBEAT"], 1)
+    telemetry_connection = transport.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"])
+    command_connection = transport.subscribe(["COMMAND_ACK"])
+
+    # Create queues
+    heartbeat_to_main_queue = asyncio.Queue(HEARTBEAT_TO_MAIN_QUEUE_SIZE)
+    telemetry_to_command_queue = asyncio.Queue(TELEMETRY_TO_COMMAND_QUEUE_SIZE)
+    command_to_main_queue = asyncio.Queue(COMMAND_TO_MAIN_QUEUE_SIZE)
+
+    # Target, count, work arguments, input queues, output queues of each worker type
+    # The transport is first so no message is missed
+    worker_types = [
+        (mavlink_transport_async_worker.mavlink_transport_async_worker, 1, (transport,), [], []),
+        (
+            heartbeat_sender_async_worker.heartbeat_sender_async_worker,
+            HEARTBEAT_SENDER_COUNT,
+            (heartbeat_sender_connection,),
+            [],
+            [],
+        ),
+        (
+            heartbeat_receiver_async_worker.heartbeat_receiver_async_worker,
+            HEARTBEAT_RECEIVER_COUNT,
+            (heartbeat_receiver_connection,),
+            [],
+            [heartbeat_to_main_queue],
+        ),
+        (
+            telemetry_async_worker.telemetry_async_worker,
+            TELEMETRY_COUNT,
+            (telemetry_connection,),
+            [],
+            [telemetry_to_command_queue],
+        ),
+        (
+            command_async_worker.command_async_worker,
+            COMMAND_COUNT,
+            (command_connection, TARGET),
+            [telemetry_to_command_queue],
+            [command_to_main_queue],
+        ),
+    ]
+
+    worker_managers: "list[async_worker_manager.AsyncWorkerManager]" = []
+    for target, count, work_arguments, input_queues, output_queues in worker_types:
+        result, properties = worker_manager.WorkerProperties.create(
+            count=count,
+            target=target,
+            work_arguments=work_arguments,
+            input_queues=input_queues,
+            output_queues=output_queues,
+            controller=controller,
+            local_logger=main_logger,
+        )
+        if not result:
+            main_logger.error(f"Failed to create arguments for {target.__name__}")
+            await transport.close()
+            return -1
+
+        # Get Pylance to stop complaining
+        assert properties is not None
+
+        result, manager = async_worker_manager.AsyncWorkerManager.create(properties, main_logger)
+        if not result:
+            main_logger.error(f"Failed to create manager for {target.__name__}")
+            await transport.close()
+            return -1
+
+        # Get Pylance to stop complaining
+        assert manager is not None
+
+        worker_managers.append(manager)
+
+    # Receive the drone's first heartbeat before starting the rest
+    worker_managers[0].start_workers()
+    if await startup_connection.recv_match(timeout=CONNECTION_TIMEOUT) is None:
+        main_logger.error("No heartbeat from the drone")
+        controller.request_exit()
+        await worker_managers[0].join_workers(SHUTDOWN_TIMEOUT)
+        await transport.close()
+        return -1
+
+    for manager in worker_managers[1:]:
+        manager.start_workers()
+
+    main_logger.info("Started")
+
+    # Main's work: log the commands, and stop when the drone disconnects or the run time is over
+    async def log_commands() -> None:
+        while True:
+            main_logger.info(await command_to_main_queue.get())
+
+    async def wait_for_disconnect() -> None:
+        while await heartbeat_to_main_queue.get() != "Disconnected":
+            pass
+
+    command_logger = asyncio.create_task(log_commands())
+    try:
+        await asyncio.wait_for(wait_for_disconnect(), RUN_TIME)
+        main_logger.info("Drone disconnected")
+    except asyncio.TimeoutError:
+        pass
+
+    # Stop the tasks
+    controller.request_exit()
+    main_logger.info("Requested exit")
+
+    for manager in worker_managers:
+        await manager.join_workers(SHUTDOWN_TIMEOUT)
+
+    # Log the commands sent until then
+    command_logger.cancel()
+    await asyncio.gather(command_logger, return_exceptions=True)
+    while not command_to_main_queue.empty():
+        main_logger.info(command_to_main_queue.get_nowait())
+
+    await transport.close()
+    main_logger.info("Stopped")
+
+    return 0
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    # Configuration settings
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    if not result:
+        print("ERROR: Failed to load configuration file")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert config is not None
+
+    # Setup main logger
+    result, main_logger, _ = logger_main_setup.setup_main_logger(config)
+    if not result:
+        print("ERROR: Failed to create main logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert main_logger is not None
+
+    return asyncio.run(run(main_logger))
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -5,7 +5,7 @@ Main process to setup and manage all the other working processes
 """
 
 import multiprocessing as mp
-import queue
+import pathlib
 import time
 
 from pymavlink import mavutil
@@ -14,12 +14,16 @@ from modules.common.modules.logger import logger
 from modules.common.modules.logger import logger_main_setup
 from modules.common.modules.read_yaml import read_yaml
 
-# from modules.command import command ### didnt use it and pylint was getting mad
+from modules.command import command
 from modules.command import command_worker
 from modules.heartbeat import heartbeat_receiver_worker
 from modules.heartbeat import heartbeat_sender_worker
+from modules.router import mavlink_router
+from modules.router import mavlink_router_worker
 from modules.telemetry import telemetry_worker
+from utilities.workers import queue_notifier
 from utilities.workers import queue_proxy_wrapper
+from utilities.workers import queue_statistics
 from utilities.workers import worker_controller
 from utilities.workers import worker_manager
 
@@ -36,12 +40,37 @@ HEARTBEAT_TO_MAIN_QUEUE_SIZE = 1
 TELEMETRY_TO_COMMAND_QUEUE_SIZE = 5
 COMMAND_TO_MAIN_QUEUE_SIZE = 5
 
+# Set queue backends (shared memory requires a size > 0, conflating ignores the size)
+HEARTBEAT_TO_MAIN_QUEUE_BACKEND = queue_proxy_wrapper.QueueBackend.MANAGER
+# Command only acts on the newest telemetry, so telemetry never waits for it
+TELEMETRY_TO_COMMAND_QUEUE_BACKEND = queue_proxy_wrapper.QueueBackend.CONFLATING
+COMMAND_TO_MAIN_QUEUE_BACKEND = queue_proxy_wrapper.QueueBackend.MANAGER
+
+# Set what puts do when a queue is full
+# Main only needs the newest status, so the heartbeat receiver never waits for it
+HEARTBEAT_TO_MAIN_QUEUE_OVERFLOW_POLICY = queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+COMMAND_TO_MAIN_QUEUE_OVERFLOW_POLICY = queue_proxy_wrapper.OverflowPolicy.BLOCK
+
 # Set worker counts
 HEARTBEAT_SENDER_COUNT = 1
 HEARTBEAT_RECEIVER_COUNT = 1
 TELEMETRY_COUNT = 1
 COMMAND_COUNT = 1
 # Any other constants
+# Run time before stopping
+RUN_TIME = 100  # seconds
+# Most items main takes from a queue each time it is ready
+MAIN_GET_BATCH_SIZE = 16
+# Time to wait for workers to send what is left when stopping
+SHUTDOWN_TIMEOUT = 1  # seconds
+# Position the drone climbs to and faces
+TARGET = command.Position(0, 0, 0)
+
+# Record depth, rates, blocked/waiting time and dwell time of each queue
+QUEUE_STATISTICS_ENABLED = True
+QUEUE_STATISTICS_PERIOD = 10  # seconds
+# Statistics are dumped here on shutdown
+QUEUE_STATISTICS_DIRECTORY = pathlib.Path("logs")
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -83,24 +112,77 @@ def main() -> int:
     # =============================================================================================
     # Create a worker controller
     controller = worker_controller.WorkerController()
+    # Only the router worker uses the connection, the other workers subscribe to message types
+    # Routed messages and exit requests both wake up workers blocked on the controller
+    router = mavlink_router.MavlinkRouter(notifier=controller.notifier)
+    heartbeat_sender_connection = router.subscribe([])
+    heartbeat_receiver_connection = router.subscribe(["HEARTBEAT"])
+    telemetry_connection = router.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"])
+    command_connection = router.subscribe(["COMMAND_ACK"])
     # Create a multiprocess manager for synchronized queues
     mp_manager = mp.Manager()
     # Create queues
+    # Main waits on its input queues together, puts into them wake it up
+    main_notifier = queue_notifier.QueueNotifier()
 
     ###Here im creating queues under the main mp_manager. All with the sizes stored in the constants above
     heartbeat_to_main_queue = queue_proxy_wrapper.QueueProxyWrapper(
-        mp_manager, HEARTBEAT_TO_MAIN_QUEUE_SIZE
+        mp_manager,
+        HEARTBEAT_TO_MAIN_QUEUE_SIZE,
+        HEARTBEAT_TO_MAIN_QUEUE_BACKEND,
+        statistics_name="heartbeat_to_main" if QUEUE_STATISTICS_ENABLED else None,
+        overflow_policy=HEARTBEAT_TO_MAIN_QUEUE_OVERFLOW_POLICY,
+        notifier=main_notifier,
+        producer_count=HEARTBEAT_RECEIVER_COUNT,
     )
 
     telemetry_to_command_queue = queue_proxy_wrapper.QueueProxyWrapper(
-        mp_manager, TELEMETRY_TO_COMMAND_QUEUE_SIZE
+        mp_manager,
+        TELEMETRY_TO_COMMAND_QUEUE_SIZE,
+        TELEMETRY_TO_COMMAND_QUEUE_BACKEND,
+        statistics_name="telemetry_to_command" if QUEUE_STATISTICS_ENABLED else None,
+        notifier=controller.notifier,
+        producer_count=TELEMETRY_COUNT,
     )
 
     command_to_main_queue = queue_proxy_wrapper.QueueProxyWrapper(
-        mp_manager, COMMAND_TO_MAIN_QUEUE_SIZE
+        mp_manager,
+        COMMAND_TO_MAIN_QUEUE_SIZE,
+        COMMAND_TO_MAIN_QUEUE_BACKEND,
+        statistics_name="command_to_main" if QUEUE_STATISTICS_ENABLED else None,
+        overflow_policy=COMMAND_TO_MAIN_QUEUE_OVERFLOW_POLICY,
+        notifier=main_notifier,
+        producer_count=COMMAND_COUNT,
     )
 
+    queue_statistics_list = [
+        output_queue.statistics
+        for output_queue in [
+            heartbeat_to_main_queue,
+            telemetry_to_command_queue,
+            command_to_main_queue,
+        ]
+        if output_queue.statistics is not None
+    ]
+
     # Create worker properties for each worker type (what inputs it takes, how many workers)
+    # Router---------------------
+    result, router_properties = worker_manager.WorkerProperties.create(
+        count=1,  # Only one process may own the connection
+        target=mavlink_router_worker.mavlink_router_worker,
+        work_arguments=(connection, router),
+        input_queues=[],
+        output_queues=[],
+        controller=controller,
+        local_logger=main_logger,
+    )
+    if not result:
+        print("Failed to create arguments for router")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert router_properties is not None
+
     # Heartbeat sender---------------------
 
     ### Here i copied the one from the example and put it in here
@@ -108,7 +190,7 @@ def main() -> int:
         count=HEARTBEAT_SENDER_COUNT,  # How many workers
         target=heartbeat_sender_worker.heartbeat_sender_worker,  # What's the function that this worker runs
         work_arguments=(  # The function's arguments excluding input/output queues and controller
-            connection,
+            heartbeat_sender_connection,
         ),
         input_queues=[],  # Note that input/output queues must be in the proper order
         output_queues=[],
@@ -127,7 +209,7 @@ def main() -> int:
         count=HEARTBEAT_RECEIVER_COUNT,  # How many workers
         target=heartbeat_receiver_worker.heartbeat_receiver_worker,  # What's the function that this worker runs
         work_arguments=(  # The function's arguments excluding input/output queues and controller
-            connection,
+            heartbeat_receiver_connection,
         ),
         input_queues=[],  # Note that input/output queues must be in the proper order
         output_queues=[heartbeat_to_main_queue],
@@ -146,7 +228,7 @@ def main() -> int:
         count=TELEMETRY_COUNT,  # How many workers
         target=telemetry_worker.telemetry_worker,  # What's the function that this worker runs
         work_arguments=(  # The function's arguments excluding input/output queues and controller
-            connection,
+            telemetry_connection,
         ),
         input_queues=[],  # Note that input/output queues must be in the proper order
         output_queues=[telemetry_to_command_queue],
@@ -165,8 +247,8 @@ def main() -> int:
         count=COMMAND_COUNT,  # How many workers
         target=command_worker.command_worker,  # What's the function that this worker runs
         work_arguments=(  # The function's arguments excluding input/output queues and controller
-            connection,
-            (0, 0, 0),  ### The target position, i dont know what to put here
+            command_connection,
+            TARGET,
         ),
         input_queues=[
             telemetry_to_command_queue
@@ -186,6 +268,20 @@ def main() -> int:
 
     worker_managers: list[worker_manager.WorkerManager] = []  # List of all worker managers
 
+    ### ROUTER, started first so no message is missed
+    result, router_manager = worker_manager.WorkerManager.create(
+        worker_properties=router_properties,
+        local_logger=main_logger,
+    )
+    if not result:
+        print("Failed to create manager for router")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert router_manager is not None
+
+    worker_managers.append(router_manager)
+
     ### This is adding all of the managers to a main manager list "worker_managers"
     result, heartbeat_receiver_manager = worker_manager.WorkerManager.create(
         worker_properties=heartbeat_receiver_properties,
@@ -253,51 +349,85 @@ def main() -> int:
     # Main's work: read from all queues that output to main, and log any commands that we make
     # Continue running for 100 seconds or until the drone disconnects
 
-    time_start = time.time()
+    time_start = time.monotonic()
     continue_running = True
-    while time.time() - time_start < 100 and continue_running:
-        msg = None
-        ### Constantly read from command_to_main queue, with error handling
-        try:
-            msg = command_to_main_queue.get(timeout=0.1)
-        except queue.Empty:
-            continue
-
-        ### If a message was read from the queue log it.
-        if msg is not None:
-            main_logger.info(msg)
-
-        ### Do the same thing for the heartbeat receiver queue
-        try:
-            msg = heartbeat_to_main_queue.get(timeout=0.1)
-        except queue.Empty:
-            continue
-
-        ### if the message is disconnected stop running the main file
-        if msg == "Disconnected":
-            continue_running = False
+    previous_samples = [statistics.sample() for statistics in queue_statistics_list]
+    input_queues = [command_to_main_queue, heartbeat_to_main_queue]
+    while continue_running:
+        ### Log queue statistics periodically to find the bottleneck
+        if (
+            len(previous_samples) > 0
+            and previous_samples[0].sample_time + QUEUE_STATISTICS_PERIOD <= time.monotonic()
+        ):
+            samples = [statistics.sample() for statistics in queue_statistics_list]
+            for sample, previous_sample in zip(samples, previous_samples):
+                main_logger.info(sample.summary(previous_sample))
+
+            previous_samples = samples
+
+        ### Wait until any queue has an item, or the next statistics or end of run is due
+        timeout = time_start + RUN_TIME - time.monotonic()
+        if timeout <= 0.0:
+            break
+
+        if len(previous_samples) > 0:
+            timeout = min(
+                timeout,
+                previous_samples[0].sample_time + QUEUE_STATISTICS_PERIOD - time.monotonic(),
+            )
+
+        ready_queues = queue_proxy_wrapper.select(input_queues, max(timeout, 0.0))
+
+        for ready_queue in ready_queues:
+            try:
+                messages = ready_queue.get_many(MAIN_GET_BATCH_SIZE, 0.0)
+            except queue_proxy_wrapper.ShutDown:
+                # The worker has exited, stop waiting on its queue
+                input_queues.remove(ready_queue)
+                messages = []
+
+            if ready_queue is command_to_main_queue:
+                ### Log the commands
+                for msg in messages:
+                    main_logger.info(msg)
+            ### if the heartbeat receiver has stopped or reports disconnected stop running
+            elif "Disconnected" in messages or ready_queue not in input_queues:
+                continue_running = False
 
     # Stop the processes
 
     controller.request_exit()
     main_logger.info("Requested exit")
 
-    # Fill and drain queues from END TO START
+    # Workers close their output queues as they exit, so end of stream propagates
+    # stage by stage to main. Log the commands sent until then
+    for msg in command_to_main_queue.drain_until_shut_down(SHUTDOWN_TIMEOUT):
+        main_logger.info(msg)
 
-    ### Drain command to main first since it comes after telemetry to command
-    command_to_main_queue.fill_and_drain_queue()
-    telemetry_to_command_queue.fill_and_drain_queue()
+    heartbeat_to_main_queue.drain_until_shut_down(SHUTDOWN_TIMEOUT)
 
-    ### THis is a seperate queue system, so it doesnt matter where i drain it
-    heartbeat_to_main_queue.fill_and_drain_queue()
-    main_logger.info("Queues cleared")
+    # Wake up any worker still blocked on a queue
+    command_to_main_queue.shutdown(immediate=True)
+    telemetry_to_command_queue.shutdown(immediate=True)
+    heartbeat_to_main_queue.shutdown(immediate=True)
+    main_logger.info("Queues shut down")
 
-    # Clean up worker processes
+    # Clean up worker processes, logging any that is stuck or has crashed
+    # Stuck workers are still joined when main exits
     for manager in worker_managers:
-        manager.join_workers()
+        manager.join_workers(SHUTDOWN_TIMEOUT)
 
     main_logger.info("Stopped")
 
+    if len(queue_statistics_list) > 0:
+        result, statistics_path = queue_statistics.dump_statistics(
+            queue_statistics_list, QUEUE_STATISTICS_DIRECTORY
+        )
+        if result:
+            main_logger.info(f"Queue statistics written to {statistics_path}")
+        else:
+            main_logger.warning("Failed to write queue statistics")
+
     # We can reset controller in case we want to reuse it
     # Alternatively, create a new WorkerController instance
     controller.clear_exit()
@@ -23,6 +23,10 @@ from utilities.workers import worker_manager
 COUNTUP_TO_ADD_RANDOM_QUEUE_MAX_SIZE = 5
 ADD_RANDOM_TO_CONCATENATOR_QUEUE_MAX_SIZE = 5
 
+# Manager queues can be any size, shared memory queues must be bounded
+COUNTUP_TO_ADD_RANDOM_QUEUE_BACKEND = queue_proxy_wrapper.QueueBackend.SHARED_MEMORY
+ADD_RANDOM_TO_CONCATENATOR_QUEUE_BACKEND = queue_proxy_wrapper.QueueBackend.MANAGER
+
 # Play with these numbers to see process bottlenecks
 COUNTUP_WORKER_COUNT = 2
 ADD_RANDOM_WORKER_COUNT = 2
@@ -64,13 +68,24 @@ def main() -> int:
 
     # Queue maxsize should always be >= the larger of producers/consumers count
     # Example: Producers 3, consumers 2, so queue maxsize minimum is 3
+    # Countup produces faster than Add Random consumes,
+    # so adaptive batching coalesces items instead of blocking on every put
     countup_to_add_random_queue = queue_proxy_wrapper.QueueProxyWrapper(
         mp_manager,
         COUNTUP_TO_ADD_RANDOM_QUEUE_MAX_SIZE,
+        COUNTUP_TO_ADD_RANDOM_QUEUE_BACKEND,
+        adaptive_batching=True,
+        # Puts and exit requests both wake up workers blocked on the controller
+        notifier=controller.notifier,
+        # Shut down once every countup worker has stopped
+        producer_count=COUNTUP_WORKER_COUNT,
     )
     add_random_to_concatenator_queue = queue_proxy_wrapper.QueueProxyWrapper(
         mp_manager,
         ADD_RANDOM_TO_CONCATENATOR_QUEUE_MAX_SIZE,
+        ADD_RANDOM_TO_CONCATENATOR_QUEUE_BACKEND,
+        notifier=controller.notifier,
+        producer_count=ADD_RANDOM_WORKER_COUNT,
     )
 
     # Worker properties
@@ -198,13 +213,15 @@ def main() -> int:
 
     main_logger.info("Requested exit", True)
 
-    # Fill and drain queues from END TO START
-    countup_to_add_random_queue.fill_and_drain_queue()
-    add_random_to_concatenator_queue.fill_and_drain_queue()
+    # Workers close their output queues as they exit, so end of stream propagates
+    # from START TO END. Shutting down every queue immediately as well wakes up any worker
+    # still blocked on one, so stopping takes the same time regardless of queue sizes
+    countup_to_add_random_queue.shutdown(immediate=True)
+    add_random_to_concatenator_queue.shutdown(immediate=True)
 
-    main_logger.info("Queues cleared", True)
+    main_logger.info("Queues shut down", True)
 
-    # Clean up worker processes
+    # Clean up worker processes, logging any that has crashed
     for manager in worker_managers:
         manager.join_workers()
 
@@ -6,6 +6,7 @@ import time
 import random
 
 from modules.common.modules.logger import logger
+from utilities.workers import lazy_logger
 from .. import intermediate_struct
 
 
@@ -33,7 +34,7 @@ class AddRandom:
         self.__current_random_term = self.__generate_random_number(0, self.__max_random_term)
         self.__add_count = 0
 
-        self.__logger = local_logger
+        self.__logger = lazy_logger.LazyLogger(local_logger)
 
     @staticmethod
     def __generate_random_number(min_value: int, max_value: int) -> int:
@@ -47,7 +48,7 @@ class AddRandom:
         Adds a random number to the input and returns the sum.
         """
         # Log
-        self.__logger.debug("Run", True)
+        self.__logger.debug("Run")
 
         add_sum = term + self.__current_random_term
 
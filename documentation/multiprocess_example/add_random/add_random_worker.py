@@ -4,6 +4,7 @@ Intermediate worker that adds a random number to the input.
 
 import os
 import pathlib
+import queue
 
 from modules.common.modules.logger import logger
 from utilities.workers import queue_proxy_wrapper
@@ -44,18 +45,27 @@ def add_random_worker(
         seed, max_random_term, add_change_count, local_logger
     )
 
-    # Loop forever until exit has been requested or sentinel value (consumer)
+    # Loop forever until exit has been requested or the producer has stopped (consumer)
     while not controller.is_exit_requested():
         # Method blocks worker if pause has been requested
         controller.check_pause()
 
         # Get an item from the queue
         # If the queue is empty, the worker process will block
-        # until the queue is non-empty
-        term = input_queue.queue.get()
+        # until the queue is non-empty, exit is requested,
+        # or items held by adaptive batching of the output queue have to be sent
+        try:
+            term = controller.queue_get(input_queue, output_queue.get_hold_timeout())
+        except queue.Empty:
+            try:
+                output_queue.poll()
+            except queue_proxy_wrapper.ShutDown:
+                # Consumer has stopped
+                break
 
-        # Exit on sentinel
-        if term is None:
+            continue
+        except queue_proxy_wrapper.ShutDown:
+            # End of stream
             break
 
         # All of the work should be done within the class
@@ -69,5 +79,12 @@ def add_random_worker(
 
         # Put an item into the queue
         # If the queue is full, the worker process will block
-        # until the queue is non-empty
-        output_queue.queue.put(value)
+        # until the queue is non-full or shut down
+        try:
+            output_queue.put(value)
+        except queue_proxy_wrapper.ShutDown:
+            # Consumer has stopped
+            break
+
+    # Signal end of stream to the consumer once every worker of this stage has stopped
+    output_queue.close()
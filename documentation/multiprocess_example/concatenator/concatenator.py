@@ -5,6 +5,7 @@ Contains the Concatenator class.
 import time
 
 from modules.common.modules.logger import logger
+from utilities.workers import lazy_logger
 from .. import intermediate_struct
 
 
@@ -20,7 +21,7 @@ class Concatenator:
         self.__prefix = prefix
         self.__suffix = suffix
 
-        self.__logger = local_logger
+        self.__logger = lazy_logger.LazyLogger(local_logger)
 
     # The working function
     def run_concatenation(
@@ -30,7 +31,7 @@ class Concatenator:
         Concatenate the prefix and suffix to the input.
         """
         # Log
-        self.__logger.debug("Run", True)
+        self.__logger.debug("Run")
 
         # The class is responsible for unpacking the intermediate type
         # Validate input
@@ -4,8 +4,10 @@ Ending worker that concatenates a prefix and suffix and then prints the result.
 
 import os
 import pathlib
+import queue
 
 from modules.common.modules.logger import logger
+from utilities.workers import lazy_logger
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
 from . import concatenator
@@ -36,22 +38,26 @@ def concatenator_worker(
     assert local_logger is not None
 
     local_logger.info("Logger initialized", True)
+    # Logs every value
+    value_logger = lazy_logger.LazyLogger(local_logger)
 
     # Instantiate class object
     concatenator_instance = concatenator.Concatenator(prefix, suffix, local_logger)
 
-    # Loop forever until exit has been requested or sentinel value (consumer)
+    # Loop forever until exit has been requested or the producer has stopped (consumer)
     while not controller.is_exit_requested():
         # Method blocks worker if pause has been requested
         controller.check_pause()
 
         # Get an item from the queue
         # If the queue is empty, the worker process will block
-        # until the queue is non-empty
-        input_data = input_queue.queue.get()
-
-        # Exit on sentinel
-        if input_data is None:
+        # until the queue is non-empty or exit is requested
+        try:
+            input_data = controller.queue_get(input_queue)
+        except queue.Empty:
+            continue
+        except queue_proxy_wrapper.ShutDown:
+            # End of stream
             break
 
         # All of the work should be done within the class
@@ -64,4 +70,4 @@ def concatenator_worker(
             continue
 
         # Print just the string
-        local_logger.info(str(value), None)
+        value_logger.info("%s", value, log_with_frame_info=False)
@@ -5,6 +5,7 @@ Contains the Countup class.
 import time
 
 from modules.common.modules.logger import logger
+from utilities.workers import lazy_logger
 
 
 class Countup:
@@ -22,14 +23,14 @@ class Countup:
         self.__max_count = self.__start_count + max_iterations
         self.__current_count = self.__start_count
 
-        self.__logger = local_logger
+        self.__logger = lazy_logger.LazyLogger(local_logger)
 
     def run_countup(self) -> "tuple[bool, int]":
         """
         Counts upward.
         """
         # Log
-        self.__logger.debug("Run", True)
+        self.__logger.debug("Run")
 
         # Increment counter
         self.__current_count += 1
@@ -57,5 +57,12 @@ def countup_worker(
 
         # Put an item into the queue
         # If the queue is full, the worker process will block
-        # until the queue is non-empty
-        output_queue.queue.put(value)
+        # until the queue is non-full or shut down
+        try:
+            output_queue.put(value)
+        except queue_proxy_wrapper.ShutDown:
+            # Consumer has stopped
+            break
+
+    # Signal end of stream to the consumer once every worker of this stage has stopped
+    output_queue.close()
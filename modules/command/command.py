@@ -2,23 +2,24 @@
 Decision-making logic.
 """
 
+import logging
 import math
 
+import numpy as np
 from pymavlink import mavutil
 
+from utilities.workers import lazy_logger
+from . import command_decision
+from . import command_governor
+from . import command_tracker
+from . import position
+from . import velocity_statistics
 from ..common.modules.logger import logger
 from ..telemetry import telemetry
 
 
-class Position:
-    """
-    3D vector struct.
-    """
-
-    def __init__(self, x: float, y: float, z: float) -> None:
-        self.x = x
-        self.y = y
-        self.z = z
+# Re-exported, the struct is in its own module so it does not need the logger
+Position = position.Position
 
 
 # =================================================================================================
@@ -38,15 +39,35 @@ class Command:  # pylint: disable=too-many-instance-attributes
         connection: mavutil.mavfile,
         target: Position,  # Put your own arguments here
         local_logger: logger.Logger,
-    ) -> tuple[
-        bool,
-        Command,  # pylint: disable=undefined-variable ### I dont know why its getting mad at me for this
-    ]:
+        governor: "command_governor.CommandGovernor | None" = None,
+        tracker: "command_tracker.CommandTracker | None" = None,
+        statistics: "velocity_statistics.VelocityStatistics | None" = None,
+    ) -> "tuple[bool, Command]":
         """
         Falliable create (instantiation) method to create a Command object.
+
+        governor: Suppresses duplicate and too frequent commands, None for the defaults
+        with commands in flight until acknowledged or given up.
+        tracker: Retransmits unacknowledged commands, None for the defaults.
+        statistics: Averages of the velocity, None for the defaults.
         """
-        return True, cls(  # pylint: disable=undefined-variable
-            cls.__private_key, connection=connection, target=target, local_logger=local_logger
+        if governor is None:
+            governor = command_governor.CommandGovernor(in_flight_timeout=math.inf)
+
+        if tracker is None:
+            tracker = command_tracker.CommandTracker()
+
+        if statistics is None:
+            statistics = velocity_statistics.VelocityStatistics()
+
+        return True, cls(
+            cls.__private_key,
+            connection=connection,
+            target=target,
+            local_logger=local_logger,
+            governor=governor,
+            tracker=tracker,
+            statistics=statistics,
         )
 
     def __init__(
@@ -56,6 +77,9 @@ class Command:  # pylint: disable=too-many-instance-attributes
         target: Position,
         # Put your own arguments here
         local_logger: logger.Logger,
+        governor: command_governor.CommandGovernor,
+        tracker: command_tracker.CommandTracker,
+        statistics: velocity_statistics.VelocityStatistics,
     ) -> None:
         assert key is Command.__private_key, "Use create() method"
 
@@ -63,73 +87,130 @@ class Command:  # pylint: disable=too-many-instance-attributes
         self.connection = connection
         self.target = target
         self.local_logger = local_logger
-        self.num_of_runs = 0
-        self.total_velocity = Position(0, 0, 0)
+        # For logs on every run, only formatted if enabled
+        self.lazy_logger = lazy_logger.LazyLogger(local_logger)
+        self.governor = governor
+        self.tracker = tracker
+        self.velocity_statistics = statistics
 
-    def run(self, telemetry_data: telemetry.TelemetryData) -> str:
+    def run(self, telemetry_data: telemetry.TelemetryData) -> str | None:
         """
         Run the command worker, calculate velocity, and orient drone towards target
+
+        Returns the command sent, or None if none was needed or the governor suppressed it.
         """
-        # Calculating the average velocity
-        self.num_of_runs += 1
-        self.total_velocity.x += telemetry_data.x_velocity
-        self.total_velocity.y += telemetry_data.y_velocity
-        self.total_velocity.z += telemetry_data.z_velocity
-
-        self.local_logger.info(
-            f"Current Velocity: {self.total_velocity.x/self.num_of_runs}, {self.total_velocity.y/self.num_of_runs}, {self.total_velocity.z/self.num_of_runs}"
+        # Averaging the velocity, the moving averages follow recent changes
+        self.velocity_statistics.update(
+            telemetry_data.x_velocity, telemetry_data.y_velocity, telemetry_data.z_velocity
         )
-
-        # Checking vertical (z) difference
-        dz = telemetry_data.z - self.target.z
-        if abs(dz) >= 0.5:
-            self.connection.mav.command_long_send(
-                1,
-                0,
-                mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT,
-                0,
-                1.0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                self.target.z,
+        if self.lazy_logger.is_enabled(logging.INFO):
+            self.lazy_logger.info(
+                "Average Velocity: %s, %s, %s, moving: %s, %s, %s, weighted: %s, %s, %s",
+                *self.velocity_statistics.get_mean(),
+                *self.velocity_statistics.get_window_mean(),
+                *self.velocity_statistics.get_ewma(),
             )
-            return f"CHANGE ALTITUDE: {self.target.z-telemetry_data.z}"
 
-        # Calculate bearing to target
-        dx = self.target.x - telemetry_data.x
-        dy = self.target.y - telemetry_data.y
-        bearing_rad = math.atan2(dy, dx)
-        bearing_deg = math.degrees(bearing_rad)
+        decision = command_decision.decide(
+            (self.target.x, self.target.y, self.target.z),
+            telemetry_data.x,
+            telemetry_data.y,
+            telemetry_data.z,
+            telemetry_data.yaw,
+        )
+        if decision is None:
+            return None
+
+        command_id, value = decision
+        if not self.__send(
+            command_id, command_decision.get_params(command_id, value, self.target.z)
+        ):
+            return None
+
+        return command_decision.describe(command_id, value)
+
+    def run_batch(self, telemetry_array: np.ndarray) -> "list[str | None]":
+        """
+        Decides for every sample of a flight at once, to replay it offline.
+        Nothing is sent, and the velocity statistics and governor are not updated.
+
+        telemetry_array: Structured array with `TelemetryData.DTYPE` , x, y, z, and yaw present.
 
-        # Current yaw in degrees
-        current_yaw_deg = math.degrees(telemetry_data.yaw)
+        Returns what `run()` would return for each sample if the governor suppressed nothing.
+        """
+        commands, values = command_decision.decide_batch(
+            (self.target.x, self.target.y, self.target.z),
+            telemetry_array["x"],
+            telemetry_array["y"],
+            telemetry_array["z"],
+            telemetry_array["yaw"],
+        )
+        return command_decision.describe_batch(commands, values)
 
-        # Calculate yaw difference
-        delta_yaw_deg = bearing_deg - current_yaw_deg
+    def __send(self, command_id: int, params: "tuple[float, ...]") -> bool:
+        """
+        Sends a COMMAND_LONG to the drone unless the governor suppresses it.
 
-        # Normalize
-        delta_yaw_deg = (delta_yaw_deg + 180) % 360 - 180
+        params: Parameters 1 to 7.
 
-        if abs(delta_yaw_deg) > 5:
+        Returns whether it was sent.
+        """
+        if not self.governor.should_send(command_id, params):
+            return False
+
+        self.connection.mav.command_long_send(1, 0, command_id, 0, *params)
+        self.tracker.track(1, 0, command_id, params)
+        return True
+
+    def handle_ack(self, message: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        Completes the command acknowledged by a COMMAND_ACK.
+        """
+        pending = self.tracker.handle_ack(message)
+        if pending is None:
+            self.local_logger.warning(f"Unexpected ack of command {message.command}")
+            return
+
+        self.governor.complete(pending.command_id)
+        if message.result != mavutil.mavlink.MAV_RESULT_ACCEPTED:
+            self.local_logger.warning(f"Command {message.command} not accepted: {message.result}")
+
+    def retransmit(self) -> int:
+        """
+        Sends unacknowledged commands again and gives up on those out of retransmissions.
+
+        Returns the number of commands sent.
+        """
+        retransmissions, failures = self.tracker.get_retransmissions()
+        for pending in retransmissions:
             self.connection.mav.command_long_send(
-                1,
-                0,
-                mavutil.mavlink.MAV_CMD_CONDITION_YAW,
-                0,
-                abs(delta_yaw_deg),
-                5.0,
-                -1 if delta_yaw_deg >= 0 else 1,
-                1,
-                0,
-                0,
-                0,
+                pending.target_system,
+                pending.target_component,
+                pending.command_id,
+                pending.confirmation,
+                *pending.params,
             )
-            return f"CHANGE YAW: {delta_yaw_deg}"
 
-        return None
+        for pending in failures:
+            self.governor.complete(pending.command_id)
+            self.local_logger.warning(f"Command {pending.command_id} was never acknowledged")
+
+        return len(retransmissions)
+
+    def summary(self) -> str:
+        """
+        Returns the commands sent, suppressed, acknowledged, and retransmitted so far.
+        """
+        return (
+            f"Sent {self.governor.sent_count} commands, "
+            f"suppressed {self.governor.duplicate_count} duplicate "
+            f"and {self.governor.rate_limited_count} too frequent, "
+            f"acknowledged {self.tracker.acked_count}, "
+            f"replaced {self.tracker.replaced_count} unacknowledged, "
+            f"retransmitted {self.tracker.retransmission_count} times, "
+            f"gave up on {self.tracker.failed_count}, "
+            f"median round trip under {self.tracker.get_rtt_percentile(50)} s"
+        )
 
 
 # =================================================================================================
@@ -0,0 +1,74 @@
+"""
+Command worker as a task in the event loop.
+"""
+
+import asyncio
+
+from modules.router import async_mavlink_transport
+from utilities.workers import async_worker_controller
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_logger
+from . import command
+from . import command_worker
+
+
+async def command_async_worker(
+    connection: async_mavlink_transport.AsyncRoutedConnection,
+    target: command.Position,
+    input_queue: asyncio.Queue,
+    output_queue: asyncio.Queue,
+    controller: async_worker_controller.AsyncWorkerController,
+) -> None:
+    """
+    Same as `command_worker.command_worker()` as a task in the event loop.
+
+    connection: Subscription of the transport to COMMAND_ACK, used to send commands.
+    target: Position to face and climb to.
+    input_queue: Telemetry from the telemetry worker.
+    output_queue: Commands sent, for main.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    is_created, command_obj = command.Command.create(
+        connection=connection, target=target, local_logger=local_logger
+    )
+    if not is_created:
+        local_logger.error("command worker was not created succesfully")
+        controller.request_exit()
+        return
+
+    # Main loop: do work.
+    while not controller.is_exit_requested():
+        message = await connection.recv_match("COMMAND_ACK", 0.0)
+        while message is not None:
+            command_obj.handle_ack(message)
+            message = await connection.recv_match("COMMAND_ACK", 0.0)
+
+        command_obj.retransmit()
+
+        try:
+            # Decisions are only made on the newest telemetry
+            current_data, skipped = await controller.queue_get_latest(
+                input_queue, command_worker.ACK_CHECK_PERIOD
+            )
+        except queue_proxy_wrapper.queue.Empty:
+            # Exit requested or time to check acks
+            continue
+
+        if skipped > 0:
+            command_obj.lazy_logger.debug("Skipped %d stale telemetry", skipped)
+
+        result = command_obj.run(current_data)
+        if result is None:
+            continue
+
+        await output_queue.put(result)
+
+    local_logger.info(command_obj.summary())
@@ -0,0 +1,129 @@
+"""
+Decisions of the command module, for a telemetry sample or a whole flight at once.
+"""
+
+import math
+
+import numpy as np
+from pymavlink import mavutil
+
+
+CHANGE_ALTITUDE = mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+CHANGE_YAW = mavutil.mavlink.MAV_CMD_CONDITION_YAW
+# Command of samples without a decision in a batch
+NO_COMMAND = 0
+
+ALTITUDE_TOLERANCE = 0.5  # m
+YAW_TOLERANCE = 5  # degrees
+YAW_SPEED = 5.0  # degrees/s
+
+
+def decide(
+    target: "tuple[float, float, float]", x: float, y: float, z: float, yaw: float
+) -> "tuple[int, float] | None":
+    """
+    Corrects the altitude first, then turns towards the target.
+
+    target: x, y, z of the target in m.
+    x, y, z: Position of the drone in m.
+    yaw: Heading of the drone in radians.
+
+    Returns the command and its value: the altitude change in m or the yaw change in degrees.
+    None if the drone is within tolerance.
+    """
+    target_x, target_y, target_z = target
+
+    # Checking vertical (z) difference
+    dz = z - target_z
+    if abs(dz) >= ALTITUDE_TOLERANCE:
+        return CHANGE_ALTITUDE, target_z - z
+
+    # Calculate bearing to target
+    dx = target_x - x
+    dy = target_y - y
+    bearing_deg = math.degrees(math.atan2(dy, dx))
+
+    # Calculate yaw difference, normalized to [-180, 180)
+    delta_yaw_deg = bearing_deg - math.degrees(yaw)
+    delta_yaw_deg = (delta_yaw_deg + 180) % 360 - 180
+
+    if abs(delta_yaw_deg) > YAW_TOLERANCE:
+        return CHANGE_YAW, delta_yaw_deg
+
+    return None
+
+
+def decide_batch(
+    target: "tuple[float, float, float]",
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    yaw: np.ndarray,
+) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    `decide()` for each sample, with identical results.
+
+    x, y, z, yaw: Same as `decide()` , one element per sample.
+
+    Returns the command of each sample, NO_COMMAND for None, and the value of each sample,
+    NaN for None.
+    """
+    target_x, target_y, target_z = target
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    yaw = np.asarray(yaw, dtype=np.float64)
+
+    commands = np.full(len(z), NO_COMMAND, dtype=np.int64)
+    values = np.full(len(z), np.nan)
+
+    is_altitude = np.abs(z - target_z) >= ALTITUDE_TOLERANCE
+    commands[is_altitude] = CHANGE_ALTITUDE
+    values[is_altitude] = target_z - z[is_altitude]
+
+    remaining = np.flatnonzero(~is_altitude)
+    dx = target_x - x[remaining]
+    dy = target_y - y[remaining]
+    # SIMD arctan2 of NumPy can differ from math.atan2 in the last bit,
+    # which would change decisions at the tolerance and the values
+    bearing_rad = np.fromiter(map(math.atan2, dy.tolist(), dx.tolist()), np.float64, len(dx))
+
+    delta_yaw_deg = np.degrees(bearing_rad) - np.degrees(yaw[remaining])
+    delta_yaw_deg = (delta_yaw_deg + 180) % 360 - 180
+
+    is_yaw = np.abs(delta_yaw_deg) > YAW_TOLERANCE
+    commands[remaining[is_yaw]] = CHANGE_YAW
+    values[remaining[is_yaw]] = delta_yaw_deg[is_yaw]
+
+    return commands, values
+
+
+def get_params(command_id: int, value: float, target_z: float) -> "tuple[float, ...]":
+    """
+    Returns parameters 1 to 7 of the COMMAND_LONG of a decision.
+    """
+    if command_id == CHANGE_ALTITUDE:
+        return (1.0, 0, 0, 0, 0, 0, target_z)
+
+    # Change relative to the current yaw
+    return (abs(value), YAW_SPEED, -1 if value >= 0 else 1, 1, 0, 0, 0)
+
+
+def describe(command_id: int, value: float) -> str:
+    """
+    Returns the description of a decision.
+    """
+    if command_id == CHANGE_ALTITUDE:
+        return f"CHANGE ALTITUDE: {value}"
+
+    return f"CHANGE YAW: {value}"
+
+
+def describe_batch(commands: np.ndarray, values: np.ndarray) -> "list[str | None]":
+    """
+    Returns the description of each decision of `decide_batch()` , None for NO_COMMAND.
+    """
+    return [
+        None if command_id == NO_COMMAND else describe(command_id, value)
+        for command_id, value in zip(commands.tolist(), values.tolist())
+    ]
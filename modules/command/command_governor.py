@@ -0,0 +1,100 @@
+"""
+Deduplication and rate limiting of outgoing commands.
+"""
+
+import time
+
+
+class CommandGovernor:  # pylint: disable=too-many-instance-attributes
+    """
+    Decides whether a COMMAND_LONG is worth sending, per command ID:
+
+    * A command identical to the one in flight, every parameter within the tolerance,
+      is a duplicate. A command is in flight from when it is sent
+      until it completes or the in flight timeout, when it is repeated.
+    * Any command sent sooner than the minimum resend interval after the last one is rate limited.
+
+    Counts of sent and suppressed commands are kept.
+    """
+
+    # Fast enough to follow a drone turning at 5 deg/s within a degree
+    DEFAULT_MIN_RESEND_INTERVAL = 0.2  # seconds
+    # An unacknowledged command is repeated this often
+    DEFAULT_IN_FLIGHT_TIMEOUT = 0.4  # seconds
+    DEFAULT_TOLERANCE = 0.5  # units of the parameters, such as m or deg
+
+    def __init__(
+        self,
+        min_resend_interval: float = DEFAULT_MIN_RESEND_INTERVAL,
+        in_flight_timeout: float = DEFAULT_IN_FLIGHT_TIMEOUT,
+        tolerance: float = DEFAULT_TOLERANCE,
+        min_resend_intervals: "dict[int, float] | None" = None,
+    ) -> None:
+        """
+        min_resend_interval: Seconds between commands with the same ID.
+        in_flight_timeout: Seconds before an identical command is sent again.
+        tolerance: Largest parameter difference of identical commands.
+        min_resend_intervals: Seconds by command ID, instead of min_resend_interval.
+        """
+        self.__min_resend_interval = min_resend_interval
+        self.__in_flight_timeout = in_flight_timeout
+        self.__tolerance = tolerance
+        self.__min_resend_intervals = {} if min_resend_intervals is None else min_resend_intervals
+
+        # Command ID to the send time and parameters of the last command sent
+        self.__last_sent: "dict[int, tuple[float, tuple[float, ...]]]" = {}
+        # Command IDs in flight
+        self.__in_flight: "set[int]" = set()
+
+        self.sent_count = 0
+        self.duplicate_count = 0
+        self.rate_limited_count = 0
+
+    def should_send(
+        self, command_id: int, params: "tuple[float, ...]", now: "float | None" = None
+    ) -> bool:
+        """
+        Records the command as sent if it is allowed.
+
+        command_id: MAV_CMD of the command.
+        params: Parameters 1 to 7.
+        now: Monotonic time in seconds, None for the current time.
+
+        Returns whether to send the command.
+        """
+        now = time.monotonic() if now is None else now
+        last = self.__last_sent.get(command_id)
+        if last is not None:
+            last_time, last_params = last
+            elapsed = now - last_time
+            if (
+                command_id in self.__in_flight
+                and elapsed < self.__in_flight_timeout
+                and all(
+                    abs(param - last_param) <= self.__tolerance
+                    for param, last_param in zip(params, last_params)
+                )
+            ):
+                self.duplicate_count += 1
+                return False
+
+            if elapsed < self.__min_resend_intervals.get(command_id, self.__min_resend_interval):
+                self.rate_limited_count += 1
+                return False
+
+        self.__last_sent[command_id] = (now, tuple(params))
+        self.__in_flight.add(command_id)
+        self.sent_count += 1
+        return True
+
+    def complete(self, command_id: int) -> None:
+        """
+        Ends the command in flight, an identical one may be sent again.
+        """
+        self.__in_flight.discard(command_id)
+
+    def get_suppressed_count(self) -> int:
+        """
+        Returns the number of duplicate and rate limited commands.
+        """
+        return self.duplicate_count + self.rate_limited_count
@@ -0,0 +1,199 @@
+"""
+Acknowledgement tracking and retransmission of sent commands.
+"""
+
+import time
+
+from pymavlink import mavutil
+
+
+class PendingCommand:  # pylint: disable=too-many-instance-attributes
+    """
+    A COMMAND_LONG waiting for its COMMAND_ACK.
+    """
+
+    def __init__(
+        self,
+        target_system: int,
+        target_component: int,
+        command_id: int,
+        params: "tuple[float, ...]",
+        sent_time: float,
+        deadline: float,
+    ) -> None:
+        """
+        params: Parameters 1 to 7.
+        sent_time: Monotonic time of the first transmission, in seconds.
+        deadline: Monotonic time of the next retransmission, in seconds.
+        """
+        self.target_system = target_system
+        self.target_component = target_component
+        self.command_id = command_id
+        self.params = params
+        self.sent_time = sent_time
+        self.last_sent_time = sent_time
+        self.deadline = deadline
+        # Retransmissions so far, sent as the confirmation field
+        self.confirmation = 0
+        # Whether it replaced an unacknowledged command with the same key,
+        # whose ack would be matched to this one
+        self.replaced = False
+
+
+class CommandTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    Table of sent commands keyed by target system and command ID,
+    until a matching COMMAND_ACK arrives or the retransmissions run out.
+
+    Unacknowledged commands are retransmitted with the timeout multiplied by the backoff each time.
+    Round trip times are only recorded for commands acknowledged without retransmission
+    or replacement, since the ack of those may answer an earlier transmission.
+    They are counted in buckets of powers of 2 microseconds, like the queue statistics:
+    bucket 0 is below 1 us, bucket i is [2^(i-1), 2^i) us, and the last bucket has no upper bound.
+    """
+
+    DEFAULT_ACK_TIMEOUT = 0.2  # seconds
+    DEFAULT_BACKOFF = 2.0
+    # Including the first transmission
+    DEFAULT_MAX_TRANSMISSIONS = 3
+    RTT_BUCKET_COUNT = 24
+
+    def __init__(
+        self,
+        ack_timeout: float = DEFAULT_ACK_TIMEOUT,
+        backoff: float = DEFAULT_BACKOFF,
+        max_transmissions: int = DEFAULT_MAX_TRANSMISSIONS,
+    ) -> None:
+        """
+        ack_timeout: Seconds to wait for the ack of the first transmission.
+        backoff: Factor the timeout grows by on each retransmission.
+        max_transmissions: Transmissions before the command is given up, at least 1.
+        """
+        self.__ack_timeout = ack_timeout
+        self.__backoff = backoff
+        self.__max_transmissions = max_transmissions
+        self.__pending: "dict[tuple[int, int], PendingCommand]" = {}
+
+        self.acked_count = 0
+        self.replaced_count = 0
+        self.retransmission_count = 0
+        self.failed_count = 0
+        # Acks by MAV_RESULT
+        self.result_counts: "dict[int, int]" = {}
+        self.rtt_histogram = [0] * self.RTT_BUCKET_COUNT
+
+    def track(
+        self,
+        target_system: int,
+        target_component: int,
+        command_id: int,
+        params: "tuple[float, ...]",
+        now: "float | None" = None,
+    ) -> None:
+        """
+        Adds a command that was just sent, replacing any pending one with the same key.
+        The ack of a replaced command cannot be told apart, so it completes the new one.
+
+        now: Monotonic time in seconds, None for the current time.
+        """
+        now = time.monotonic() if now is None else now
+        key = (target_system, command_id)
+        pending = PendingCommand(
+            target_system,
+            target_component,
+            command_id,
+            tuple(params),
+            now,
+            now + self.__ack_timeout,
+        )
+        if key in self.__pending:
+            pending.replaced = True
+            self.replaced_count += 1
+
+        self.__pending[key] = pending
+
+    def handle_ack(
+        self, message: mavutil.mavlink.MAVLink_message, now: "float | None" = None
+    ) -> "PendingCommand | None":
+        """
+        Matches a COMMAND_ACK to the pending command it answers,
+        which is the one with the target system that sent it.
+
+        now: Monotonic time in seconds, None for the current time.
+
+        Returns the acknowledged command, or None if nothing was pending for it.
+        """
+        now = time.monotonic() if now is None else now
+        pending = self.__pending.pop((message.get_srcSystem(), message.command), None)
+        if pending is None:
+            return None
+
+        self.acked_count += 1
+        self.result_counts[message.result] = self.result_counts.get(message.result, 0) + 1
+        if pending.confirmation == 0 and not pending.replaced:
+            rtt_us = int((now - pending.sent_time) * 1e6)
+            self.rtt_histogram[min(rtt_us.bit_length(), self.RTT_BUCKET_COUNT - 1)] += 1
+
+        return pending
+
+    def get_retransmissions(
+        self, now: "float | None" = None
+    ) -> "tuple[list[PendingCommand], list[PendingCommand]]":
+        """
+        Takes the commands whose ack timed out.
+
+        now: Monotonic time in seconds, None for the current time.
+
+        Returns the commands to retransmit now, with their confirmation incremented,
+        and the commands given up on, which are no longer pending.
+        """
+        now = time.monotonic() if now is None else now
+        retransmissions = []
+        failures = []
+        for key, pending in list(self.__pending.items()):
+            if now < pending.deadline:
+                continue
+
+            if pending.confirmation + 1 >= self.__max_transmissions:
+                del self.__pending[key]
+                self.failed_count += 1
+                failures.append(pending)
+                continue
+
+            pending.confirmation += 1
+            pending.last_sent_time = now
+            pending.deadline = now + self.__ack_timeout * self.__backoff**pending.confirmation
+            self.retransmission_count += 1
+            retransmissions.append(pending)
+
+        return retransmissions, failures
+
+    def get_pending_count(self) -> int:
+        """
+        Returns the number of commands waiting for an ack.
+        """
+        return len(self.__pending)
+
+    def get_rtt_percentile(self, percentile: float) -> "float | None":
+        """
+        Upper bound of the histogram bucket containing the percentile.
+
+        percentile: Between 0 and 100.
+
+        Returns the bound in seconds, infinity for the last bucket, or None without samples.
+        """
+        total = sum(self.rtt_histogram)
+        if total == 0:
+            return None
+
+        rank = total * percentile / 100
+        count = 0
+        for bucket, bucket_count in enumerate(self.rtt_histogram):
+            count += bucket_count
+            if count >= rank and bucket_count > 0:
+                if bucket == self.RTT_BUCKET_COUNT - 1:
+                    return float("inf")
+
+                return 2**bucket / 1e6
+
+        return float("inf")
@@ -2,15 +2,16 @@
 Command worker to make decisions based on Telemetry Data.
 """
 
-import os
-import pathlib
-
 from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_logger
 from . import command
-from ..common.modules.logger import logger
+
+
+# Acks are received and unacknowledged commands retransmitted at least this often
+ACK_CHECK_PERIOD = 0.05  # seconds
 
 
 # =================================================================================================
@@ -19,8 +20,8 @@ from ..common.modules.logger import logger
 def command_worker(
     connection: mavutil.mavfile,
     target: command.Position,
-    input_queue: queue_proxy_wrapper.queue,
-    output_queue: queue_proxy_wrapper.queue,
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
     # Place your own arguments here
     # Add other necessary worker arguments here
@@ -35,18 +36,13 @@ def command_worker(
     # =============================================================================================
 
     # Instantiate logger
-    worker_name = pathlib.Path(__file__).stem
-    process_id = os.getpid()
-    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    result, local_logger = worker_logger.create_worker_logger(__file__)
     if not result:
-        print("ERROR: Worker failed to create logger")
         return
 
     # Get Pylance to stop complaining
     assert local_logger is not None
 
-    local_logger.info("Logger initialized", True)
-
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
@@ -61,14 +57,40 @@ def command_worker(
 
     # Main loop: do work.
     while not controller.is_exit_requested():
+        message = connection.recv_match(type="COMMAND_ACK", blocking=False)
+        while message is not None:
+            command_obj.handle_ack(message)
+            message = connection.recv_match(type="COMMAND_ACK", blocking=False)
+
+        command_obj.retransmit()
+
         try:
-            current_data = input_queue.queue.get(timeout=1)
-            result = command_obj.run(current_data)
-            if result is not None:
-                output_queue.queue.put(result)
+            # Decisions are only made on the newest telemetry
+            current_data, skipped = controller.queue_get_latest(input_queue, ACK_CHECK_PERIOD)
         except queue_proxy_wrapper.queue.Empty:
-            # No data available, check exit flag and continue
+            # Exit requested or time to check acks
             continue
+        except queue_proxy_wrapper.ShutDown:
+            # Telemetry has stopped
+            break
+
+        if skipped > 0:
+            command_obj.lazy_logger.debug("Skipped %d stale telemetry", skipped)
+
+        result = command_obj.run(current_data)
+        if result is None:
+            continue
+
+        try:
+            output_queue.put(result)
+        except queue_proxy_wrapper.ShutDown:
+            # Main is no longer reading
+            break
+
+    local_logger.info(command_obj.summary())
+
+    # End of stream for main
+    output_queue.close()
 
 
 # =================================================================================================
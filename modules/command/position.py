@@ -0,0 +1,62 @@
+"""
+3D position and its binary encoding.
+"""
+
+import struct
+
+import numpy as np
+
+
+class Position:
+    """
+    3D vector struct.
+
+    Has a fixed size binary encoding: x, y, z as 64 bit floats, little endian.
+    Pickles as its constructor arguments, the encoding is not smaller once the reference to it
+    is included. Fields are slots instead of an instance dict, like `TelemetryData` .
+    """
+
+    __slots__ = ("x", "y", "z")
+
+    # Same layout as the binary encoding, for zero-copy views of encoded records
+    DTYPE = np.dtype([("x", "<f8"), ("y", "<f8"), ("z", "<f8")])
+
+    __STRUCT = struct.Struct("<3d")
+    ENCODED_SIZE = __STRUCT.size  # bytes
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __reduce__(self) -> "tuple":
+        """
+        Pickles as the constructor arguments, smaller than the state of the slots.
+        """
+        return Position, (self.x, self.y, self.z)
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the binary encoding.
+        """
+        return self.__STRUCT.pack(self.x, self.y, self.z)
+
+    @classmethod
+    def from_buffer(cls, buffer: "bytes | bytearray | memoryview", offset: int = 0) -> "Position":
+        """
+        Decodes a binary encoding.
+
+        buffer: Contains the encoding.
+        offset: Position of the encoding in bytes.
+
+        Returns the decoded object.
+        """
+        return cls(*cls.__STRUCT.unpack_from(buffer, offset))
+
+    @classmethod
+    def view_buffer(cls, buffer: "bytes | bytearray | memoryview") -> np.ndarray:
+        """
+        Zero-copy view of consecutive binary encodings as a structured array with DTYPE ,
+        writable if the buffer is.
+        """
+        return np.frombuffer(buffer, dtype=cls.DTYPE)
@@ -0,0 +1,150 @@
+"""
+Incremental statistics of the drone velocity.
+"""
+
+import math
+
+
+class StreamStatistics:  # pylint: disable=too-many-instance-attributes
+    """
+    Statistics of a stream of values, each updated in O(1) per value:
+
+    * Mean and variance of all values, with Welford's algorithm, so they do not lose precision
+      like a running sum and sum of squares would over a long flight.
+    * Exponentially weighted moving average.
+    * Mean of the last window size values, from a ring buffer. The running window sum is
+      recomputed exactly once per window size updates, so rounding errors never accumulate.
+    """
+
+    def __init__(self, window_size: int, ewma_alpha: float) -> None:
+        """
+        window_size: Number of values in the moving average, at least 1.
+        ewma_alpha: Weight of each new value in the exponentially weighted average, in (0, 1].
+        """
+        self.count = 0
+        self.__mean = 0.0
+        # Sum of squared differences from the mean
+        self.__m2 = 0.0
+
+        self.__ewma_alpha = ewma_alpha
+        self.__ewma = math.nan
+
+        self.__window = [0.0] * window_size
+        self.__window_index = 0
+        self.__window_count = 0
+        self.__window_sum = 0.0
+        self.__updates_since_sum = 0
+
+    def update(self, value: float) -> None:
+        """
+        Adds a value.
+        """
+        self.count += 1
+        delta = value - self.__mean
+        self.__mean += delta / self.count
+        self.__m2 += delta * (value - self.__mean)
+
+        if self.count == 1:
+            self.__ewma = value
+        else:
+            self.__ewma += self.__ewma_alpha * (value - self.__ewma)
+
+        window = self.__window
+        index = self.__window_index
+        self.__window_sum += value - window[index]
+        window[index] = value
+        self.__window_index = (index + 1) % len(window)
+        self.__window_count = min(self.__window_count + 1, len(window))
+
+        self.__updates_since_sum += 1
+        if self.__updates_since_sum == len(window):
+            self.__window_sum = math.fsum(window)
+            self.__updates_since_sum = 0
+
+    def get_mean(self) -> float:
+        """
+        Returns the mean of all values, NaN without values.
+        """
+        return self.__mean if self.count > 0 else math.nan
+
+    def get_variance(self) -> float:
+        """
+        Returns the sample variance of all values, NaN with fewer than 2 values.
+        """
+        return self.__m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    def get_ewma(self) -> float:
+        """
+        Returns the exponentially weighted moving average, NaN without values.
+        """
+        return self.__ewma
+
+    def get_window_mean(self) -> float:
+        """
+        Returns the mean of the last window size values, NaN without values.
+        """
+        if self.__window_count == 0:
+            return math.nan
+
+        return self.__window_sum / self.__window_count
+
+
+class VelocityStatistics:
+    """
+    `StreamStatistics` of each axis of the velocity.
+    """
+
+    DEFAULT_WINDOW_SIZE = 20  # samples
+    # Each sample has a tenth of the weight, about the last 10 samples matter
+    DEFAULT_EWMA_ALPHA = 0.1
+
+    def __init__(
+        self, window_size: int = DEFAULT_WINDOW_SIZE, ewma_alpha: float = DEFAULT_EWMA_ALPHA
+    ) -> None:
+        """
+        window_size and ewma_alpha: Same as `StreamStatistics` .
+        """
+        self.axes = (
+            StreamStatistics(window_size, ewma_alpha),
+            StreamStatistics(window_size, ewma_alpha),
+            StreamStatistics(window_size, ewma_alpha),
+        )
+
+    def update(self, x_velocity: float, y_velocity: float, z_velocity: float) -> None:
+        """
+        Adds a velocity sample in m/s.
+        """
+        x_axis, y_axis, z_axis = self.axes
+        x_axis.update(x_velocity)
+        y_axis.update(y_velocity)
+        z_axis.update(z_velocity)
+
+    def get_count(self) -> int:
+        """
+        Returns the number of samples.
+        """
+        return self.axes[0].count
+
+    def get_mean(self) -> "tuple[float, float, float]":
+        """
+        Returns the mean velocity of all samples.
+        """
+        return tuple(axis.get_mean() for axis in self.axes)
+
+    def get_variance(self) -> "tuple[float, float, float]":
+        """
+        Returns the sample variance of each axis.
+        """
+        return tuple(axis.get_variance() for axis in self.axes)
+
+    def get_ewma(self) -> "tuple[float, float, float]":
+        """
+        Returns the exponentially weighted moving average velocity.
+        """
+        return tuple(axis.get_ewma() for axis in self.axes)
+
+    def get_window_mean(self) -> "tuple[float, float, float]":
+        """
+        Returns the mean velocity of the last window size samples.
+        """
+        return tuple(axis.get_window_mean() for axis in self.axes)
@@ -0,0 +1,95 @@
+"""
+Connection state from the arrival times of heartbeats.
+"""
+
+import collections
+import time
+
+
+class HeartbeatMonitor:
+    """
+    Sliding window over the arrival times of heartbeats.
+
+    The connection is connected while a heartbeat arrived within the last
+    disconnect threshold number of periods, and disconnected otherwise,
+    including when no heartbeat arrived that long after starting.
+    Only changes of state are reported.
+    """
+
+    CONNECTED = "Connected"
+    DISCONNECTED = "Disconnected"
+
+    def __init__(
+        self, period: float, disconnect_threshold: int, start_time: "float | None" = None
+    ) -> None:
+        """
+        period: Seconds between heartbeats.
+        disconnect_threshold: Periods without a heartbeat before disconnecting, at least 1.
+        start_time: Monotonic time waiting for heartbeats started in seconds, None for now.
+        """
+        self.period = period
+        self.window = period * disconnect_threshold
+        # Arrival time of the last heartbeat, or the start time without any
+        self.__last_time = time.monotonic() if start_time is None else start_time
+        # Arrival times within the window, oldest first
+        self.__arrivals: "collections.deque[float]" = collections.deque()
+        self.state: "str | None" = None
+
+    def record_heartbeat(self, now: "float | None" = None) -> None:
+        """
+        Timestamps a heartbeat that arrived now.
+
+        now: Monotonic time in seconds, None for the current time.
+        """
+        self.__last_time = time.monotonic() if now is None else now
+        self.__arrivals.append(self.__last_time)
+
+    def update(self, now: "float | None" = None) -> "str | None":
+        """
+        Evaluates the connection over the window ending now.
+
+        now: Monotonic time in seconds, None for the current time.
+
+        Returns the new state if it changed, otherwise None.
+        """
+        now = time.monotonic() if now is None else now
+        while len(self.__arrivals) > 0 and self.__arrivals[0] <= now - self.window:
+            self.__arrivals.popleft()
+
+        if len(self.__arrivals) > 0:
+            state = self.CONNECTED
+        elif self.state is not None or now >= self.__last_time + self.window:
+            state = self.DISCONNECTED
+        else:
+            # Not waited long enough for a first heartbeat to disconnect
+            return None
+
+        if state == self.state:
+            return None
+
+        self.state = state
+        return state
+
+    def get_timeout(self, now: "float | None" = None) -> float:
+        """
+        Returns the seconds to wait for a heartbeat before updating:
+        at most a period, and no later than when the state changes without one.
+        """
+        if self.state == self.DISCONNECTED:
+            return self.period
+
+        now = time.monotonic() if now is None else now
+        return max(min(self.__last_time + self.window - now, self.period), 0.0)
+
+    def get_missed_count(self, now: "float | None" = None) -> int:
+        """
+        Returns the number of periods since the last heartbeat, or since starting.
+        """
+        now = time.monotonic() if now is None else now
+        return int((now - self.__last_time) / self.period)
+
+    def get_heartbeat_count(self) -> int:
+        """
+        Returns the number of heartbeats in the window as of the last update.
+        """
+        return len(self.__arrivals)
@@ -4,9 +4,16 @@ Heartbeat receiving logic.
 
 from pymavlink import mavutil
 
+from utilities.workers import worker_controller
+from . import heartbeat_monitor
 from ..common.modules.logger import logger  # pylint: disable=unused-import
 
 
+# Same as the heartbeat receiver mock drone
+HEARTBEAT_PERIOD = 1  # seconds
+DISCONNECT_THRESHOLD = 5
+
+
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
@@ -19,31 +26,59 @@ class HeartbeatReceiver:
 
     @classmethod
     def create(
-        cls, connection: mavutil.mavfile
-    ) -> tuple[bool, HeartbeatReceiver]:  # pylint: disable=undefined-variable
+        cls,
+        connection: mavutil.mavfile,
+        period: float = HEARTBEAT_PERIOD,
+        disconnect_threshold: int = DISCONNECT_THRESHOLD,
+    ) -> "tuple[True, HeartbeatReceiver] | tuple[False, None]":
         """
         Falliable create (instantiation) method to create a HeartbeatReceiver object.
+
+        period: Seconds between heartbeats of the drone.
+        disconnect_threshold: Periods without a heartbeat before disconnecting.
         """
-        return True, cls(cls.__private_key, connection)
+        if period <= 0.0 or disconnect_threshold < 1:
+            return False, None
+
+        return True, cls(cls.__private_key, connection, period, disconnect_threshold)
 
     def __init__(
         self,
         key: object,
         connection: mavutil.mavfile,  # Put your own arguments here
+        period: float,
+        disconnect_threshold: int,
     ) -> None:
         assert key is HeartbeatReceiver.__private_key, "Use create() method"
 
         # Do any intializiation here
         self.connection = connection
+        self.monitor = heartbeat_monitor.HeartbeatMonitor(period, disconnect_threshold)
 
-    def run(self) -> str:  # Put your own arguments here
+    def run(
+        self, controller: worker_controller.WorkerController | None = None
+    ) -> str | None:  # Put your own arguments here
         """
         Attempt to recieve a heartbeat message.
         If disconnected for over a threshold number of periods,
         the connection is considered disconnected.
+
+        Waits at most a period, so a disconnect is reported within a period of the threshold.
+
+        controller: If given, returns None as soon as exit is requested.
+
+        Returns "Connected" or "Disconnected" if the state changed, otherwise None.
         """
-        message = self.connection.recv_match(type="HEARTBEAT", blocking=True, timeout=1)
-        return message
+        timeout = self.monitor.get_timeout()
+        if controller is not None:
+            message = controller.recv_match(self.connection, timeout, type="HEARTBEAT")
+        else:
+            message = self.connection.recv_match(type="HEARTBEAT", blocking=True, timeout=timeout)
+
+        if message is not None:
+            self.monitor.record_heartbeat()
+
+        return self.monitor.update()
 
 
 # =================================================================================================
@@ -0,0 +1,63 @@
+"""
+Heartbeat receiver worker as a task in the event loop.
+"""
+
+import asyncio
+
+from modules.router import async_mavlink_transport
+from utilities.workers import async_worker_controller
+from utilities.workers import worker_logger
+from . import heartbeat_monitor
+from . import heartbeat_receiver
+
+
+async def heartbeat_receiver_async_worker(
+    connection: async_mavlink_transport.AsyncRoutedConnection,
+    output_queue: asyncio.Queue,
+    controller: async_worker_controller.AsyncWorkerController,
+) -> None:
+    """
+    Same as `heartbeat_receiver_worker.heartbeat_receiver_worker()` as a task in the event loop.
+
+    connection: Subscription of the transport to HEARTBEAT.
+    output_queue: Connection status for main, the oldest is dropped when full.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    monitor = heartbeat_monitor.HeartbeatMonitor(
+        heartbeat_receiver.HEARTBEAT_PERIOD, heartbeat_receiver.DISCONNECT_THRESHOLD
+    )
+
+    # Main loop: only changes of state are sent to main
+    while not controller.is_exit_requested():
+        # Heartbeats already queued are taken even when the timeout is 0
+        _, message = await controller.until_exit(
+            connection.recv_match("HEARTBEAT", monitor.get_timeout())
+        )
+        if controller.is_exit_requested():
+            break
+
+        if message is not None:
+            monitor.record_heartbeat()
+
+        status = monitor.update()
+        if status is None:
+            continue
+
+        if status == monitor.DISCONNECTED:
+            local_logger.error(f"{monitor.get_missed_count()} Heartbeats from Drone Missed!!!")
+        else:
+            local_logger.info("Drone connected")
+
+        # Main only needs the newest status
+        if output_queue.full():
+            output_queue.get_nowait()
+
+        output_queue.put_nowait(status)
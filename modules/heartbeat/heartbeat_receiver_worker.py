@@ -2,16 +2,12 @@
 Heartbeat worker that sends heartbeats periodically.
 """
 
-import os
-import pathlib
-import time  ### ADDED THIS MYSELF
-
 from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_logger
 from . import heartbeat_receiver
-from ..common.modules.logger import logger
 
 
 # =================================================================================================
@@ -34,18 +30,13 @@ def heartbeat_receiver_worker(
     # =============================================================================================
 
     # Instantiate logger
-    worker_name = pathlib.Path(__file__).stem
-    process_id = os.getpid()
-    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    result, local_logger = worker_logger.create_worker_logger(__file__)
     if not result:
-        print("ERROR: Worker failed to create logger")
         return
 
     # Get Pylance to stop complaining
     assert local_logger is not None
 
-    local_logger.info("Logger initialized", True)
-
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
@@ -57,19 +48,30 @@ def heartbeat_receiver_worker(
         controller.request_exit()
         return
 
-    # Main loop: do work.
-    num_missed = 0
+    # Main loop: do work. Only changes of state are sent to main
     while not controller.is_exit_requested():
-        message = hb_receiver.run()
-        if message is not None:
-            num_missed = 0
-            output_queue.queue.put("Connected")
-        elif message is None:
-            output_queue.queue.put("Disconnected")
-
-            num_missed += 1
-            local_logger.error(f"{num_missed} Heartbeats from Drone Missed!!!")
-        time.sleep(1)
+        status = hb_receiver.run(controller)
+        if controller.is_exit_requested():
+            break
+
+        if status is None:
+            continue
+
+        if status == "Disconnected":
+            local_logger.error(
+                f"{hb_receiver.monitor.get_missed_count()} Heartbeats from Drone Missed!!!"
+            )
+        else:
+            local_logger.info("Drone connected")
+
+        try:
+            output_queue.put(status)
+        except queue_proxy_wrapper.ShutDown:
+            # Main is no longer reading
+            break
+
+    # End of stream for main
+    output_queue.close()
 
 
 # =================================================================================================
@@ -0,0 +1,47 @@
+"""
+Heartbeat sender worker as a task in the event loop.
+"""
+
+from modules.router import async_mavlink_transport
+from utilities.workers import async_worker_controller
+from utilities.workers import timer_wheel
+from utilities.workers import worker_logger
+from . import heartbeat_sender
+from . import heartbeat_sender_worker
+
+
+async def heartbeat_sender_async_worker(
+    connection: async_mavlink_transport.AsyncRoutedConnection,
+    controller: async_worker_controller.AsyncWorkerController,
+) -> None:
+    """
+    Same as `heartbeat_sender_worker.heartbeat_sender_worker()` as a task in the event loop.
+
+    connection: Subscription of the transport, only used to send.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    connection_created, hb_sender = heartbeat_sender.HeartbeatSender.create(connection)
+    if not connection_created:
+        local_logger.error("ERROR: No connection found")
+        controller.request_exit()
+        return
+
+    wheel = timer_wheel.TimerWheel()
+    heartbeat_task = wheel.add_task(
+        "heartbeat", heartbeat_sender_worker.HEARTBEAT_PERIOD, hb_sender.run
+    )
+
+    # Main loop: the send is written to the stream without waiting
+    while not controller.is_exit_requested():
+        wheel.run_pending()
+        await controller.wait(wheel.get_timeout())
+
+    local_logger.info(heartbeat_task.summary())
@@ -2,15 +2,15 @@
 Heartbeat worker that sends heartbeats periodically.
 """
 
-import os
-import pathlib
-import time
-
 from pymavlink import mavutil
 
+from utilities.workers import timer_wheel
 from utilities.workers import worker_controller
+from utilities.workers import worker_logger
 from . import heartbeat_sender
-from ..common.modules.logger import logger
+
+
+HEARTBEAT_PERIOD = 1  # seconds
 
 
 # =================================================================================================
@@ -30,18 +30,13 @@ def heartbeat_sender_worker(
     # =============================================================================================
 
     # Instantiate logger
-    worker_name = pathlib.Path(__file__).stem
-    process_id = os.getpid()
-    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    result, local_logger = worker_logger.create_worker_logger(__file__)
     if not result:
-        print("ERROR: Worker failed to create logger")
         return
 
     # Get Pylance to stop complaining
     assert local_logger is not None
 
-    local_logger.info("Logger initialized", True)
-
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
@@ -54,11 +49,17 @@ def heartbeat_sender_worker(
 
     local_logger.info("Heartbeat sender connection established")
 
+    # Sends are on deadlines a period apart, however long each takes
+    wheel = timer_wheel.TimerWheel()
+    heartbeat_task = wheel.add_task("heartbeat", HEARTBEAT_PERIOD, hb_sender.run)
+
     # Main loop: do work.
     if connection_created is True:
         while not controller.is_exit_requested():
-            hb_sender.run()
-            time.sleep(1)
+            wheel.run_pending()
+            controller.wait(wheel.get_timeout())
+
+    local_logger.info(heartbeat_task.summary())
 
 
 # =================================================================================================
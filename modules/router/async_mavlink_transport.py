@@ -0,0 +1,198 @@
+"""
+MAVLink over asyncio streams, routed to tasks in the same event loop.
+"""
+
+import asyncio
+
+from pymavlink import mavutil
+
+from utilities.workers import async_worker_controller
+from . import frame_filter
+
+
+class AsyncRoutedConnection:
+    """
+    Same as `RoutedConnection` for tasks: `recv_match()` is a coroutine
+    and `mav` writes straight to the stream, since every task runs in the same thread.
+    """
+
+    def __init__(
+        self,
+        message_types: "list[str]",
+        inbound_queue: asyncio.Queue,
+        mav: mavutil.mavlink.MAVLink,
+    ) -> None:
+        """
+        message_types: Message types routed to this subscription.
+        inbound_queue: Messages routed to this subscription, in order.
+        mav: Encoder of the transport.
+        """
+        self.message_types = message_types
+        self.__inbound_queue = inbound_queue
+        self.mav = mav
+
+    async def recv_match(
+        self,
+        type: "str | list[str] | None" = None,  # pylint: disable=redefined-builtin
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next routed message of the type, discarding others.
+
+        type: Message type or types, None for any subscribed type.
+        timeout: Seconds, None to wait forever, 0 to only take queued messages.
+
+        Returns the message, or None if there is none in time.
+        """
+        if isinstance(type, str):
+            type = [type]
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+            # Waiting with no time left times out even if a message is queued
+            if not self.__inbound_queue.empty():
+                message = self.__inbound_queue.get_nowait()
+            elif remaining == 0.0:
+                return None
+            else:
+                try:
+                    message = await asyncio.wait_for(self.__inbound_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+
+            if type is None or message.get_type() in type:
+                return message
+
+
+class AsyncMavlinkTransport:
+    """
+    MAVLink connection over an asyncio stream that fans received messages out
+    to subscriptions by message type, like `MavlinkRouter` without the router process.
+
+    Only the subscribed types are decoded.
+    Subscriber queues drop their oldest message when full, so a slow task never stalls receiving.
+    """
+
+    DEFAULT_INBOUND_QUEUE_SIZE = 16
+    # Largest read from the stream at once
+    RECEIVE_SIZE = 4096  # bytes
+
+    @classmethod
+    async def open(
+        cls, connection_string: str, source_system: int = 255, source_component: int = 0
+    ) -> "AsyncMavlinkTransport":
+        """
+        Connects to a TCP MAVLink endpoint.
+
+        connection_string: `tcp:host:port` , as for `mavutil.mavlink_connection()` .
+        source_system and source_component: IDs in sent messages, the mavutil defaults.
+
+        Raises `ValueError` if the connection string is not TCP.
+        Raises `OSError` if the connection fails.
+        """
+        scheme, _, address = connection_string.partition(":")
+        host, _, port = address.rpartition(":")
+        if scheme != "tcp" or host == "" or not port.isdigit():
+            raise ValueError(f"Only tcp:host:port connections are supported: {connection_string}")
+
+        reader, writer = await asyncio.open_connection(host, int(port))
+        return cls(reader, writer, source_system, source_component)
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        source_system: int = 255,
+        source_component: int = 0,
+    ) -> None:
+        """
+        reader and writer: Connected stream.
+        source_system and source_component: IDs in sent messages.
+        """
+        self.__reader = reader
+        self.__writer = writer
+        # Sends are written to the stream buffer without waiting
+        self.mav = mavutil.mavlink.MAVLink(self, source_system, source_component)
+        self.__subscribers: "dict[str, list[asyncio.Queue]]" = {}
+
+        # Set when run, for its frame counts
+        self.incoming: "frame_filter.FrameFilter | None" = None
+
+    def subscribe(
+        self, message_types: "list[str]", queue_size: int = DEFAULT_INBOUND_QUEUE_SIZE
+    ) -> AsyncRoutedConnection:
+        """
+        Creates a subscription, must be called before running.
+
+        message_types: Message types to receive, empty to only send.
+        queue_size: Maximum number of messages held for the subscriber.
+
+        Returns the connection to pass to the subscribing worker.
+        """
+        inbound_queue = asyncio.Queue(queue_size)
+        for message_type in message_types:
+            self.__subscribers.setdefault(message_type, []).append(inbound_queue)
+
+        return AsyncRoutedConnection(list(message_types), inbound_queue, self.mav)
+
+    def route(self, message: mavutil.mavlink.MAVLink_message) -> int:
+        """
+        Delivers a received message to the subscribers of its type.
+
+        Returns the number of subscribers it was delivered to.
+        """
+        subscribers = self.__subscribers.get(message.get_type(), [])
+        for inbound_queue in subscribers:
+            if inbound_queue.full():
+                inbound_queue.get_nowait()
+
+            inbound_queue.put_nowait(message)
+
+        return len(subscribers)
+
+    async def run(self, controller: async_worker_controller.AsyncWorkerController) -> bool:
+        """
+        Receives and routes messages until exit is requested or the stream ends.
+        Sends are dropped once the stream has ended.
+
+        Returns whether the stream ended.
+        """
+        self.incoming = frame_filter.FrameFilter(list(self.__subscribers))
+        while True:
+            try:
+                completed, data = await controller.until_exit(self.__reader.read(self.RECEIVE_SIZE))
+                if not completed:
+                    return False
+
+                if len(data) > 0:
+                    for message in self.incoming.feed(data):
+                        self.route(message)
+
+                    # Let the stream send what the subscribers wrote
+                    await self.__writer.drain()
+                    continue
+            except ConnectionError:
+                pass
+
+            self.__writer.close()
+            return True
+
+    def write(self, data: "bytes | bytearray") -> None:
+        """
+        Writes encoded messages to the stream, dropped once it is closed
+        since the drone is gone.
+        """
+        if not self.__writer.is_closing():
+            self.__writer.write(data)
+
+    async def close(self) -> None:
+        """
+        Closes the stream.
+        """
+        self.__writer.close()
+        try:
+            await self.__writer.wait_closed()
+        except OSError:
+            pass
@@ -0,0 +1,321 @@
+"""
+Batch receiving and decoding of fixed layout MAVLink messages with NumPy.
+"""
+
+import re
+import socket
+
+import numpy as np
+from pymavlink import mavutil
+
+
+# Start of frame markers
+MAVLINK_V1_MARKER = 0xFE
+MAVLINK_V2_MARKER = 0xFD
+# Bytes before the payload, and the checksum after it
+MAVLINK_V1_HEADER_SIZE = 6
+MAVLINK_V2_HEADER_SIZE = 10
+CHECKSUM_SIZE = 2
+
+# Struct format characters of MAVLink fields, as little endian NumPy types
+FORMAT_TYPES = {
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8",
+    "c": "S1",
+}
+
+
+def message_dtype(message_type: str) -> np.dtype:
+    """
+    Structured dtype with the wire layout of the payload of a message type,
+    fields named as in pymavlink. Extension fields are not included.
+
+    Raises `KeyError` if the type is not in the dialect.
+    """
+    message_class = mavutil.mavlink.mavlink_map[message_id(message_type)]
+
+    fields = []
+    formats = re.findall(r"(\d*)([a-zA-Z])", message_class.unpacker.format)
+    for name, (count, character) in zip(message_class.ordered_fieldnames, formats):
+        if character == "s":
+            fields.append((name, f"S{count}"))
+        elif count != "":
+            fields.append((name, FORMAT_TYPES[character], (int(count),)))
+        else:
+            fields.append((name, FORMAT_TYPES[character]))
+
+    return np.dtype(fields)
+
+
+def message_id(message_type: str) -> int:
+    """
+    Message ID of a message type.
+
+    Raises `KeyError` if the type is not in the dialect.
+    """
+    return getattr(mavutil.mavlink, f"MAVLINK_MSG_ID_{message_type}")
+
+
+def find_frames(buffer: bytearray, position: int, end: int) -> "tuple[list[int], int]":
+    """
+    Follows frame lengths from the first start marker at or after position.
+    Only reads the headers, in a well formed stream the next frame starts where one ends.
+
+    buffer: Received bytes, up to end.
+
+    Returns the starts of the complete frames, and where the next receive continues from:
+    the start of an incomplete frame, otherwise end.
+    """
+    starts = []
+    while position < end:
+        marker = buffer[position]
+        if marker == MAVLINK_V2_MARKER:
+            if position + 3 > end:
+                return starts, position
+        elif marker == MAVLINK_V1_MARKER:
+            if position + 2 > end:
+                return starts, position
+        else:
+            # Out of sync, skip to the next start marker
+            next_starts = [
+                next_start
+                for next_start in (
+                    buffer.find(MAVLINK_V1_MARKER, position, end),
+                    buffer.find(MAVLINK_V2_MARKER, position, end),
+                )
+                if next_start >= 0
+            ]
+            if len(next_starts) == 0:
+                return starts, end
+
+            position = min(next_starts)
+            continue
+
+        size = frame_size(buffer, position)
+        if position + size > end:
+            return starts, position
+
+        starts.append(position)
+        position += size
+
+    return starts, end
+
+
+def frame_size(buffer: "bytes | bytearray", start: int) -> int:
+    """
+    Size in bytes of the frame at start, from the length and flags in its header.
+    """
+    if buffer[start] == MAVLINK_V2_MARKER:
+        size = MAVLINK_V2_HEADER_SIZE + buffer[start + 1] + CHECKSUM_SIZE
+        if buffer[start + 2] & mavutil.mavlink.MAVLINK_IFLAG_SIGNED:
+            size += mavutil.mavlink.MAVLINK_SIGNATURE_BLOCK_LEN
+
+        return size
+
+    return MAVLINK_V1_HEADER_SIZE + buffer[start + 1] + CHECKSUM_SIZE
+
+
+def frame_message_id(buffer: "bytes | bytearray", start: int) -> int:
+    """
+    Message ID in the header of the frame at start.
+    """
+    if buffer[start] == MAVLINK_V2_MARKER:
+        return buffer[start + 7] | (buffer[start + 8] << 8) | (buffer[start + 9] << 16)
+
+    return buffer[start + 5]
+
+
+def x25_crc(rows: np.ndarray, crc_extra: int) -> np.ndarray:
+    """
+    MAVLink checksum of each row of bytes, one byte position at a time for all rows.
+
+    rows: 2D array of uint8, everything after the start marker up to the end of the payload.
+    crc_extra: Seed byte of the message type, appended after the row.
+
+    Returns the checksums as uint32.
+    """
+    crc = np.full(rows.shape[0], 0xFFFF, dtype=np.uint32)
+    columns = [rows[:, i].astype(np.uint32) for i in range(rows.shape[1])]
+    columns.append(np.full(rows.shape[0], crc_extra, dtype=np.uint32))
+    for column in columns:
+        tmp = column ^ (crc & 0xFF)
+        tmp = (tmp ^ (tmp << 4)) & 0xFF
+        crc = ((crc >> 8) ^ (tmp << 8) ^ (tmp << 3) ^ (tmp >> 4)) & 0xFFFF
+
+    return crc
+
+
+class BulkDecoder:
+    """
+    Frames every complete MAVLink v1 and v2 packet in a receive buffer at once,
+    checks the checksums of the requested types and decodes their payloads
+    into structured arrays, grouped by message type.
+    Other types are skipped by the message ID in their header.
+
+    The buffer is preallocated and filled with `recv_into()` , an incomplete packet
+    at the end is kept for the next receive.
+    Like pymavlink, a bad checksum resynchronizes 1 byte after the start marker.
+    """
+
+    DEFAULT_BUFFER_SIZE = 65536  # bytes
+    DEFAULT_MESSAGE_TYPES = ("HEARTBEAT", "ATTITUDE", "LOCAL_POSITION_NED")
+
+    def __init__(
+        self,
+        message_types: "tuple[str, ...] | list[str]" = DEFAULT_MESSAGE_TYPES,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        message_types: Types to decode, frames of other types are skipped.
+        buffer_size: Receive buffer size in bytes, at least the largest frame.
+        """
+        self.__buffer = bytearray(buffer_size)
+        self.__view = memoryview(self.__buffer)
+        self.__end = 0
+
+        # Message ID to type name and payload dtype
+        self.__dtypes = {
+            message_id(message_type): (message_type, message_dtype(message_type))
+            for message_type in message_types
+        }
+
+        # Good frames of the requested types, frames of other types, and resynchronizations
+        self.frame_count = 0
+        self.skipped_count = 0
+        self.bad_frame_count = 0
+
+    def receive(self, sock: socket.socket) -> "dict[str, np.ndarray]":
+        """
+        Reads whatever is available into the free part of the buffer, up to its size,
+        then decodes the complete frames.
+
+        sock: Stream or datagram socket, for example `port` of a mavutil TCP connection.
+
+        Returns the same as `decode()` .
+        Raises `EOFError` if the peer closed a stream socket.
+        Raises `BlockingIOError` or `socket.timeout` as `recv_into()` does.
+        """
+        count = sock.recv_into(self.__view[self.__end :])
+        if count == 0 and self.__end < len(self.__buffer):
+            raise EOFError
+
+        self.__end += count
+        return self.decode()
+
+    def feed(self, data: "bytes | bytearray | memoryview") -> "dict[str, np.ndarray]":
+        """
+        Same as `receive()` with the data copied in instead of read from a socket,
+        in chunks of at most the buffer size.
+        """
+        data = memoryview(data)
+        results: "dict[str, list[np.ndarray]]" = {}
+        while len(data) > 0:
+            count = min(len(data), len(self.__buffer) - self.__end)
+            self.__view[self.__end : self.__end + count] = data[:count]
+            self.__end += count
+            data = data[count:]
+
+            for message_type, records in self.decode().items():
+                results.setdefault(message_type, []).append(records)
+
+        return {message_type: np.concatenate(chunks) for message_type, chunks in results.items()}
+
+    def decode(self) -> "dict[str, np.ndarray]":
+        """
+        Decodes the complete frames in the buffer and keeps the incomplete one.
+
+        Returns the payloads of the requested types, in receive order within each type.
+        """
+        data = np.frombuffer(self.__buffer, dtype=np.uint8, count=self.__end)
+        results: "dict[str, list[np.ndarray]]" = {}
+
+        position = 0
+        while True:
+            starts, consumed = find_frames(self.__buffer, position, self.__end)
+            if len(starts) == 0:
+                break
+
+            bad_start = self.__decode_frames(data, np.array(starts, dtype=np.int64), results)
+            if bad_start is None:
+                break
+
+            # Resynchronize after the start marker of the frame with a bad checksum
+            position = bad_start + 1
+
+        remaining = self.__end - consumed
+        self.__buffer[:remaining] = self.__buffer[consumed : self.__end]
+        self.__end = remaining
+
+        return {message_type: np.concatenate(chunks) for message_type, chunks in results.items()}
+
+    def __decode_frames(
+        self, data: np.ndarray, starts: np.ndarray, results: "dict[str, list[np.ndarray]]"
+    ) -> "int | None":
+        """
+        Checks and decodes consecutive frames of the requested types, appending payloads to results.
+        Frames of other types are skipped by their header alone, without a checksum.
+        Only the frames before the first bad frame are used.
+
+        Returns the start of the first requested frame with a bad checksum,
+        or None if all were good.
+        """
+        is_v2 = data[starts] == MAVLINK_V2_MARKER
+        payload_sizes = data[starts + 1].astype(np.int64)
+        header_sizes = np.where(is_v2, MAVLINK_V2_HEADER_SIZE, MAVLINK_V1_HEADER_SIZE)
+        message_ids = np.where(
+            is_v2,
+            data[np.minimum(starts + 7, len(data) - 1)].astype(np.int64)
+            | (data[np.minimum(starts + 8, len(data) - 1)].astype(np.int64) << 8)
+            | (data[np.minimum(starts + 9, len(data) - 1)].astype(np.int64) << 16),
+            data[np.minimum(starts + 5, len(data) - 1)].astype(np.int64),
+        )
+
+        requested = np.isin(message_ids, list(self.__dtypes))
+        good = np.ones(len(starts), dtype=bool)
+
+        # Checksums of each group of requested frames with the same ID and checked length
+        checked_sizes = header_sizes - 1 + payload_sizes
+        keys = message_ids * 512 + checked_sizes
+        for key in np.unique(keys[requested]):
+            group = np.flatnonzero(keys == key)
+            message_class = mavutil.mavlink.mavlink_map[int(key // 512)]
+            size = int(key % 512)
+            group_starts = starts[group]
+            rows = data[group_starts[:, None] + 1 + np.arange(size)[None, :]]
+            checksum_offsets = group_starts + 1 + size
+            received = data[checksum_offsets].astype(np.uint32) | (
+                data[checksum_offsets + 1].astype(np.uint32) << 8
+            )
+            good[group] = x25_crc(rows, message_class.crc_extra) == received
+
+        bad = np.flatnonzero(~good)
+        count = len(starts) if len(bad) == 0 else int(bad[0])
+        requested_count = int(np.count_nonzero(requested[:count]))
+        self.frame_count += requested_count
+        self.skipped_count += count - requested_count
+        if len(bad) > 0:
+            self.bad_frame_count += 1
+
+        # Payloads of each requested type, truncated trailing zeros of v2 restored
+        for identifier, (message_type, dtype) in self.__dtypes.items():
+            group = np.flatnonzero(message_ids[:count] == identifier)
+            if len(group) == 0:
+                continue
+
+            offsets = np.arange(dtype.itemsize)[None, :]
+            payload_starts = (starts[group] + header_sizes[group])[:, None]
+            rows = data[np.minimum(payload_starts + offsets, len(data) - 1)]
+            rows = np.where(offsets < payload_sizes[group][:, None], rows, 0).astype(np.uint8)
+            results.setdefault(message_type, []).append(
+                np.ascontiguousarray(rows).view(dtype).reshape(-1)
+            )
+
+        return None if len(bad) == 0 else int(starts[bad[0]])
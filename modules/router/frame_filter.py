@@ -0,0 +1,91 @@
+"""
+Selection of MAVLink frames by the message ID in their header, before decoding.
+"""
+
+from pymavlink import mavutil
+
+from . import bulk_decoder
+
+
+class FrameFilter:
+    """
+    Frames received bytes and decodes only the frames of the accepted types into messages.
+
+    Frames of other types are skipped by the length in their header,
+    without checking the checksum, unpacking the payload, or creating a message.
+    Accepted frames are checked and decoded by pymavlink as usual,
+    a bad one resynchronizes 1 byte after its start marker.
+    An incomplete frame at the end is kept for the next feed.
+    """
+
+    def __init__(
+        self,
+        message_types: "list[str]",
+        parser: "mavutil.mavlink.MAVLink | None" = None,
+    ) -> None:
+        """
+        message_types: Types to decode, for example the types subscribed to by a consumer.
+        parser: Decodes accepted frames, for example `mav` of the connection.
+            None for a parser of its own.
+
+        Raises `KeyError` if a type is not in the dialect.
+        """
+        self.message_ids = {bulk_decoder.message_id(message_type) for message_type in message_types}
+        self.__parser = mavutil.mavlink.MAVLink(None) if parser is None else parser
+        self.__pending = bytearray()
+
+        # Decoded frames, frames of other types, and resynchronizations
+        self.accepted_count = 0
+        self.skipped_count = 0
+        self.bad_frame_count = 0
+
+    def feed(self, data: "bytes | bytearray") -> "list[mavutil.mavlink.MAVLink_message]":
+        """
+        Frames the data after what is left from the previous feed.
+
+        Returns the messages of the accepted types, in receive order.
+        """
+        self.__pending += data
+        messages = []
+
+        position = 0
+        while True:
+            starts, consumed = bulk_decoder.find_frames(
+                self.__pending, position, len(self.__pending)
+            )
+            bad_start = self.__decode_frames(starts, messages)
+            if bad_start is None:
+                break
+
+            # Resynchronize after the start marker of the bad frame
+            position = bad_start + 1
+
+        del self.__pending[:consumed]
+        return messages
+
+    def __decode_frames(
+        self, starts: "list[int]", messages: "list[mavutil.mavlink.MAVLink_message]"
+    ) -> "int | None":
+        """
+        Decodes the accepted frames in order, appending them to messages.
+        Only the frames before the first bad frame are used.
+
+        Returns the start of the first accepted frame that failed to decode,
+        or None if all were good.
+        """
+        for start in starts:
+            if bulk_decoder.frame_message_id(self.__pending, start) not in self.message_ids:
+                self.skipped_count += 1
+                continue
+
+            end = start + bulk_decoder.frame_size(self.__pending, start)
+            try:
+                message = self.__parser.decode(self.__pending[start:end])
+            except mavutil.mavlink.MAVError:
+                self.bad_frame_count += 1
+                return start
+
+            self.accepted_count += 1
+            messages.append(message)
+
+        return None
@@ -0,0 +1,196 @@
+"""
+Routing of MAVLink messages between the connection and workers.
+"""
+
+import queue
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_notifier
+from utilities.workers import queue_proxy_wrapper
+
+
+class OutboundMavlink(mavutil.mavlink.MAVLink):
+    """
+    MAVLink encoder whose sends are put into the outbound queue of the router,
+    which packs and writes them in order with its own sequence numbers.
+    """
+
+    def __init__(self, outbound_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        super().__init__(None)
+        self.__outbound_queue = outbound_queue
+
+    def send(self, mavmsg: mavutil.mavlink.MAVLink_message, force_mavlink1: bool = False) -> None:
+        """
+        Queues the message for the router instead of writing it.
+        Dropped if the router has stopped, since nothing can write it anymore.
+        """
+        try:
+            self.__outbound_queue.put((mavmsg, force_mavlink1))
+        except queue_proxy_wrapper.ShutDown:
+            pass
+
+
+class RoutedConnection:
+    """
+    Subscription to some MAVLink message types,
+    with the parts of the `mavutil.mavfile` interface the workers use:
+    `recv_match()` for the subscribed types and `mav` for sends.
+    """
+
+    def __init__(
+        self,
+        message_types: "list[str]",
+        inbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        outbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    ) -> None:
+        """
+        message_types: Message types routed to this subscription.
+        inbound_queue: Messages routed to this subscription, in order.
+        outbound_queue: Messages sent by any subscription.
+        """
+        self.message_types = message_types
+        self.__inbound_queue = inbound_queue
+        # Lets the worker controller wait on the subscription without polling
+        self.notifier = inbound_queue.notifier
+        self.mav = OutboundMavlink(outbound_queue)
+
+    # Same signature as mavutil.mavfile
+    def recv_match(
+        self,
+        type: "str | list[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next routed message of the type, discarding others.
+
+        type: Message type or types, None for any subscribed type.
+        blocking and timeout: Same as `mavutil.mavfile.recv_match()` .
+
+        Returns the message, or None if there is none in time or the router has stopped.
+        """
+        if isinstance(type, str):
+            type = [type]
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                message = self.__inbound_queue.get(blocking, remaining)
+            except (queue.Empty, queue_proxy_wrapper.ShutDown):
+                return None
+
+            if type is None or message.get_type() in type:
+                return message
+
+
+class MavlinkRouter:
+    """
+    Fans received messages out to subscriptions by message type,
+    and serializes the sends of all subscriptions.
+
+    Subscriptions are created in main before the workers start,
+    then the router worker is the only process using the connection,
+    so every frame is parsed once and delivered to every subscriber of its type.
+    Frames of types nobody subscribed to are not decoded at all.
+    Subscriber queues drop their oldest message when full, so a slow worker never stalls the router.
+    """
+
+    DEFAULT_INBOUND_QUEUE_SIZE = 16
+    DEFAULT_OUTBOUND_QUEUE_SIZE = 16
+    # Largest pickled message of the ardupilotmega dialect with all fields set is under 1.8 kB,
+    # so a message and its statistics stamp always fit
+    MESSAGE_SLOT_SIZE = 4096  # bytes
+
+    def __init__(
+        self,
+        outbound_queue_size: int = DEFAULT_OUTBOUND_QUEUE_SIZE,
+        notifier: queue_notifier.QueueNotifier | None = None,
+    ) -> None:
+        """
+        outbound_queue_size: Maximum number of sends waiting for the router,
+            further sends block until it catches up.
+        notifier: If given, notified on every routed message,
+            such as `WorkerController.notifier` so its receives block without polling.
+        """
+        self.__outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            outbound_queue_size,
+            queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            slot_size=self.MESSAGE_SLOT_SIZE,
+        )
+        self.__notifier = notifier
+        self.__subscribers: "dict[str, list[queue_proxy_wrapper.QueueProxyWrapper]]" = {}
+        self.__inbound_queues: "list[queue_proxy_wrapper.QueueProxyWrapper]" = []
+
+    def subscribe(
+        self, message_types: "list[str]", queue_size: int = DEFAULT_INBOUND_QUEUE_SIZE
+    ) -> RoutedConnection:
+        """
+        Creates a subscription, must be called before the router worker starts.
+
+        message_types: Message types to receive, empty to only send.
+        queue_size: Maximum number of messages held for the subscriber.
+
+        Returns the connection to pass to the subscribing worker.
+        """
+        inbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            queue_size,
+            queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+            notifier=self.__notifier,
+            slot_size=self.MESSAGE_SLOT_SIZE,
+        )
+        self.__inbound_queues.append(inbound_queue)
+        for message_type in message_types:
+            self.__subscribers.setdefault(message_type, []).append(inbound_queue)
+
+        return RoutedConnection(list(message_types), inbound_queue, self.__outbound_queue)
+
+    def get_message_types(self) -> "list[str]":
+        """
+        Returns the message types with at least one subscriber, the only ones worth decoding.
+        """
+        return list(self.__subscribers)
+
+    def route(self, message: mavutil.mavlink.MAVLink_message) -> int:
+        """
+        Delivers a received message to the subscribers of its type.
+
+        Returns the number of subscribers it was delivered to.
+        """
+        subscribers = self.__subscribers.get(message.get_type(), [])
+        for inbound_queue in subscribers:
+            try:
+                inbound_queue.put(message)
+            except queue_proxy_wrapper.ShutDown:
+                pass
+
+        return len(subscribers)
+
+    def send_pending(self, connection: mavutil.mavfile) -> int:
+        """
+        Writes the queued sends to the connection in order.
+
+        Returns the number of messages written.
+        """
+        count = 0
+        while True:
+            try:
+                message, force_mavlink1 = self.__outbound_queue.get(False)
+            except (queue.Empty, queue_proxy_wrapper.ShutDown):
+                return count
+
+            connection.mav.send(message, force_mavlink1)
+            count += 1
+
+    def shutdown(self) -> None:
+        """
+        Ends the subscriptions: pending receives return None and sends are dropped.
+        """
+        self.__outbound_queue.shutdown(immediate=True)
+        for inbound_queue in self.__inbound_queues:
+            inbound_queue.shutdown()
@@ -0,0 +1,64 @@
+"""
+Router worker that owns the MAVLink connection.
+"""
+
+from pymavlink import mavutil
+
+from utilities.workers import worker_controller
+from utilities.workers import worker_logger
+from . import frame_filter
+from . import mavlink_router
+
+
+# Longest a send waits for the router while no message is received
+ROUTER_PERIOD = 0.01  # seconds
+# Largest read from the connection at once
+RECEIVE_SIZE = 4096  # bytes
+
+
+def mavlink_router_worker(
+    connection: mavutil.mavfile,
+    router: mavlink_router.MavlinkRouter,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection: MAVLink connection, no other process may use it while the router runs.
+    router: Router with the subscriptions of all workers.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    # Only the subscribed types are decoded, other frames are skipped by their header
+    # Parser of its own, since the connection replaces its own when switching to MAVLink 2
+    incoming = frame_filter.FrameFilter(router.get_message_types())
+
+    # Main loop: decode each wanted frame once and fan it out, then write the queued sends
+    while not controller.is_exit_requested():
+        # Empty string if nothing was available after all
+        data = connection.recv(RECEIVE_SIZE) if connection.select(ROUTER_PERIOD) else ""
+        if len(data) > 0:
+            if connection.first_byte:
+                connection.auto_mavlink_version(data)
+
+            for message in incoming.feed(data):
+                # Keeps the connection state pymavlink updates on receive, like the target system
+                connection.post_message(message)
+                router.route(message)
+
+        router.send_pending(connection)
+
+    local_logger.info(
+        f"Decoded {incoming.accepted_count} frames, skipped {incoming.skipped_count} unsubscribed, "
+        f"{incoming.bad_frame_count} bad"
+    )
+
+    # End of stream for the subscribers
+    router.shutdown()
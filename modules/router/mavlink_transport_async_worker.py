@@ -0,0 +1,38 @@
+"""
+Transport worker that owns the MAVLink connection, as a task in the event loop.
+"""
+
+from utilities.workers import async_worker_controller
+from utilities.workers import worker_logger
+from . import async_mavlink_transport
+
+
+async def mavlink_transport_async_worker(
+    transport: async_mavlink_transport.AsyncMavlinkTransport,
+    controller: async_worker_controller.AsyncWorkerController,
+) -> None:
+    """
+    Same as `mavlink_router_worker.mavlink_router_worker()` as a task in the event loop,
+    the sends are written by the subscribers themselves.
+
+    transport: Transport with the subscriptions of all workers.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    # Main loop: receive until exit or the drone closes the connection
+    ended = await transport.run(controller)
+    if ended:
+        local_logger.error("Connection closed by the drone")
+
+    incoming = transport.incoming
+    local_logger.info(
+        f"Decoded {incoming.accepted_count} frames, skipped {incoming.skipped_count} unsubscribed, "
+        f"{incoming.bad_frame_count} bad"
+    )
@@ -6,60 +6,17 @@ import time
 
 from pymavlink import mavutil
 
+from utilities.workers import worker_controller
+from . import telemetry_assembler
+from . import telemetry_data
+from . import telemetry_resampler
 from ..common.modules.logger import logger
 
 
-class TelemetryData:  # pylint: disable=too-many-instance-attributes
-    """
-    Python struct to represent Telemtry Data. Contains the most recent attitude and position reading.
-    """
-
-    def __init__(
-        self,
-        time_since_boot: int | None = None,  # ms
-        x: float | None = None,  # m
-        y: float | None = None,  # m
-        z: float | None = None,  # m
-        x_velocity: float | None = None,  # m/s
-        y_velocity: float | None = None,  # m/s
-        z_velocity: float | None = None,  # m/s
-        roll: float | None = None,  # rad
-        pitch: float | None = None,  # rad
-        yaw: float | None = None,  # rad
-        roll_speed: float | None = None,  # rad/s
-        pitch_speed: float | None = None,  # rad/s
-        yaw_speed: float | None = None,  # rad/s
-    ) -> None:
-        self.time_since_boot = time_since_boot
-        self.x = x
-        self.y = y
-        self.z = z
-        self.x_velocity = x_velocity
-        self.y_velocity = y_velocity
-        self.z_velocity = z_velocity
-        self.roll = roll
-        self.pitch = pitch
-        self.yaw = yaw
-        self.roll_speed = roll_speed
-        self.pitch_speed = pitch_speed
-        self.yaw_speed = yaw_speed
-
-    def __str__(self) -> str:
-        return f"""{{
-            time_since_boot: {self.time_since_boot},
-            x: {self.x},
-            y: {self.y},
-            z: {self.z},
-            x_velocity: {self.x_velocity},
-            y_velocity: {self.y_velocity},
-            z_velocity: {self.z_velocity},
-            roll: {self.roll},
-            pitch: {self.pitch},
-            yaw: {self.yaw},
-            roll_speed: {self.roll_speed},
-            pitch_speed: {self.pitch_speed},
-            yaw_speed: {self.yaw_speed}
-        }}"""
+# Re-exported, these are in their own modules so they do not need the logger
+TelemetryData = telemetry_data.TelemetryData
+TelemetryAssembler = telemetry_assembler.TelemetryAssembler
+TelemetryResampler = telemetry_resampler.TelemetryResampler
 
 
 # =================================================================================================
@@ -77,12 +34,16 @@ class Telemetry:
         cls,
         connection: mavutil.mavfile,  # Put your own arguments here
         local_logger: logger.Logger,
-    ) -> tuple[bool, Telemetry]:  # pylint: disable=undefined-variable
+        align: bool = False,
+    ) -> "tuple[bool, Telemetry | None]":
         """
         Falliable create (instantiation) method to create a Telemetry object.
+
+        align: Whether to interpolate attitude and position to the same timestamp,
+            instead of fusing the latest of each.
         """
         if connection is not None:
-            return True, cls(cls.__private_key, connection, local_logger=local_logger)
+            return True, cls(cls.__private_key, connection, local_logger=local_logger, align=align)
         local_logger.error("Failed to create a Telemetry object due to missing connection")
         return False, None
 
@@ -91,63 +52,67 @@ class Telemetry:
         key: object,
         connection: mavutil.mavfile,  # Put your own arguments here
         local_logger: logger.Logger,
+        align: bool = False,
     ) -> None:
         assert key is Telemetry.__private_key, "Use create() method"
 
         # Do any intializiation here
         self.connection = connection
         self.local_logger = local_logger
+        self.assembler = TelemetryAssembler()
+        self.resampler = TelemetryResampler() if align else None
 
     def run(
         self,  # Put your own arguments here
-    ) -> Telemetry | None:
+        controller: worker_controller.WorkerController | None = None,
+    ) -> TelemetryData | None:
         """
         Receive LOCAL_POSITION_NED and ATTITUDE messages from the drone,
-        combining them together to form a single TelemetryData object.
+        combining each with the latest of the other to form a single TelemetryData object.
+
+        controller: If given, returns None as soon as exit is requested.
+
+        Returns None if no telemetry could be fused for a second.
         """
         # Read MAVLink message LOCAL_POSITION_NED (32)
         # Read MAVLink message ATTITUDE (30)
-        # Return the most recent of both, and use the most recent message's timestamp
+        # Every message updates the telemetry, tagged with the age of the other message
 
         start_time = time.time()
-        return_telemetry = TelemetryData()
-
-        local_position = None
-        attitude = None
         ### Run until time is greater than one
         while time.time() - start_time <= 1:
-
-            msg = self.connection.recv_match(type=["ATTITUDE", "LOCAL_POSITION_NED"], timeout=0.1)
+            if controller is None:
+                msg = self.connection.recv_match(
+                    type=TelemetryAssembler.MESSAGE_TYPES, blocking=True, timeout=0.1
+                )
+            elif controller.is_exit_requested():
+                return None
+            else:
+                msg = controller.recv_match(
+                    self.connection, 0.1, type=TelemetryAssembler.MESSAGE_TYPES
+                )
 
             if not msg:
                 continue
-            if msg.get_type() == "LOCAL_POSITION_NED":
-                local_position = msg
-            if msg.get_type() == "ATTITUDE":
-                attitude = msg
-            if attitude and local_position:
-                break
-
-        # Set telemetry data to corresponding incoming data
-        if attitude and local_position:
-            return_telemetry.time_since_boot = max(
-                local_position.time_boot_ms, attitude.time_boot_ms
-            )
-            return_telemetry.roll = attitude.roll
-            return_telemetry.pitch = attitude.pitch
-            return_telemetry.yaw = attitude.yaw
-            return_telemetry.roll_speed = attitude.rollspeed
-            return_telemetry.pitch_speed = attitude.pitchspeed
-            return_telemetry.yaw_speed = attitude.yawspeed
-            return_telemetry.x = local_position.x
-            return_telemetry.y = local_position.y
-            return_telemetry.z = local_position.z
-            return_telemetry.x_velocity = local_position.vx
-            return_telemetry.y_velocity = local_position.vy
-            return_telemetry.z_velocity = local_position.vz
-            return return_telemetry
+
+            current_data = self.update(msg)
+            if current_data is not None:
+                return current_data
+
         return None
 
+    def update(self, message: mavutil.mavlink.MAVLink_message) -> TelemetryData | None:
+        """
+        Combines a received ATTITUDE or LOCAL_POSITION_NED message with the other kind.
+
+        Returns the telemetry, or None if it cannot be fused yet.
+        """
+        if self.resampler is not None:
+            self.resampler.add(message)
+            return self.resampler.resample_latest()
+
+        return self.assembler.update(message)
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -0,0 +1,70 @@
+"""
+Fusion of the latest attitude and position.
+"""
+
+from pymavlink import mavutil
+
+from . import telemetry_data
+
+
+class TelemetryAssembler:
+    """
+    Keeps the latest ATTITUDE and LOCAL_POSITION_NED and fuses them on every update,
+    so the output rate follows the faster of the two streams.
+    """
+
+    MESSAGE_TYPES = ["ATTITUDE", "LOCAL_POSITION_NED"]
+    DEFAULT_MAX_OTHER_AGE = 1000  # ms
+
+    def __init__(self, max_other_age: int = DEFAULT_MAX_OTHER_AGE) -> None:
+        """
+        max_other_age: Largest difference in ms between the attitude and position timestamps
+            that is fused, a larger difference means the other stream has stopped.
+        """
+        self.max_other_age = max_other_age
+        self.__attitude = None
+        self.__position = None
+
+    def update(
+        self, message: mavutil.mavlink.MAVLink_message
+    ) -> telemetry_data.TelemetryData | None:
+        """
+        Replaces the latest message of its type.
+
+        Returns the fused telemetry at the newer of the two timestamps,
+        with other_age the difference to the older one.
+        Returns None until both types have been received, or if the other is too old.
+        """
+        message_type = message.get_type()
+        if message_type == "ATTITUDE":
+            self.__attitude = message
+        elif message_type == "LOCAL_POSITION_NED":
+            self.__position = message
+        else:
+            return None
+
+        attitude = self.__attitude
+        position = self.__position
+        if attitude is None or position is None:
+            return None
+
+        other_age = abs(attitude.time_boot_ms - position.time_boot_ms)
+        if other_age > self.max_other_age:
+            return None
+
+        return telemetry_data.TelemetryData(
+            max(attitude.time_boot_ms, position.time_boot_ms),
+            position.x,
+            position.y,
+            position.z,
+            position.vx,
+            position.vy,
+            position.vz,
+            attitude.roll,
+            attitude.pitch,
+            attitude.yaw,
+            attitude.rollspeed,
+            attitude.pitchspeed,
+            attitude.yawspeed,
+            other_age,
+        )
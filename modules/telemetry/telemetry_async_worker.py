@@ -0,0 +1,61 @@
+"""
+Telemetry worker as a task in the event loop.
+"""
+
+import asyncio
+
+from modules.router import async_mavlink_transport
+from utilities.workers import async_worker_controller
+from utilities.workers import worker_logger
+from . import telemetry
+
+
+async def telemetry_async_worker(
+    connection: async_mavlink_transport.AsyncRoutedConnection,
+    output_queue: asyncio.Queue,
+    controller: async_worker_controller.AsyncWorkerController,
+) -> None:
+    """
+    Same as `telemetry_worker.telemetry_worker()` as a task in the event loop.
+
+    connection: Subscription of the transport to ATTITUDE and LOCAL_POSITION_NED.
+    output_queue: Telemetry for command, the oldest is dropped when full.
+    controller: Worker controller.
+    """
+    # Instantiate logger
+    result, local_logger = worker_logger.create_worker_logger(__file__)
+    if not result:
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    is_created, telemetry_obj = telemetry.Telemetry.create(
+        connection=connection, local_logger=local_logger
+    )
+    if not is_created:
+        local_logger.info("Telemetry worker  was not created succesfully")
+        controller.request_exit()
+        return
+
+    # Main loop: every attitude or position update is fused with the latest of the other
+    while not controller.is_exit_requested():
+        message = await controller.recv_match(
+            connection, 1, type=telemetry.TelemetryAssembler.MESSAGE_TYPES
+        )
+        if message is None:
+            if not controller.is_exit_requested():
+                local_logger.error(
+                    "attitude and position data has been missing for more than one second"
+                )
+            continue
+
+        current_telemetry_data = telemetry_obj.update(message)
+        if current_telemetry_data is None:
+            continue
+
+        # Command only acts on the newest telemetry, so telemetry never waits for it
+        if output_queue.full():
+            output_queue.get_nowait()
+
+        output_queue.put_nowait(current_telemetry_data)
@@ -0,0 +1,164 @@
+"""
+Telemetry record and its binary encoding.
+"""
+
+import struct
+
+import numpy as np
+
+
+class TelemetryData:  # pylint: disable=too-many-instance-attributes
+    """
+    Python struct to represent Telemtry Data. Contains the most recent attitude and position reading.
+
+    Has a fixed size binary encoding: a bitmask of the fields that are not None,
+    followed by time_since_boot as a 64 bit integer, the measurements as 64 bit floats,
+    and other_age as a 64 bit integer, little endian without padding.
+
+    Pickling uses the encoding, so workers put the object into `QueueProxyWrapper`
+    and receive a `TelemetryData` on the other side.
+
+    One is created on every telemetry update, so the fields are slots instead of an instance dict.
+    """
+
+    FIELD_NAMES = (
+        "time_since_boot",
+        "x",
+        "y",
+        "z",
+        "x_velocity",
+        "y_velocity",
+        "z_velocity",
+        "roll",
+        "pitch",
+        "yaw",
+        "roll_speed",
+        "pitch_speed",
+        "yaw_speed",
+        "other_age",
+    )
+    __slots__ = FIELD_NAMES
+
+    # Same layout as the binary encoding, for zero-copy views of encoded records
+    DTYPE = np.dtype(
+        [("present", "<u2"), ("time_since_boot", "<i8")]
+        + [(name, "<f8") for name in FIELD_NAMES[1:-1]]
+        + [("other_age", "<i8")]
+    )
+
+    __STRUCT = struct.Struct("<Hq12dq")
+    __ALL_PRESENT = (1 << len(FIELD_NAMES)) - 1
+    ENCODED_SIZE = __STRUCT.size  # bytes
+
+    def __init__(
+        self,
+        time_since_boot: int | None = None,  # ms
+        x: float | None = None,  # m
+        y: float | None = None,  # m
+        z: float | None = None,  # m
+        x_velocity: float | None = None,  # m/s
+        y_velocity: float | None = None,  # m/s
+        z_velocity: float | None = None,  # m/s
+        roll: float | None = None,  # rad
+        pitch: float | None = None,  # rad
+        yaw: float | None = None,  # rad
+        roll_speed: float | None = None,  # rad/s
+        pitch_speed: float | None = None,  # rad/s
+        yaw_speed: float | None = None,  # rad/s
+        other_age: int | None = None,  # ms, how much older the other of attitude and position is
+    ) -> None:
+        self.time_since_boot = time_since_boot
+        self.x = x
+        self.y = y
+        self.z = z
+        self.x_velocity = x_velocity
+        self.y_velocity = y_velocity
+        self.z_velocity = z_velocity
+        self.roll = roll
+        self.pitch = pitch
+        self.yaw = yaw
+        self.roll_speed = roll_speed
+        self.pitch_speed = pitch_speed
+        self.yaw_speed = yaw_speed
+        self.other_age = other_age
+
+    def __str__(self) -> str:
+        return f"""{{
+            time_since_boot: {self.time_since_boot},
+            x: {self.x},
+            y: {self.y},
+            z: {self.z},
+            x_velocity: {self.x_velocity},
+            y_velocity: {self.y_velocity},
+            z_velocity: {self.z_velocity},
+            roll: {self.roll},
+            pitch: {self.pitch},
+            yaw: {self.yaw},
+            roll_speed: {self.roll_speed},
+            pitch_speed: {self.pitch_speed},
+            yaw_speed: {self.yaw_speed},
+            other_age: {self.other_age}
+        }}"""
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the binary encoding.
+        """
+        values = (
+            self.time_since_boot,
+            self.x,
+            self.y,
+            self.z,
+            self.x_velocity,
+            self.y_velocity,
+            self.z_velocity,
+            self.roll,
+            self.pitch,
+            self.yaw,
+            self.roll_speed,
+            self.pitch_speed,
+            self.yaw_speed,
+            self.other_age,
+        )
+        if None not in values:
+            return self.__STRUCT.pack(self.__ALL_PRESENT, *values)
+
+        present = 0
+        for i, value in enumerate(values):
+            if value is not None:
+                present |= 1 << i
+
+        return self.__STRUCT.pack(present, *(0 if value is None else value for value in values))
+
+    def __reduce__(self) -> "tuple":
+        """
+        Pickles as the binary encoding, which is smaller than the attributes.
+        """
+        return TelemetryData.from_buffer, (self.to_bytes(),)
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: "bytes | bytearray | memoryview", offset: int = 0
+    ) -> "TelemetryData":
+        """
+        Decodes a binary encoding.
+
+        buffer: Contains the encoding.
+        offset: Position of the encoding in bytes.
+
+        Returns the decoded object.
+        """
+        present, *values = cls.__STRUCT.unpack_from(buffer, offset)
+        if present == cls.__ALL_PRESENT:
+            return cls(*values)
+
+        return cls(*(value if present & (1 << i) else None for i, value in enumerate(values)))
+
+    @classmethod
+    def view_buffer(cls, buffer: "bytes | bytearray | memoryview") -> np.ndarray:
+        """
+        Zero-copy view of consecutive binary encodings as a structured array with DTYPE ,
+        writable if the buffer is.
+        Fields that are None have their bit cleared in `present` .
+        """
+        return np.frombuffer(buffer, dtype=cls.DTYPE)
@@ -0,0 +1,252 @@
+"""
+Recent telemetry in preallocated NumPy columns, for windowed queries.
+"""
+
+import numpy as np
+
+
+class TelemetryHistory:
+    """
+    Ring buffer of telemetry with one column per field.
+
+    Every sample is written twice, at its index and its index plus the capacity,
+    so the last samples up to the capacity are always a contiguous slice:
+    appending is O(1) and windows are views, not copies.
+    Fields that are None are stored as NaN and ignored by the statistics.
+
+    Timestamps must increase. A timestamp going back by more than max_backward means
+    the drone rebooted and clears the history, other older samples are dropped.
+    """
+
+    DEFAULT_CAPACITY = 1024  # samples
+    DEFAULT_MAX_BACKWARD = 1000  # ms
+
+    # Same names as the fields of `TelemetryData` , in the same order
+    FIELD_NAMES = (
+        "x",
+        "y",
+        "z",
+        "x_velocity",
+        "y_velocity",
+        "z_velocity",
+        "roll",
+        "pitch",
+        "yaw",
+        "roll_speed",
+        "pitch_speed",
+        "yaw_speed",
+    )
+    # Bit of each field in `TelemetryData.DTYPE` present, after time_since_boot
+    __PRESENT_BITS = np.array([1 << (i + 1) for i in range(len(FIELD_NAMES))], dtype=np.uint16)
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, max_backward: int = DEFAULT_MAX_BACKWARD
+    ) -> None:
+        """
+        capacity: Samples kept, older ones are overwritten.
+        max_backward: Largest step back in ms of the timestamp that is not a reboot.
+        """
+        self.capacity = max(capacity, 1)
+        self.max_backward = max_backward
+        self.__times = np.zeros(2 * self.capacity, dtype=np.int64)
+        # One row per field
+        self.__values = np.full((len(self.FIELD_NAMES), 2 * self.capacity), np.nan)
+        # Index of the next write, and number of samples held
+        self.__head = 0
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def clear(self) -> None:
+        """
+        Discards all samples.
+        """
+        self.__head = 0
+        self.__count = 0
+
+    def get_latest_time(self) -> "int | None":
+        """
+        Returns the timestamp of the newest sample in ms, None if empty.
+        """
+        if self.__count == 0:
+            return None
+
+        return int(self.__times[self.__head - 1 + self.capacity])
+
+    def __accept_time(self, time_since_boot: int) -> bool:
+        """
+        Clears the history on a reboot.
+
+        Returns whether a sample with the timestamp may be appended.
+        """
+        latest_time = self.get_latest_time()
+        if latest_time is None or time_since_boot > latest_time:
+            return True
+
+        if time_since_boot < latest_time - self.max_backward:
+            self.clear()
+            return True
+
+        return False
+
+    def append(self, data: object) -> bool:
+        """
+        Appends a sample in O(1).
+
+        data: Has the attributes time_since_boot and FIELD_NAMES , such as `TelemetryData` .
+
+        Returns whether it was appended, False if its timestamp is not newer.
+        """
+        time_since_boot = data.time_since_boot
+        if time_since_boot is None or not self.__accept_time(time_since_boot):
+            return False
+
+        values = [getattr(data, name) for name in self.FIELD_NAMES]
+        column = [np.nan if value is None else value for value in values]
+        head = self.__head
+        self.__times[head] = time_since_boot
+        self.__times[head + self.capacity] = time_since_boot
+        self.__values[:, head] = column
+        self.__values[:, head + self.capacity] = column
+
+        self.__head = (head + 1) % self.capacity
+        self.__count = min(self.__count + 1, self.capacity)
+        return True
+
+    def append_records(self, records: np.ndarray) -> int:
+        """
+        Appends samples in bulk.
+
+        records: Structured array with the fields of `TelemetryData.DTYPE` ,
+            such as from `TelemetryResampler.resample()` or `TelemetryData.view_buffer()` .
+
+        Returns the number of samples appended.
+        """
+        if len(records) == 0:
+            return 0
+
+        times = records["time_since_boot"].astype(np.int64)
+        if not self.__accept_time(int(times[0])):
+            latest_time = self.get_latest_time()
+            keep = times > latest_time
+            records = records[keep]
+            times = times[keep]
+            if len(records) == 0:
+                return 0
+
+        # Keep strictly increasing timestamps
+        keep = np.empty(len(times), dtype=bool)
+        keep[0] = True
+        keep[1:] = times[1:] > np.maximum.accumulate(times)[:-1]
+        records = records[keep][-self.capacity :]
+        times = times[keep][-self.capacity :]
+
+        values = np.stack([records[name].astype(np.float64) for name in self.FIELD_NAMES])
+        if "present" in records.dtype.names:
+            missing = (records["present"][np.newaxis, :] & self.__PRESENT_BITS[:, np.newaxis]) == 0
+            values[missing] = np.nan
+
+        indices = (self.__head + np.arange(len(times))) % self.capacity
+        for offset in (0, self.capacity):
+            self.__times[indices + offset] = times
+            self.__values[:, indices + offset] = values
+
+        self.__head = (self.__head + len(times)) % self.capacity
+        self.__count = min(self.__count + len(times), self.capacity)
+        return len(times)
+
+    def window(
+        self, count: "int | None" = None, duration: "int | None" = None
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        Read only views of the newest samples, oldest first.
+
+        count: Number of samples, None for all.
+        duration: Only samples at most this many ms older than the newest, None for all.
+
+        Returns the timestamps in ms, and the values with one row per field in FIELD_NAMES order.
+        """
+        size = self.__count if count is None else max(min(count, self.__count), 0)
+        end = self.__head + self.capacity
+        start = end - size
+        times = self.__times[start:end]
+        if duration is not None and size > 0:
+            start += int(np.searchsorted(times, times[-1] - duration, side="left"))
+            times = self.__times[start:end]
+
+        values = self.__values[:, start:end]
+        # Slices are new views, the buffers stay writable
+        times.flags.writeable = False
+        values.flags.writeable = False
+        return times, values
+
+    def mean(self, count: "int | None" = None, duration: "int | None" = None) -> "dict[str, float]":
+        """
+        Mean of each field over the window, see `window()` .
+
+        Returns NaN for fields with no values in the window.
+        """
+        _, values = self.window(count, duration)
+        present = ~np.isnan(values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(present, values, 0.0).sum(axis=1) / present.sum(axis=1)
+
+        return dict(zip(self.FIELD_NAMES, means.tolist()))
+
+    def minimum(
+        self, count: "int | None" = None, duration: "int | None" = None
+    ) -> "dict[str, float]":
+        """
+        Minimum of each field over the window, see `window()` .
+
+        Returns NaN for fields with no values in the window.
+        """
+        _, values = self.window(count, duration)
+        if values.shape[1] == 0:
+            return dict.fromkeys(self.FIELD_NAMES, np.nan)
+
+        return dict(zip(self.FIELD_NAMES, np.fmin.reduce(values, axis=1).tolist()))
+
+    def maximum(
+        self, count: "int | None" = None, duration: "int | None" = None
+    ) -> "dict[str, float]":
+        """
+        Maximum of each field over the window, see `window()` .
+
+        Returns NaN for fields with no values in the window.
+        """
+        _, values = self.window(count, duration)
+        if values.shape[1] == 0:
+            return dict.fromkeys(self.FIELD_NAMES, np.nan)
+
+        return dict(zip(self.FIELD_NAMES, np.fmax.reduce(values, axis=1).tolist()))
+
+    def rates(
+        self, count: "int | None" = None, duration: "int | None" = None
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        Finite difference rate of each field between consecutive samples in the window,
+        see `window()` . Angles are not unwrapped.
+
+        Returns the timestamps in ms of the later sample of each pair,
+        and the rates in units per second with one row per field in FIELD_NAMES order.
+        """
+        times, values = self.window(count, duration)
+        return times[1:], np.diff(values, axis=1) / (np.diff(times) / 1000)
+
+    def mean_rate(
+        self, count: "int | None" = None, duration: "int | None" = None
+    ) -> "dict[str, float]":
+        """
+        Rate of each field from the oldest to the newest sample of the window,
+        in units per second, see `window()` .
+
+        Returns NaN for fields missing at either end, or if there are fewer than 2 samples.
+        """
+        times, values = self.window(count, duration)
+        if len(times) < 2:
+            return dict.fromkeys(self.FIELD_NAMES, np.nan)
+
+        rates = (values[:, -1] - values[:, 0]) / ((times[-1] - times[0]) / 1000)
+        return dict(zip(self.FIELD_NAMES, rates.tolist()))
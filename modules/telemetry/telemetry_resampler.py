@@ -0,0 +1,230 @@
+"""
+Interpolation of attitude and position to common timestamps.
+"""
+
+import numpy as np
+from pymavlink import mavutil
+
+from . import telemetry_assembler
+from . import telemetry_data
+
+
+class TelemetryResampler:
+    """
+    Buffers the ATTITUDE and LOCAL_POSITION_NED streams
+    and linearly interpolates both to common timestamps, in bulk with NumPy.
+
+    Angles are unwrapped before interpolating and wrapped back to [-pi, pi) ,
+    so yaw going through +-pi does not sweep the other way around.
+    Samples older than the newest of their stream are dropped,
+    and a timestamp going back by more than max_other_age means the drone rebooted and clears both.
+    """
+
+    DEFAULT_CAPACITY = 64  # samples per stream
+
+    # Columns of each stream, in TelemetryData field names, and which are angles
+    ATTITUDE_FIELDS = ("roll", "pitch", "yaw", "roll_speed", "pitch_speed", "yaw_speed")
+    POSITION_FIELDS = ("x", "y", "z", "x_velocity", "y_velocity", "z_velocity")
+    __ATTITUDE_ANGLES = np.array([True, True, True, False, False, False])
+    __POSITION_ANGLES = np.zeros(len(POSITION_FIELDS), dtype=bool)
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        max_other_age: int = telemetry_assembler.TelemetryAssembler.DEFAULT_MAX_OTHER_AGE,
+    ) -> None:
+        """
+        capacity: Samples kept per stream, older ones are discarded.
+        max_other_age: Same as `TelemetryAssembler` .
+        """
+        self.capacity = max(capacity, 2)
+        self.max_other_age = max_other_age
+        # Per stream: timestamps in ms, one row of values per timestamp
+        self.__times = {
+            "ATTITUDE": np.empty(0, dtype=np.int64),
+            "LOCAL_POSITION_NED": np.empty(0, dtype=np.int64),
+        }
+        self.__values = {
+            "ATTITUDE": np.empty((0, len(self.ATTITUDE_FIELDS))),
+            "LOCAL_POSITION_NED": np.empty((0, len(self.POSITION_FIELDS))),
+        }
+        self.__last_resampled_time = None
+
+    @staticmethod
+    def __row(message: mavutil.mavlink.MAVLink_message) -> "tuple[float, ...]":
+        """
+        Values of a message in the column order of its stream.
+        """
+        if message.get_type() == "ATTITUDE":
+            return (
+                message.roll,
+                message.pitch,
+                message.yaw,
+                message.rollspeed,
+                message.pitchspeed,
+                message.yawspeed,
+            )
+
+        return (message.x, message.y, message.z, message.vx, message.vy, message.vz)
+
+    def clear(self) -> None:
+        """
+        Discards all samples.
+        """
+        for message_type, times in self.__times.items():
+            self.__times[message_type] = times[:0]
+            self.__values[message_type] = self.__values[message_type][:0]
+
+        self.__last_resampled_time = None
+
+    def add_many(self, messages: "list[mavutil.mavlink.MAVLink_message]") -> None:
+        """
+        Appends messages of both types, other types are ignored.
+        If either type goes back in time by more than max_other_age, the drone rebooted
+        and both streams are cleared before anything is appended.
+        """
+        new_streams = {}
+        rebooted = False
+        for message_type, times in self.__times.items():
+            stream = [message for message in messages if message.get_type() == message_type]
+            if len(stream) == 0:
+                continue
+
+            new_times = np.fromiter(
+                (message.time_boot_ms for message in stream), dtype=np.int64, count=len(stream)
+            )
+            if len(times) > 0 and new_times[0] < times[-1] - self.max_other_age:
+                rebooted = True
+
+            new_streams[message_type] = (stream, new_times)
+
+        if rebooted:
+            self.clear()
+
+        for message_type, (stream, new_times) in new_streams.items():
+            new_values = np.array([self.__row(message) for message in stream], dtype=np.float64)
+
+            times = np.concatenate((self.__times[message_type], new_times))
+            values = np.concatenate((self.__values[message_type], new_values))
+
+            # Keep strictly increasing timestamps
+            keep = np.empty(len(times), dtype=bool)
+            keep[0] = True
+            keep[1:] = times[1:] > np.maximum.accumulate(times)[:-1]
+
+            self.__times[message_type] = times[keep][-self.capacity :]
+            self.__values[message_type] = values[keep][-self.capacity :]
+
+    def add(self, message: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        Same as `add_many()` for a single message.
+        """
+        self.add_many([message])
+
+    def covered_range(self) -> "tuple[int, int] | None":
+        """
+        Returns the first and last timestamps in ms both streams have samples around,
+        or None if there is no such timestamp.
+        """
+        attitude_times = self.__times["ATTITUDE"]
+        position_times = self.__times["LOCAL_POSITION_NED"]
+        if len(attitude_times) == 0 or len(position_times) == 0:
+            return None
+
+        start = max(attitude_times[0], position_times[0])
+        end = min(attitude_times[-1], position_times[-1])
+        if start > end:
+            return None
+
+        return int(start), int(end)
+
+    @staticmethod
+    def __interpolate(
+        times: np.ndarray, sample_times: np.ndarray, values: np.ndarray, angles: np.ndarray
+    ) -> np.ndarray:
+        """
+        Interpolates every column of values at times, unwrapping the angle columns.
+        Outside the sample times the first or last sample is held.
+        """
+        values = values.copy()
+        values[:, angles] = np.unwrap(values[:, angles], axis=0)
+
+        result = np.empty((len(times), values.shape[1]))
+        for column in range(values.shape[1]):
+            result[:, column] = np.interp(times, sample_times, values[:, column])
+
+        result[:, angles] = (result[:, angles] + np.pi) % (2 * np.pi) - np.pi
+        return result
+
+    def resample(self, times: "np.ndarray | list[int]") -> np.ndarray:
+        """
+        Interpolates both streams at the timestamps.
+
+        times: Timestamps in ms, should be within `covered_range()` .
+
+        Returns a structured array with `telemetry_data.TelemetryData.DTYPE` , other_age is 0 since
+        both halves are at the same timestamp. Empty if either stream has no samples.
+        """
+        times = np.asarray(times, dtype=np.int64)
+        records = np.zeros(len(times), dtype=telemetry_data.TelemetryData.DTYPE)
+        if self.covered_range() is None:
+            return records[:0]
+
+        attitude = self.__interpolate(
+            times, self.__times["ATTITUDE"], self.__values["ATTITUDE"], self.__ATTITUDE_ANGLES
+        )
+        position = self.__interpolate(
+            times,
+            self.__times["LOCAL_POSITION_NED"],
+            self.__values["LOCAL_POSITION_NED"],
+            self.__POSITION_ANGLES,
+        )
+
+        records["present"] = (1 << len(telemetry_data.TelemetryData.FIELD_NAMES)) - 1
+        records["time_since_boot"] = times
+        for column, name in enumerate(self.ATTITUDE_FIELDS):
+            records[name] = attitude[:, column]
+
+        for column, name in enumerate(self.POSITION_FIELDS):
+            records[name] = position[:, column]
+
+        return records
+
+    def resample_grid(self, period: int) -> np.ndarray:
+        """
+        Interpolates both streams on a grid of multiples of period ms,
+        from after the last resampled timestamp up to the end of `covered_range()` .
+
+        Returns the same as `resample()` .
+        """
+        covered_range = self.covered_range()
+        if covered_range is None:
+            return self.resample([])
+
+        start, end = covered_range
+        if self.__last_resampled_time is not None:
+            start = max(start, self.__last_resampled_time + 1)
+
+        times = np.arange(-(-start // period) * period, end + 1, period, dtype=np.int64)
+        if len(times) > 0:
+            self.__last_resampled_time = int(times[-1])
+
+        return self.resample(times)
+
+    def resample_latest(self) -> telemetry_data.TelemetryData | None:
+        """
+        Interpolates both streams at the end of `covered_range()` ,
+        the newest timestamp both have reached.
+
+        Returns None if there is no new such timestamp since the last call.
+        """
+        covered_range = self.covered_range()
+        if covered_range is None:
+            return None
+
+        _, end = covered_range
+        if self.__last_resampled_time is not None and end <= self.__last_resampled_time:
+            return None
+
+        self.__last_resampled_time = end
+        return telemetry_data.TelemetryData.from_buffer(self.resample([end]).tobytes())
@@ -2,15 +2,12 @@
 Telemtry worker that gathers GPS data.
 """
 
-import os
-import pathlib
-
 from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from utilities.workers import worker_logger
 from . import telemetry
-from ..common.modules.logger import logger
 
 
 # =================================================================================================
@@ -33,24 +30,22 @@ def telemetry_worker(
     # =============================================================================================
 
     # Instantiate logger
-    worker_name = pathlib.Path(__file__).stem
-    process_id = os.getpid()
-    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    result, local_logger = worker_logger.create_worker_logger(__file__)
     if not result:
-        print("ERROR: Worker failed to create logger")
         return
 
     # Get Pylance to stop complaining
     assert local_logger is not None
 
-    local_logger.info("Logger initialized", True)
-
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
     # Instantiate class object (telemetry.Telemetry)
+    # Not aligned: interpolating waits until both streams pass a timestamp,
+    # which delays every decision by up to a period of the slower stream,
+    # while fusing the latest of each gives telemetry on every update and reports other_age
     is_created, telemetry_obj = telemetry.Telemetry.create(
-        connection=connection, local_logger=local_logger
+        connection=connection, local_logger=local_logger, align=False
     )
     # Main loop: do work.
 
@@ -60,14 +55,24 @@ def telemetry_worker(
         return
 
     while not controller.is_exit_requested():
-        current_telemetry_data = telemetry_obj.run()
+        current_telemetry_data = telemetry_obj.run(controller)
+
+        if current_telemetry_data is None:
+            if not controller.is_exit_requested():
+                local_logger.error(
+                    "attitude and position data has been missing for more than one second"
+                )
+            continue
+
+        # Pickles as its binary encoding
+        try:
+            output_queue.put(current_telemetry_data)
+        except queue_proxy_wrapper.ShutDown:
+            # Command is no longer reading
+            break
 
-        if current_telemetry_data is not None:
-            output_queue.queue.put(current_telemetry_data)
-        else:
-            local_logger.error(
-                "attitude and position data has been missing for more than one second"
-            )
+    # End of stream for command
+    output_queue.close()
 
 
 # =================================================================================================
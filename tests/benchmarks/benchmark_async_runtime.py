@@ -0,0 +1,335 @@
+"""
+Benchmark memory and end-to-end latency of the asyncio runtime against the multiprocess one.
+Linux only, memory is read from /proc . To run:
+```
+python -m tests.benchmarks.benchmark_async_runtime
+```
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import pathlib
+import queue
+import socket
+import statistics
+import threading
+import time
+
+from pymavlink import mavutil
+
+import bootcamp_async_main
+import bootcamp_main
+from modules.command import command
+from modules.command import command_async_worker
+from modules.command import command_worker
+from modules.heartbeat import heartbeat_receiver_async_worker
+from modules.heartbeat import heartbeat_receiver_worker
+from modules.heartbeat import heartbeat_sender_async_worker
+from modules.heartbeat import heartbeat_sender_worker
+from modules.router import async_mavlink_transport
+from modules.router import mavlink_router
+from modules.router import mavlink_router_worker
+from modules.router import mavlink_transport_async_worker
+from modules.telemetry import telemetry_async_worker
+from modules.telemetry import telemetry_worker
+from utilities.workers import async_worker_controller
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+
+
+ROUND_COUNT = 100
+# Time between telemetry updates, each answered by a command
+# Updates alternate between causing a change of altitude and of yaw,
+# each repeated no sooner than the command governor lets it through
+ROUND_PERIOD = 0.25  # seconds
+ROUND_TIMEOUT = 1  # seconds
+HEARTBEAT_PERIOD = 1  # seconds
+JOIN_TIMEOUT = 5  # seconds
+# Away from the heading of the drone, so it turns once at the target altitude
+TARGET = command.Position(10, 10, 10)
+WRONG_ALTITUDE = 3  # m
+
+
+class Drone(threading.Thread):
+    """
+    Sends a position update, waits for the command it causes, and repeats.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+
+        # Listens right away, accepts on the first receive
+        self.__connection = mavutil.mavlink_connection(
+            f"tcpin:127.0.0.1:{self.port}", source_system=1, source_component=0
+        )
+        self.latencies: "list[float]" = []
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        connection = self.__connection
+        connection.wait_heartbeat()
+
+        # The first attitude is not answered, there is no position to fuse it with yet
+        connection.mav.heartbeat_send(2, 3, 0, 0, 4)
+        connection.mav.attitude_send(0, 0.1, 0.2, 0.3, 0, 0, 0)
+        last_heartbeat = time.monotonic()
+        for i in range(ROUND_COUNT):
+            if time.monotonic() - last_heartbeat >= HEARTBEAT_PERIOD:
+                connection.mav.heartbeat_send(2, 3, 0, 0, 4)
+                last_heartbeat = time.monotonic()
+
+            # Anything late from the previous round
+            while connection.recv_match(type="COMMAND_LONG", blocking=False) is not None:
+                pass
+
+            start = time.perf_counter()
+            z = WRONG_ALTITUDE if i % 2 == 0 else TARGET.z
+            connection.mav.local_position_ned_send(i, 1, 2, z, 0.5, 0, 0)
+            message = connection.recv_match(
+                type="COMMAND_LONG", blocking=True, timeout=ROUND_TIMEOUT
+            )
+            if message is not None:
+                self.latencies.append(time.perf_counter() - start)
+                # Otherwise the same command is held back until it is given up on
+                connection.mav.command_ack_send(
+                    message.command, mavutil.mavlink.MAV_RESULT_ACCEPTED
+                )
+
+            time.sleep(ROUND_PERIOD)
+
+        self.done.set()
+
+    def close(self) -> None:
+        """
+        Closes the connection, the pipeline sees the end of the stream.
+        """
+        self.__connection.close()
+
+
+def proportional_set_size(pid: int) -> int:
+    """
+    Returns the memory of the process in bytes, shared pages divided among the sharers.
+    """
+    rollup = pathlib.Path(f"/proc/{pid}/smaps_rollup")
+    for line in rollup.read_text(encoding="utf-8").splitlines():
+        if line.startswith("Pss:"):
+            return int(line.split()[1]) * 1024
+
+    return 0
+
+
+def process_tree(pid: int) -> "list[int]":
+    """
+    Returns the process and all of its descendants.
+    """
+    pids = [pid]
+    for task in pathlib.Path(f"/proc/{pid}/task").iterdir():
+        children = (task / "children").read_text(encoding="utf-8").split()
+        for child in children:
+            pids += process_tree(int(child))
+
+    return pids
+
+
+def tree_memory() -> "tuple[int, int]":
+    """
+    Returns the number of processes of this benchmark and their total memory in bytes.
+    """
+    pids = process_tree(os.getpid())
+    return len(pids), sum(proportional_set_size(pid) for pid in pids)
+
+
+def run_multiprocess(drone: Drone) -> "tuple[int, int]":
+    """
+    Runs the workers as processes, as in bootcamp_main.py
+
+    Returns the number of processes and their memory once the drone is done.
+    """
+    connection = mavutil.mavlink_connection(f"tcp:127.0.0.1:{drone.port}")
+    controller = worker_controller.WorkerController()
+    router = mavlink_router.MavlinkRouter()
+    mp_manager = mp.Manager()
+    heartbeat_to_main_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        bootcamp_main.HEARTBEAT_TO_MAIN_QUEUE_SIZE,
+        bootcamp_main.HEARTBEAT_TO_MAIN_QUEUE_BACKEND,
+        overflow_policy=bootcamp_main.HEARTBEAT_TO_MAIN_QUEUE_OVERFLOW_POLICY,
+    )
+    telemetry_to_command_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        bootcamp_main.TELEMETRY_TO_COMMAND_QUEUE_SIZE,
+        bootcamp_main.TELEMETRY_TO_COMMAND_QUEUE_BACKEND,
+    )
+    command_to_main_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        bootcamp_main.COMMAND_TO_MAIN_QUEUE_SIZE,
+        bootcamp_main.COMMAND_TO_MAIN_QUEUE_BACKEND,
+        overflow_policy=bootcamp_main.COMMAND_TO_MAIN_QUEUE_OVERFLOW_POLICY,
+    )
+
+    worker_arguments = [
+        (mavlink_router_worker.mavlink_router_worker, (connection, router)),
+        (heartbeat_sender_worker.heartbeat_sender_worker, (router.subscribe([]),)),
+        (
+            heartbeat_receiver_worker.heartbeat_receiver_worker,
+            (router.subscribe(["HEARTBEAT"]), heartbeat_to_main_queue),
+        ),
+        (
+            telemetry_worker.telemetry_worker,
+            (router.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"]), telemetry_to_command_queue),
+        ),
+        (
+            command_worker.command_worker,
+            (
+                router.subscribe(["COMMAND_ACK"]),
+                TARGET,
+                telemetry_to_command_queue,
+                command_to_main_queue,
+            ),
+        ),
+    ]
+    workers = [
+        mp.Process(target=target, args=arguments + (controller,))
+        for target, arguments in worker_arguments
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Main's work: take the commands until the drone is done
+    while not drone.done.is_set():
+        try:
+            command_to_main_queue.get_many(bootcamp_main.MAIN_GET_BATCH_SIZE, ROUND_PERIOD)
+        except queue.Empty:
+            pass
+
+    process_count, memory = tree_memory()
+
+    controller.request_exit()
+    command_to_main_queue.drain_until_shut_down(bootcamp_main.SHUTDOWN_TIMEOUT)
+    heartbeat_to_main_queue.drain_until_shut_down(bootcamp_main.SHUTDOWN_TIMEOUT)
+    for output_queue in [
+        command_to_main_queue,
+        telemetry_to_command_queue,
+        heartbeat_to_main_queue,
+    ]:
+        output_queue.shutdown(immediate=True)
+
+    for worker in workers:
+        worker.join(JOIN_TIMEOUT)
+
+    mp_manager.shutdown()
+    connection.close()
+    return process_count, memory
+
+
+async def run_async(drone: Drone) -> "tuple[int, int]":
+    """
+    Runs the workers as tasks, as in bootcamp_async_main.py
+
+    Returns the number of processes and their memory once the drone is done.
+    """
+    transport = await async_mavlink_transport.AsyncMavlinkTransport.open(
+        f"tcp:127.0.0.1:{drone.port}"
+    )
+    controller = async_worker_controller.AsyncWorkerController()
+    heartbeat_to_main_queue = asyncio.Queue(bootcamp_async_main.HEARTBEAT_TO_MAIN_QUEUE_SIZE)
+    telemetry_to_command_queue = asyncio.Queue(bootcamp_async_main.TELEMETRY_TO_COMMAND_QUEUE_SIZE)
+    command_to_main_queue = asyncio.Queue(bootcamp_async_main.COMMAND_TO_MAIN_QUEUE_SIZE)
+
+    worker_arguments = [
+        (mavlink_transport_async_worker.mavlink_transport_async_worker, (transport,)),
+        (heartbeat_sender_async_worker.heartbeat_sender_async_worker, (transport.subscribe([]),)),
+        (
+            heartbeat_receiver_async_worker.heartbeat_receiver_async_worker,
+            (transport.subscribe(["HEARTBEAT"]), heartbeat_to_main_queue),
+        ),
+        (
+            telemetry_async_worker.telemetry_async_worker,
+            (transport.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"]), telemetry_to_command_queue),
+        ),
+        (
+            command_async_worker.command_async_worker,
+            (
+                transport.subscribe(["COMMAND_ACK"]),
+                TARGET,
+                telemetry_to_command_queue,
+                command_to_main_queue,
+            ),
+        ),
+    ]
+    workers = [
+        asyncio.create_task(target(*arguments, controller))
+        for target, arguments in worker_arguments
+    ]
+
+    # Main's work: take the commands until the drone is done
+    loop = asyncio.get_running_loop()
+    drone_done = loop.run_in_executor(None, drone.done.wait)
+    while not drone_done.done():
+        try:
+            await asyncio.wait_for(command_to_main_queue.get(), ROUND_PERIOD)
+        except asyncio.TimeoutError:
+            pass
+
+    process_count, memory = tree_memory()
+
+    controller.request_exit()
+    await asyncio.wait(workers, timeout=JOIN_TIMEOUT)
+    await transport.close()
+    return process_count, memory
+
+
+def report(name: str, drone: Drone, process_count: int, memory: int) -> None:
+    """
+    Prints the latencies measured by the drone and the memory.
+    """
+    latencies_ms = sorted(latency * 1e3 for latency in drone.latencies)
+    print(f"{name}:")
+    print(f"    {process_count} processes, {memory / 2**20:.1f} MiB")
+    if len(latencies_ms) == 0:
+        print("    no commands received")
+        return
+
+    print(
+        f"    {len(latencies_ms)}/{ROUND_COUNT} commands, latency median "
+        f"{statistics.median(latencies_ms):.2f} ms, "
+        f"p99 {latencies_ms[int(len(latencies_ms) * 0.99)]:.2f} ms, "
+        f"max {latencies_ms[-1]:.2f} ms"
+    )
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    # Baseline before either runtime allocated anything
+    _, baseline = tree_memory()
+    print(f"Benchmark process alone: {baseline / 2**20:.1f} MiB")
+
+    drone = Drone()
+    drone.start()
+    process_count, memory = asyncio.run(run_async(drone))
+    drone.join()
+    drone.close()
+    report("asyncio", drone, process_count, memory)
+
+    drone = Drone()
+    drone.start()
+    process_count, memory = run_multiprocess(drone)
+    drone.join()
+    drone.close()
+    report("multiprocess", drone, process_count, memory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
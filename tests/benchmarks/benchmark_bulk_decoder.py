@@ -0,0 +1,140 @@
+"""
+Benchmark decoding a recorded MAVLink stream in bulk and filtered by header against mavutil.
+To run:
+```
+python -m tests.benchmarks.benchmark_bulk_decoder
+```
+"""
+
+import math
+import socket
+import threading
+import time
+
+from pymavlink import mavutil
+
+from modules.router import bulk_decoder
+from modules.router import frame_filter
+
+
+REPEAT_COUNT = 5
+# Seconds of telemetry at the rates of the mock drones, sped up
+RECORDING_DURATION = 600  # s
+ATTITUDE_RATE = 3  # Hz
+POSITION_RATE = 2  # Hz
+HEARTBEAT_RATE = 1  # Hz
+# Same as mavutil
+MAVUTIL_READ_SIZE = 4096  # bytes
+
+
+def record_stream() -> bytes:
+    """
+    Encodes the messages a drone sends, in time order.
+    """
+    encoder = mavutil.mavlink.MAVLink(None, 1, 0)
+    stream = bytearray()
+    for time_boot_ms in range(0, RECORDING_DURATION * 1000, 1):
+        if time_boot_ms % (1000 // HEARTBEAT_RATE) == 0:
+            stream += encoder.heartbeat_encode(2, 3, 0, 0, 4).pack(encoder)
+
+        if time_boot_ms % (1000 // ATTITUDE_RATE) == 0:
+            yaw = math.remainder(time_boot_ms / 1000, 2 * math.pi)
+            stream += encoder.attitude_encode(time_boot_ms, 0.1, 0.2, yaw, 0, 0, 1).pack(encoder)
+
+        if time_boot_ms % (1000 // POSITION_RATE) == 0:
+            stream += encoder.local_position_ned_encode(
+                time_boot_ms, time_boot_ms / 1000, 2, 3, 1, 0, 0
+            ).pack(encoder)
+
+    return bytes(stream)
+
+
+def replay(stream: bytes, read: "(socket.socket) -> int") -> "tuple[float, int]":  # type: ignore
+    """
+    Sends the stream through a socket pair while read() consumes it.
+
+    read: Reads once from the socket, returns the number of messages decoded or -1 at the end.
+
+    Returns the seconds taken and the number of messages.
+    """
+    sender, receiver = socket.socketpair()
+    writer = threading.Thread(target=lambda: (sender.sendall(stream), sender.close()))
+
+    start = time.perf_counter()
+    writer.start()
+    message_count = 0
+    while True:
+        count = read(receiver)
+        if count < 0:
+            break
+
+        message_count += count
+
+    elapsed = time.perf_counter() - start
+    writer.join()
+    receiver.close()
+    return elapsed, message_count
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    stream = record_stream()
+
+    def read_mavutil(receiver: socket.socket) -> int:
+        # What recv_match() does: read, then parse one message at a time
+        data = receiver.recv(MAVUTIL_READ_SIZE)
+        if len(data) == 0:
+            return -1
+
+        return len(parser.parse_buffer(data) or [])
+
+    def read_bulk(receiver: socket.socket) -> int:
+        before = decoder.frame_count
+        try:
+            decoder.receive(receiver)
+        except EOFError:
+            return -1
+
+        return decoder.frame_count - before
+
+    def read_filtered(receiver: socket.socket) -> int:
+        data = receiver.recv(MAVUTIL_READ_SIZE)
+        if len(data) == 0:
+            return -1
+
+        return len(incoming.feed(data))
+
+    mavutil_s = []
+    bulk_s = []
+    filtered_s = []
+    for _ in range(REPEAT_COUNT):
+        parser = mavutil.mavlink.MAVLink(None)
+        parser.robust_parsing = True
+        elapsed, mavutil_count = replay(stream, read_mavutil)
+        mavutil_s.append(elapsed)
+
+        decoder = bulk_decoder.BulkDecoder()
+        elapsed, bulk_count = replay(stream, read_bulk)
+        bulk_s.append(elapsed)
+
+        # Only a heartbeat subscriber, telemetry is skipped
+        incoming = frame_filter.FrameFilter(["HEARTBEAT"])
+        elapsed, _ = replay(stream, read_filtered)
+        filtered_s.append(elapsed)
+
+    print(f"Recorded stream of {len(stream)} B:")
+    print(f"    mavutil: {mavutil_count / min(mavutil_s):.0f} messages/s")
+    print(f"    bulk: {bulk_count / min(bulk_s):.0f} messages/s")
+    print(f"    header filter, heartbeats only: {mavutil_count / min(filtered_s):.0f} frames/s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
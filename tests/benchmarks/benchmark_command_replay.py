@@ -0,0 +1,118 @@
+"""
+Benchmark replaying a flight through Command.run_batch against Command.run for each sample,
+both without sending. To run:
+```
+python -m tests.benchmarks.benchmark_command_replay
+```
+"""
+
+import math
+import timeit
+
+import numpy as np
+
+from modules.command import command
+from modules.command import command_decision
+from modules.command import command_governor
+from modules.common.modules.logger import logger
+from modules.telemetry import telemetry
+
+
+SAMPLE_COUNT = 30000  # 10 minutes at 50 Hz
+TARGET = command.Position(10.0, 20.0, 30.0)
+
+
+class ReplayConnection:  # pylint: disable=too-few-public-methods
+    """
+    Connection which discards commands, to replay offline.
+    """
+
+    def __init__(self) -> None:
+        self.mav = self
+
+    def command_long_send(self, *_: object) -> None:
+        """
+        Discards the command.
+        """
+
+
+def create_flight() -> np.ndarray:
+    """
+    Telemetry records circling the target while climbing.
+    """
+    times = np.arange(SAMPLE_COUNT)
+    angles = times * 2 * math.pi / 3000
+    records = np.zeros(SAMPLE_COUNT, dtype=telemetry.TelemetryData.DTYPE)
+    records["present"] = (1 << len(telemetry.TelemetryData.FIELD_NAMES)) - 1
+    records["time_since_boot"] = times * 20
+    records["x"] = TARGET.x + 50 * np.cos(angles)
+    records["y"] = TARGET.y + 50 * np.sin(angles)
+    records["z"] = TARGET.z + np.sin(angles * 7)
+    records["yaw"] = (angles + math.pi) % (2 * math.pi) - math.pi
+    return records
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, local_logger = logger.Logger.create("benchmark_command_replay", False)
+    if not result:
+        print("ERROR: Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    records = create_flight()
+    samples = [
+        telemetry.TelemetryData.from_buffer(records.tobytes(), i * records.itemsize)
+        for i in range(SAMPLE_COUNT)
+    ]
+
+    def create_command() -> command.Command:
+        # Suppresses nothing, like run_batch
+        governor = command_governor.CommandGovernor(0.0, 0.0, 0.0)
+        _, command_obj = command.Command.create(
+            ReplayConnection(), TARGET, local_logger, governor=governor
+        )
+        return command_obj
+
+    scalar_command = create_command()
+    batch_command = create_command()
+    scalar_decisions = []
+    batch_decisions = []
+
+    scalar_s = timeit.timeit(
+        lambda: scalar_decisions.extend(scalar_command.run(sample) for sample in samples), number=1
+    )
+    batch_s = timeit.timeit(
+        lambda: batch_decisions.extend(batch_command.run_batch(records)), number=1
+    )
+
+    # Without formatting the descriptions, as when comparing against expected commands
+    decide_s = timeit.timeit(
+        lambda: command_decision.decide_batch(
+            (TARGET.x, TARGET.y, TARGET.z), records["x"], records["y"], records["z"], records["yaw"]
+        ),
+        number=1,
+    )
+
+    if scalar_decisions != batch_decisions:
+        print("ERROR: Decisions differ")
+        return -1
+
+    print(f"{SAMPLE_COUNT} samples, identical decisions:")
+    print(f"    run for each: {scalar_s * 1e3:.1f} ms")
+    print(f"    run_batch: {batch_s * 1e3:.1f} ms")
+    print(f"    decide_batch alone: {decide_s * 1e3:.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,101 @@
+"""
+Benchmark memory, construction time, and pickle size of the slotted TelemetryData and Position
+against the same classes with an instance dict. To run:
+```
+python -m tests.benchmarks.benchmark_compact_records
+```
+"""
+
+import pickle
+import timeit
+import tracemalloc
+
+from modules.command import command
+from modules.telemetry import telemetry
+
+
+INSTANCE_COUNT = 10000
+REPEAT_COUNT = 100000
+TELEMETRY_VALUES = (
+    123456,
+    1.0,
+    2.0,
+    30.0,
+    0.1,
+    0.2,
+    -0.3,
+    0.01,
+    0.02,
+    1.1071487177940904,
+    0.0,
+    0.0,
+    3.14,
+    40,
+)
+POSITION_VALUES = (10.0, 20.0, 30.0)
+
+
+class DictTelemetryData:  # pylint: disable=too-few-public-methods
+    """
+    TelemetryData with an instance dict and default pickling, like before the slots.
+    """
+
+    __init__ = telemetry.TelemetryData.__init__
+
+
+class DictPosition:  # pylint: disable=too-few-public-methods
+    """
+    Position with an instance dict and default pickling, like before the slots.
+    """
+
+    __init__ = command.Position.__init__
+
+
+def instance_size(cls: type, values: tuple) -> float:
+    """
+    Returns the bytes allocated per instance, excluding the values which are shared.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [cls(*values) for _ in range(INSTANCE_COUNT)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The list of instances
+    after -= len(instances) * 8
+    return (after - before) / INSTANCE_COUNT
+
+
+def report(name: str, cls: type, dict_cls: type, values: tuple) -> None:
+    """
+    Prints the size, construction time, and pickle size of both classes.
+    """
+    print(f"{name}:")
+    for label, item_type in (("slots", cls), ("instance dict", dict_cls)):
+        namespace = {"item_type": item_type, "values": values, "item": item_type(*values)}
+        construct_s = timeit.timeit("item_type(*values)", number=REPEAT_COUNT, globals=namespace)
+        access_s = timeit.timeit("item.x", number=REPEAT_COUNT, globals=namespace)
+        print(
+            f"    {label}: {instance_size(item_type, values):.0f} B per instance, "
+            f"construct {construct_s * 1e9 / REPEAT_COUNT:.0f} ns, "
+            f"read attribute {access_s * 1e9 / REPEAT_COUNT:.0f} ns, "
+            f"pickled {len(pickle.dumps(namespace['item']))} B"
+        )
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    report("TelemetryData", telemetry.TelemetryData, DictTelemetryData, TELEMETRY_VALUES)
+    report("Position", command.Position, DictPosition, POSITION_VALUES)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
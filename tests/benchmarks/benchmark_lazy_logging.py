@@ -0,0 +1,78 @@
+"""
+Benchmark the per-iteration cost of debug logging in a hot loop with debug disabled,
+eagerly through the worker logger against lazily. To run:
+```
+python -m tests.benchmarks.benchmark_lazy_logging
+```
+"""
+
+import logging
+import timeit
+
+from modules.common.modules.logger import logger
+from utilities.workers import lazy_logger
+
+
+ITERATION_COUNT = 100000
+VELOCITY = (1.234567, -2.345678, 0.5)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, local_logger = logger.Logger.create("benchmark_lazy_logging", False)
+    if not result:
+        print("ERROR: Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    # Only info and above, like a flight without debugging
+    local_logger.logger.setLevel(logging.INFO)
+    lazy = lazy_logger.LazyLogger(local_logger)
+    skipped = 3
+
+    def eager() -> None:
+        for _ in range(ITERATION_COUNT):
+            local_logger.debug("Run", True)
+            local_logger.debug(f"Skipped {skipped} stale telemetry")
+            local_logger.debug(f"Velocity: {VELOCITY[0]}, {VELOCITY[1]}, {VELOCITY[2]}")
+
+    def deferred() -> None:
+        for _ in range(ITERATION_COUNT):
+            lazy.debug("Run")
+            lazy.debug("Skipped %d stale telemetry", skipped)
+            lazy.debug("Velocity: %s, %s, %s", *VELOCITY)
+
+    def gated() -> None:
+        for _ in range(ITERATION_COUNT):
+            if lazy.is_enabled(logging.DEBUG):
+                lazy.debug("Run")
+                lazy.debug("Skipped %d stale telemetry", skipped)
+                lazy.debug("Velocity: %s, %s, %s", *VELOCITY)
+
+    def baseline() -> None:
+        for _ in range(ITERATION_COUNT):
+            pass
+
+    baseline_s = timeit.timeit(baseline, number=1)
+    print(f"{ITERATION_COUNT} iterations of 3 debug messages with debug disabled:")
+    for label, loop in (
+        ("eager Logger", eager),
+        ("lazy logger", deferred),
+        ("is_enabled() check", gated),
+    ):
+        loop_s = timeit.timeit(loop, number=1) - baseline_s
+        print(f"    {label}: {loop_s / ITERATION_COUNT * 1e9:.0f} ns per iteration")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,121 @@
+"""
+Benchmark the queue backends. To run:
+```
+python -m tests.benchmarks.benchmark_queue_backends
+```
+"""
+
+import multiprocessing as mp
+import time
+
+from utilities.workers import queue_proxy_wrapper
+
+
+ITEM_COUNT = 5000
+QUEUE_MAX_SIZE = 5
+ATTRIBUTE_COUNT = 13
+BATCH_SIZE = 8
+
+
+class TelemetryLike:
+    """
+    Plain object with the same number of float attributes as TelemetryData.
+    """
+
+    def __init__(self, value: float) -> None:
+        for i in range(ATTRIBUTE_COUNT):
+            setattr(self, f"field_{i}", value + i)
+
+
+def produce(
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int, batch_size: int
+) -> None:
+    """
+    Puts count items followed by a sentinel, batch_size items per queue access.
+    """
+    for i in range(0, count, batch_size):
+        if batch_size == 1:
+            output_queue.put(TelemetryLike(float(i)))
+        else:
+            output_queue.put_many([TelemetryLike(float(i + j)) for j in range(batch_size)])
+
+    output_queue.put(None)
+
+
+def run_throughput(output_queue: queue_proxy_wrapper.QueueProxyWrapper, batch_size: int) -> float:
+    """
+    Transfers ITEM_COUNT items from a producer process to this process.
+
+    Returns the time per item in microseconds.
+    """
+    producer = mp.Process(target=produce, args=(output_queue, ITEM_COUNT, batch_size))
+
+    start = time.perf_counter()
+    producer.start()
+    running = True
+    while running:
+        for item in output_queue.get_many(batch_size):
+            if item is None:
+                running = False
+    elapsed = time.perf_counter() - start
+
+    producer.join()
+
+    return elapsed / ITEM_COUNT * 1e6
+
+
+def run_single_process(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> float:
+    """
+    Puts and gets ITEM_COUNT items in this process, measuring the cost of the calls alone.
+
+    Returns the time per put and get pair in microseconds.
+    """
+    item = TelemetryLike(0.0)
+
+    start = time.perf_counter()
+    for _ in range(ITEM_COUNT):
+        output_queue.put(item)
+        output_queue.get()
+    elapsed = time.perf_counter() - start
+
+    return elapsed / ITEM_COUNT * 1e6
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    mp_manager = mp.Manager()
+
+    print(f"{ITEM_COUNT} items, maxsize {QUEUE_MAX_SIZE}")
+    for backend in queue_proxy_wrapper.QueueBackend:
+        output_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, QUEUE_MAX_SIZE, backend)
+
+        pair_us = run_single_process(output_queue)
+        instrumented_us = run_single_process(
+            queue_proxy_wrapper.QueueProxyWrapper(
+                mp_manager, QUEUE_MAX_SIZE, backend, statistics_name="benchmark"
+            )
+        )
+        throughput_us = run_throughput(output_queue, 1)
+        batched_us = run_throughput(output_queue, BATCH_SIZE)
+
+        print(
+            f"{backend.name:>13}: put+get {pair_us:8.1f} us "
+            f"({instrumented_us:8.1f} us with statistics), "
+            f"producer to consumer {throughput_us:8.1f} us/item "
+            f"({1e6 / throughput_us:9.0f} items/s), "
+            f"batches of {BATCH_SIZE} {batched_us:8.1f} us/item"
+        )
+
+    mp_manager.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,141 @@
+"""
+Benchmark the binary encoding of TelemetryData and Position against pickle. To run:
+```
+python -m tests.benchmarks.benchmark_telemetry_codec
+```
+"""
+
+import copyreg
+import pickle
+import timeit
+
+from modules.command import command
+from modules.telemetry import telemetry
+
+
+REPEAT_COUNT = 20000
+RECORD_COUNT = 1000
+
+
+class PlainTelemetryData(telemetry.TelemetryData):
+    """
+    Pickled by attributes, like before the binary encoding.
+    """
+
+    def __reduce__(self) -> "tuple":
+        # Slot state, the attributes are slots
+        state = {name: getattr(self, name) for name in self.FIELD_NAMES}
+        return copyreg.__newobj__, (PlainTelemetryData,), (None, state)
+
+
+class PlainPosition(command.Position):
+    """
+    Pickled by attributes, like before the binary encoding.
+    """
+
+    def __reduce__(self) -> "tuple":
+        state = {"x": self.x, "y": self.y, "z": self.z}
+        return copyreg.__newobj__, (PlainPosition,), (None, state)
+
+
+def report(name: str, item: object, plain_item: object) -> None:
+    """
+    Prints encoded sizes and encode/decode times of item, compared to pickling plain_item.
+    """
+    item_type = type(item)
+    pickled_plain = pickle.dumps(plain_item)
+    encoded = item.to_bytes()
+    # Pickled object, what workers put into queues, and the pickled encoding alone
+    pickled = pickle.dumps(item)
+    pickled_encoded = pickle.dumps(encoded)
+
+    timings = [
+        timeit.timeit(lambda: pickle.dumps(plain_item), number=REPEAT_COUNT),
+        timeit.timeit(lambda: pickle.loads(pickled_plain), number=REPEAT_COUNT),
+        timeit.timeit(item.to_bytes, number=REPEAT_COUNT),
+        timeit.timeit(lambda: item_type.from_buffer(encoded), number=REPEAT_COUNT),
+        timeit.timeit(lambda: pickle.dumps(item), number=REPEAT_COUNT),
+        timeit.timeit(lambda: pickle.loads(pickled), number=REPEAT_COUNT),
+        timeit.timeit(lambda: pickle.dumps(item.to_bytes()), number=REPEAT_COUNT),
+        timeit.timeit(
+            lambda: item_type.from_buffer(pickle.loads(pickled_encoded)), number=REPEAT_COUNT
+        ),
+    ]
+    (
+        pickle_encode,
+        pickle_decode,
+        codec_encode,
+        codec_decode,
+        object_encode,
+        object_decode,
+        encoding_pickle_encode,
+        encoding_pickle_decode,
+    ) = [timing * 1e6 / REPEAT_COUNT for timing in timings]
+
+    print(f"{name}:")
+    print(
+        f"    size: pickled attributes {len(pickled_plain)} B, "
+        f"encoding {len(encoded)} B, pickled object {len(pickled)} B, "
+        f"pickled encoding {len(pickled_encoded)} B"
+    )
+    print(
+        f"    encode: pickled attributes {pickle_encode:.2f} us, "
+        f"encoding {codec_encode:.2f} us, pickled object {object_encode:.2f} us, "
+        f"pickled encoding {encoding_pickle_encode:.2f} us"
+    )
+    print(
+        f"    decode: pickled attributes {pickle_decode:.2f} us, "
+        f"encoding {codec_decode:.2f} us, pickled object {object_decode:.2f} us, "
+        f"pickled encoding {encoding_pickle_decode:.2f} us"
+    )
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    values = (
+        123456,
+        1.0,
+        2.0,
+        30.0,
+        0.1,
+        0.2,
+        -0.3,
+        0.01,
+        0.02,
+        1.1071487177940904,
+        0.0,
+        0.0,
+        3.14,
+        40,
+    )
+    report("TelemetryData", telemetry.TelemetryData(*values), PlainTelemetryData(*values))
+    report("Position", command.Position(10.0, 20.0, 30.0), PlainPosition(10.0, 20.0, 30.0))
+
+    # Bulk access: one field of many records
+    records = [PlainTelemetryData(i, *values[1:]) for i in range(RECORD_COUNT)]
+    pickled_records = pickle.dumps(records)
+    encoded_records = b"".join(record.to_bytes() for record in records)
+
+    def read_view() -> "list[float]":
+        view = telemetry.TelemetryData.view_buffer(encoded_records)
+        return view["yaw"].tolist()
+
+    pickle_bulk_s = timeit.timeit(
+        lambda: [record.yaw for record in pickle.loads(pickled_records)], number=100
+    )
+    view_bulk_s = timeit.timeit(read_view, number=100)
+    print(f"yaw of {RECORD_COUNT} records:")
+    print(f"    size: pickle {len(pickled_records)} B, codec {len(encoded_records)} B")
+    print(f"    unpickle {pickle_bulk_s * 1e4:.1f} us, zero-copy view {view_bulk_s * 1e4:.1f} us")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
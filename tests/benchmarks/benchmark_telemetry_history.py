@@ -0,0 +1,105 @@
+"""
+Benchmark windowed queries on the columnar telemetry history against a list of objects. To run:
+```
+python -m tests.benchmarks.benchmark_telemetry_history
+```
+"""
+
+import collections
+import timeit
+
+from modules.telemetry import telemetry
+from modules.telemetry import telemetry_history
+
+
+SAMPLE_COUNT = 2000
+CAPACITY = 1024
+# Queried after every sample
+WINDOW_COUNT = 100
+WINDOW_DURATION = 1000  # ms
+PERIOD = 20  # ms
+
+
+def create_samples() -> "list[telemetry.TelemetryData]":
+    """
+    Telemetry at 50 Hz with every field set.
+    """
+    return [
+        telemetry.TelemetryData(i * PERIOD, *(float(i + field) for field in range(12)), 0)
+        for i in range(SAMPLE_COUNT)
+    ]
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    samples = create_samples()
+    field_names = telemetry_history.TelemetryHistory.FIELD_NAMES
+
+    def columnar() -> float:
+        history = telemetry_history.TelemetryHistory(CAPACITY)
+        total = 0.0
+        for sample in samples:
+            history.append(sample)
+            total += history.mean(count=WINDOW_COUNT)["z"]
+            total += history.mean_rate(duration=WINDOW_DURATION)["z"]
+
+        return total
+
+    def objects() -> float:
+        history = collections.deque(maxlen=CAPACITY)
+        total = 0.0
+        for sample in samples:
+            history.append(sample)
+            window = list(history)[-WINDOW_COUNT:]
+            means = {
+                name: sum(getattr(entry, name) for entry in window) / len(window)
+                for name in field_names
+            }
+            total += means["z"]
+
+            recent = [
+                entry
+                for entry in history
+                if entry.time_since_boot >= sample.time_since_boot - WINDOW_DURATION
+            ]
+            elapsed = (recent[-1].time_since_boot - recent[0].time_since_boot) / 1000
+            rates = {
+                name: (
+                    (getattr(recent[-1], name) - getattr(recent[0], name)) / elapsed
+                    if elapsed > 0
+                    else float("nan")
+                )
+                for name in field_names
+            }
+            total += rates["z"]
+
+        return total
+
+    def append_only() -> None:
+        history = telemetry_history.TelemetryHistory(CAPACITY)
+        for sample in samples:
+            history.append(sample)
+
+    columnar_s = timeit.timeit(columnar, number=1)
+    objects_s = timeit.timeit(objects, number=1)
+    append_s = timeit.timeit(append_only, number=1)
+
+    print(
+        f"{SAMPLE_COUNT} samples, mean of the last {WINDOW_COUNT} and rate over the last "
+        f"{WINDOW_DURATION} ms after each:"
+    )
+    print(f"    columnar history: {columnar_s / SAMPLE_COUNT * 1e6:.1f} us per sample")
+    print(f"    list of objects: {objects_s / SAMPLE_COUNT * 1e6:.1f} us per sample")
+    print(f"    columnar append alone: {append_s / SAMPLE_COUNT * 1e6:.1f} us per sample")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,80 @@
+"""
+Benchmark resampling a telemetry backlog in bulk against one message at a time. To run:
+```
+python -m tests.benchmarks.benchmark_telemetry_resampler
+```
+"""
+
+import math
+import timeit
+
+from pymavlink import mavutil
+
+from modules.telemetry import telemetry
+
+
+REPEAT_COUNT = 20
+# Same rates as the telemetry mock drone
+ATTITUDE_PERIOD = 333  # ms
+POSITION_PERIOD = 500  # ms
+BACKLOG_DURATION = 60000  # ms
+GRID_PERIOD = 100  # ms
+
+
+def create_backlog() -> "list[mavutil.mavlink.MAVLink_message]":
+    """
+    Interleaved attitude and position messages in time order.
+    """
+    encoder = mavutil.mavlink.MAVLink(None, 1, 0)
+    messages = []
+    for time_boot_ms in range(0, BACKLOG_DURATION, 1):
+        if time_boot_ms % ATTITUDE_PERIOD == 0:
+            yaw = math.remainder(math.pi * time_boot_ms / 1000, 2 * math.pi)
+            messages.append(encoder.attitude_encode(time_boot_ms, 0, 0, yaw, 0, 0, math.pi))
+
+        if time_boot_ms % POSITION_PERIOD == 0:
+            messages.append(
+                encoder.local_position_ned_encode(time_boot_ms, time_boot_ms / 1000, 0, 0, 1, 0, 0)
+            )
+
+    return messages
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    messages = create_backlog()
+    capacity = len(messages)
+
+    def bulk() -> int:
+        resampler = telemetry.TelemetryResampler(capacity)
+        resampler.add_many(messages)
+        return len(resampler.resample_grid(GRID_PERIOD))
+
+    def one_at_a_time() -> int:
+        resampler = telemetry.TelemetryResampler()
+        count = 0
+        for message in messages:
+            resampler.add(message)
+            if resampler.resample_latest() is not None:
+                count += 1
+
+        return count
+
+    bulk_s = timeit.timeit(bulk, number=REPEAT_COUNT) / REPEAT_COUNT
+    single_s = timeit.timeit(one_at_a_time, number=REPEAT_COUNT) / REPEAT_COUNT
+
+    print(f"Backlog of {len(messages)} messages over {BACKLOG_DURATION / 1000:.0f} s:")
+    print(f"    bulk, {bulk()} records on a {GRID_PERIOD} ms grid: {bulk_s * 1e3:.2f} ms")
+    print(f"    one at a time, {one_at_a_time()} records: {single_s * 1e3:.2f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,108 @@
+"""
+Benchmark drift of periodic sends on the timer wheel against sleeping a period after each. To run:
+```
+python -m tests.benchmarks.benchmark_timer_wheel
+```
+"""
+
+import time
+
+from utilities.workers import timer_wheel
+
+
+RUN_COUNT = 200
+PERIOD = 0.01  # seconds
+# Time taken by each send, such as encoding and writing a message
+WORK_TIME = 0.002  # seconds
+# Independent tasks sharing the thread, like heartbeats of several links
+TASK_COUNT = 4
+
+
+def work() -> None:
+    """
+    Busy waits for the work time.
+    """
+    end = time.perf_counter() + WORK_TIME
+    while time.perf_counter() < end:
+        pass
+
+
+def sleep_loop() -> "list[float]":
+    """
+    Runs then sleeps a period, like the heartbeat sender did.
+
+    Returns the start time of each run.
+    """
+    starts = []
+    for _ in range(RUN_COUNT):
+        starts.append(time.monotonic())
+        work()
+        time.sleep(PERIOD)
+
+    return starts
+
+
+def wheel_loop(task_count: int) -> "tuple[list[float], list[timer_wheel.PeriodicTask]]":
+    """
+    Runs tasks with the same period on the wheel, sleeping until the next deadline.
+
+    Returns the start time of each run of the first task, and the tasks.
+    """
+    starts = []
+    wheel = timer_wheel.TimerWheel()
+    now = time.monotonic()
+
+    def first() -> None:
+        starts.append(time.monotonic())
+        work()
+
+    tasks = [wheel.add_task("task_0", PERIOD, first, now)]
+    for i in range(1, task_count):
+        # Spread over the period
+        tasks.append(wheel.add_task(f"task_{i}", PERIOD, work, now + i * PERIOD / task_count))
+
+    while len(starts) < RUN_COUNT:
+        wheel.run_pending()
+        timeout = wheel.get_timeout()
+        if timeout is not None and timeout > 0.0:
+            time.sleep(timeout)
+
+    return starts, tasks
+
+
+def report(name: str, starts: "list[float]") -> None:
+    """
+    Prints the drift of the last run and the jitter of the intervals.
+    """
+    drift = starts[-1] - starts[0] - (len(starts) - 1) * PERIOD
+    intervals = sorted(later - earlier for earlier, later in zip(starts, starts[1:]))
+    median = intervals[len(intervals) // 2]
+    p99 = intervals[int(len(intervals) * 0.99)]
+    print(
+        f"    {name}: drift {drift * 1e3:.1f} ms after {len(starts)} runs, "
+        f"interval median {median * 1e3:.3f} ms, p99 {p99 * 1e3:.3f} ms"
+    )
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    print(f"{RUN_COUNT} runs every {PERIOD * 1e3:.0f} ms, each taking {WORK_TIME * 1e3:.0f} ms:")
+    report("sleep after run", sleep_loop())
+    starts, _ = wheel_loop(1)
+    report("timer wheel", starts)
+    starts, tasks = wheel_loop(TASK_COUNT)
+    report(f"timer wheel with {TASK_COUNT} tasks in one thread", starts)
+    for task in tasks:
+        print(f"        {task.summary()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
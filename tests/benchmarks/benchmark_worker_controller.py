@@ -0,0 +1,89 @@
+"""
+Benchmark the flag checks of WorkerController. To run:
+```
+python -m tests.benchmarks.benchmark_worker_controller
+```
+"""
+
+import multiprocessing as mp
+import time
+import timeit
+
+from utilities.workers import worker_controller
+
+
+REPEAT_COUNT = 100000
+
+
+class QueueWorkerController:
+    """
+    Exit request in a queue and pause in a semaphore, like before the control block.
+    """
+
+    def __init__(self) -> None:
+        self.__pause = mp.BoundedSemaphore(1)
+        self.__exit_queue = mp.Queue(1)
+
+    def check_pause(self) -> None:
+        """
+        Same as before the control block.
+        """
+        self.__pause.acquire()
+        self.__pause.release()
+
+    def request_exit(self) -> None:
+        """
+        Same as before the control block.
+        """
+        time.sleep(0.1)
+        if self.__exit_queue.empty():
+            self.__exit_queue.put(None)
+
+    def is_exit_requested(self) -> bool:
+        """
+        Same as before the control block.
+        """
+        return not self.__exit_queue.empty()
+
+
+def time_per_call(function: "() -> object") -> float:  # type: ignore
+    """
+    Returns the time per call in microseconds.
+    """
+    return timeit.timeit(function, number=REPEAT_COUNT) * 1e6 / REPEAT_COUNT
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    controllers = {
+        "queue": QueueWorkerController(),
+        "control block": worker_controller.WorkerController(),
+    }
+
+    for name, controller in controllers.items():
+        exit_us = time_per_call(controller.is_exit_requested)
+        pause_us = time_per_call(controller.check_pause)
+
+        start = time.perf_counter()
+        controller.request_exit()
+        # Worker loops see the request on their next check
+        while not controller.is_exit_requested():
+            pass
+        request_exit_ms = (time.perf_counter() - start) * 1e3
+
+        print(
+            f"{name:>13}: is_exit_requested {exit_us:6.3f} us, check_pause {pause_us:6.3f} us, "
+            f"request_exit until visible {request_exit_ms:7.3f} ms"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -19,6 +19,9 @@ TARGET = command.Position(10, 20, 30)
 Z_SPEED = 1  # m/s
 RELATIVE = 1  # 1 for relative angle
 TURNING_SPEED = 5  # deg/s
+# Acknowledge every valid command, otherwise the command worker retransmits them
+# and holds back identical commands until it gives up, so fewer than NUM_TRIALS are new
+SEND_ACKS = True
 
 
 def main() -> int:
@@ -45,7 +48,8 @@ def main() -> int:
     local_logger.info("Logger initialized")
 
     # Task is to read NUM_TRIALS COMMAND_LONG messages
-    for _ in range(NUM_TRIALS):
+    num_received = 0
+    while num_received < NUM_TRIALS:
         msg = connection.recv_match(type="COMMAND_LONG", blocking=True, timeout=TIMEOUT)
         if not msg or msg.get_type() != "COMMAND_LONG":
             local_logger.error("Sent incorrect message type or timed out, still expecting mesages")
@@ -57,8 +61,12 @@ def main() -> int:
             local_logger.error("Sent incorrect command within COMMAND_LONG message.")
             return -3
         if msg.confirmation != 0:
-            local_logger.error("Confirmation should be 0")
-            return -4
+            if SEND_ACKS:
+                local_logger.error("Confirmation should be 0, every command was acknowledged")
+                return -4
+            # Retransmission of an unacknowledged command
+            local_logger.info(f"Received retransmission {msg.confirmation}")
+            continue
         if msg.command == mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT:
             if abs(msg.param7 - TARGET.z) > FLOAT_TOLERANCE:
                 local_logger.error(f"Altitude target is not the desired value: {msg.param7}")
@@ -73,12 +81,17 @@ def main() -> int:
             if abs(msg.param2 - TURNING_SPEED) > FLOAT_TOLERANCE:
                 local_logger.error(f"Turning speed is not the desired value: {msg.param2}")
                 return -8
+        if SEND_ACKS:
+            connection.mav.command_ack_send(msg.command, mavutil.mavlink.MAV_RESULT_ACCEPTED)
+        num_received += 1
         local_logger.info("Received a valid command")
 
     msg = connection.recv_match(type="COMMAND_LONG", blocking=True, timeout=TIMEOUT)
-    if msg and msg.get_type() == "COMMAND_LONG":
-        local_logger.error("Recieved extra command")
-        return -9
+    while msg and msg.get_type() == "COMMAND_LONG":
+        if msg.confirmation == 0 or SEND_ACKS:
+            local_logger.error("Recieved extra command")
+            return -9
+        msg = connection.recv_match(type="COMMAND_LONG", blocking=True, timeout=TIMEOUT)
 
     local_logger.info("Passed!")
     return 0
@@ -74,7 +74,7 @@ def read_queue(
     """
     while not controller.is_exit_requested():
         try:
-            msg = input_queue.queue.get(timeout=1)
+            msg = input_queue.get(timeout=1)
 
             if msg is not None:
                 main_logger.info(msg)
@@ -93,7 +93,7 @@ def put_queue(
     """
 
     for info in flight_info:
-        local_queue.queue.put(info)
+        local_queue.put(info)
         time.sleep(TELEMETRY_PERIOD)
 
 
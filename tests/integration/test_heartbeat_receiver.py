@@ -68,7 +68,7 @@ def read_queue(
     """
     while not controller.is_exit_requested():
         try:
-            msg = input_queue.queue.get(timeout=0.1)
+            msg = input_queue.get(timeout=0.1)
             local_logger.info(msg)
         except queue_proxy_wrapper.queue.Empty:
             continue
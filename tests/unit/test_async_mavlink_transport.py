@@ -0,0 +1,132 @@
+"""
+Test MAVLink over asyncio streams.
+"""
+
+import asyncio
+import socket
+
+import pytest
+from pymavlink import mavutil
+
+from modules.router import async_mavlink_transport
+from utilities.workers import async_worker_controller
+
+
+QUEUE_SIZE = 4
+TIMEOUT = 1  # seconds
+
+
+async def open_pair() -> (
+    "tuple[async_mavlink_transport.AsyncMavlinkTransport, asyncio.StreamReader, asyncio.StreamWriter]"
+):
+    """
+    Transport, and the stream of the drone at the other end.
+    """
+    transport_socket, drone_socket = socket.socketpair()
+    reader, writer = await asyncio.open_connection(sock=transport_socket)
+    drone_reader, drone_writer = await asyncio.open_connection(sock=drone_socket)
+    return async_mavlink_transport.AsyncMavlinkTransport(reader, writer), drone_reader, drone_writer
+
+
+class TestAsyncMavlinkTransport:
+    """
+    Received messages go to the subscribers of their type, sends go to the stream.
+    """
+
+    def test_route(self) -> None:
+        """
+        Subscribers receive their types in order until the stream ends.
+        """
+
+        async def run() -> "tuple[bool, list[object], list[object], object]":
+            transport, _, drone_writer = await open_pair()
+            heartbeat_connection = transport.subscribe(["HEARTBEAT"])
+            telemetry_connection = transport.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"])
+            controller = async_worker_controller.AsyncWorkerController()
+            receiver = asyncio.create_task(transport.run(controller))
+
+            encoder = mavutil.mavlink.MAVLink(None, 1, 1)
+            data = encoder.heartbeat_encode(2, 3, 0, 0, 4).pack(encoder)
+            data += encoder.attitude_encode(10, 0.1, 0.2, 0.3, 0, 0, 0).pack(encoder)
+            data += encoder.command_ack_encode(0, 0).pack(encoder)
+            data += encoder.local_position_ned_encode(20, 1, 2, 3, 0, 0, 0).pack(encoder)
+            drone_writer.write(data)
+            drone_writer.close()
+
+            ended = await asyncio.wait_for(receiver, TIMEOUT)
+            heartbeats = [await heartbeat_connection.recv_match(timeout=TIMEOUT)]
+            telemetry = [await telemetry_connection.recv_match(timeout=TIMEOUT) for _ in range(2)]
+            leftover = await telemetry_connection.recv_match(timeout=0.0)
+            await transport.close()
+            return ended, heartbeats, telemetry, leftover
+
+        # Run
+        ended, heartbeats, telemetry, leftover = asyncio.run(run())
+
+        # Test
+        assert ended
+        assert [message.get_type() for message in heartbeats] == ["HEARTBEAT"]
+        assert [message.time_boot_ms for message in telemetry] == [10, 20]
+        assert leftover is None
+
+    def test_slow_subscriber(self) -> None:
+        """
+        A full subscriber loses its oldest messages.
+        """
+
+        async def run() -> "list[int]":
+            transport, _, _ = await open_pair()
+            connection = transport.subscribe(["ATTITUDE"], QUEUE_SIZE)
+            encoder = mavutil.mavlink.MAVLink(None, 1, 1)
+            for i in range(QUEUE_SIZE * 2):
+                transport.route(encoder.attitude_encode(i, 0, 0, 0, 0, 0, 0))
+
+            # Queued messages are received without waiting
+            times = [
+                (await connection.recv_match(timeout=0.0)).time_boot_ms for _ in range(QUEUE_SIZE)
+            ]
+            await transport.close()
+            return times
+
+        # Run
+        times = asyncio.run(run())
+
+        # Test
+        assert times == list(range(QUEUE_SIZE, QUEUE_SIZE * 2))
+
+    def test_send_and_exit(self) -> None:
+        """
+        Sends are written to the stream, and running stops at the exit request.
+        """
+
+        async def run() -> "tuple[bool, list[object]]":
+            transport, drone_reader, _ = await open_pair()
+            connection = transport.subscribe([])
+            controller = async_worker_controller.AsyncWorkerController()
+            receiver = asyncio.create_task(transport.run(controller))
+
+            connection.mav.heartbeat_send(
+                mavutil.mavlink.MAV_TYPE_GCS, mavutil.mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
+            )
+            data = await asyncio.wait_for(drone_reader.read(1024), TIMEOUT)
+            controller.request_exit()
+            ended = await asyncio.wait_for(receiver, TIMEOUT)
+            await transport.close()
+            return ended, mavutil.mavlink.MAVLink(None).parse_buffer(data)
+
+        # Run
+        ended, messages = asyncio.run(run())
+
+        # Test
+        assert not ended
+        assert [message.get_type() for message in messages] == ["HEARTBEAT"]
+        assert messages[0].get_srcSystem() == 255
+
+    def test_open_unsupported(self) -> None:
+        """
+        Only TCP connection strings are accepted.
+        """
+
+        # Run and test
+        with pytest.raises(ValueError):
+            asyncio.run(async_mavlink_transport.AsyncMavlinkTransport.open("udpin:localhost:14550"))
@@ -0,0 +1,118 @@
+"""
+Test the worker controller for tasks.
+"""
+
+import asyncio
+import queue
+import time
+
+import pytest
+
+from utilities.workers import async_worker_controller
+
+
+EXIT_DELAY = 0.05  # seconds
+EXIT_LATENCY_LIMIT = 0.02  # seconds
+TIMEOUT = 0.05  # seconds
+
+
+async def request_exit_later(controller: async_worker_controller.AsyncWorkerController) -> None:
+    """
+    Requests exit after a delay.
+    """
+    await asyncio.sleep(EXIT_DELAY)
+    controller.request_exit()
+
+
+class TestAsyncWorkerController:
+    """
+    Waits return as soon as exit is requested.
+    """
+
+    def test_wait(self) -> None:
+        """
+        Wait returns whether exit was requested, at the request or the timeout.
+        """
+
+        async def run() -> "tuple[bool, bool, float]":
+            controller = async_worker_controller.AsyncWorkerController()
+            timed_out = await controller.wait(TIMEOUT)
+
+            requester = asyncio.create_task(request_exit_later(controller))
+            start = time.monotonic()
+            exited = await controller.wait(60)
+            elapsed = time.monotonic() - start
+            await requester
+            return timed_out, exited, elapsed
+
+        # Run
+        timed_out, exited, elapsed = asyncio.run(run())
+
+        # Test
+        assert not timed_out
+        assert exited
+        assert elapsed < EXIT_DELAY + EXIT_LATENCY_LIMIT
+
+    def test_queue_get(self) -> None:
+        """
+        Gets return items, and raise `queue.Empty` at the timeout or exit.
+        """
+
+        async def run() -> None:
+            controller = async_worker_controller.AsyncWorkerController()
+            input_queue = asyncio.Queue()
+            input_queue.put_nowait(None)
+            assert await controller.queue_get(input_queue) is None
+
+            with pytest.raises(queue.Empty):
+                await controller.queue_get(input_queue, TIMEOUT)
+
+            requester = asyncio.create_task(request_exit_later(controller))
+            with pytest.raises(queue.Empty):
+                await controller.queue_get(input_queue)
+
+            await requester
+
+            # The cancelled get took nothing
+            input_queue.put_nowait(1)
+            assert input_queue.get_nowait() == 1
+
+        # Run and test
+        asyncio.run(run())
+
+    def test_queue_get_latest(self) -> None:
+        """
+        Skips to the newest item.
+        """
+
+        async def run() -> "tuple[object, int]":
+            controller = async_worker_controller.AsyncWorkerController()
+            input_queue = asyncio.Queue()
+            for i in range(3):
+                input_queue.put_nowait(i)
+
+            return await controller.queue_get_latest(input_queue)
+
+        # Run
+        item, skipped = asyncio.run(run())
+
+        # Test
+        assert item == 2
+        assert skipped == 2
+
+    def test_until_exit_already_requested(self) -> None:
+        """
+        Nothing is awaited once exit is requested.
+        """
+
+        async def run() -> "tuple[bool, object]":
+            controller = async_worker_controller.AsyncWorkerController()
+            controller.request_exit()
+            return await controller.until_exit(asyncio.sleep(0, "result"))
+
+        # Run
+        completed, result = asyncio.run(run())
+
+        # Test
+        assert not completed
+        assert result is None
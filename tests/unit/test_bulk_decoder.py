@@ -0,0 +1,170 @@
+"""
+Test decoding MAVLink frames in bulk.
+"""
+
+import socket
+
+import numpy as np
+import pytest
+from pymavlink.dialects.v10 import common as mavlink_v1
+from pymavlink.dialects.v20 import common as mavlink_v2
+
+from modules.router import bulk_decoder
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+MESSAGE_COUNT = 50
+CHUNK_SIZE = 37  # bytes, splits frames
+# Not decoded by default
+ACK_COUNT = MESSAGE_COUNT // 10
+
+
+@pytest.fixture(params=[mavlink_v1, mavlink_v2], ids=["v1", "v2"])
+def stream(request: pytest.FixtureRequest) -> "tuple[bytes, list[object]]":
+    """
+    Encoded telemetry and heartbeats, and the messages as pymavlink decodes them.
+    """
+    encoder = request.param.MAVLink(None, 1, 0)
+    data = bytearray()
+    for i in range(MESSAGE_COUNT):
+        # Trailing zero speeds are truncated in v2
+        data += encoder.attitude_encode(i, 0.1 * i, -0.2, 3.0, 0, 0, 0).pack(encoder)
+        data += encoder.local_position_ned_encode(i, i, 2, -3, 0.5, 0, 0).pack(encoder)
+        if i % 10 == 0:
+            data += encoder.heartbeat_encode(2, 3, 81, 4, 4).pack(encoder)
+            data += encoder.command_ack_encode(400, 0).pack(encoder)
+
+    messages = request.param.MAVLink(None).parse_buffer(bytes(data))
+    return bytes(data), messages
+
+
+def assert_decoded(records: "dict[str, np.ndarray]", messages: "list[object]") -> None:
+    """
+    Records match the pymavlink messages of the decoded types.
+    """
+    for message_type in bulk_decoder.BulkDecoder.DEFAULT_MESSAGE_TYPES:
+        expected = [message for message in messages if message.get_type() == message_type]
+        assert len(records[message_type]) == len(expected)
+        for name in records[message_type].dtype.names:
+            assert np.allclose(
+                records[message_type][name],
+                [getattr(message, name) for message in expected],
+                atol=1e-6,
+            )
+
+    assert "COMMAND_ACK" not in records
+
+
+class TestBulkDecoder:
+    """
+    Payloads are decoded the same as pymavlink.
+    """
+
+    def test_decode(self, stream: "tuple[bytes, list[object]]") -> None:
+        """
+        A whole stream at once.
+        """
+        # Setup
+        data, messages = stream
+        decoder = bulk_decoder.BulkDecoder()
+
+        # Run
+        records = decoder.feed(data)
+
+        # Test
+        assert_decoded(records, messages)
+        assert decoder.frame_count == len(messages) - ACK_COUNT
+        assert decoder.skipped_count == ACK_COUNT
+        assert decoder.bad_frame_count == 0
+
+    def test_split_frames(self, stream: "tuple[bytes, list[object]]") -> None:
+        """
+        Incomplete frames are kept until the rest arrives.
+        """
+        # Setup
+        data, messages = stream
+        decoder = bulk_decoder.BulkDecoder()
+        chunks: "dict[str, list[np.ndarray]]" = {}
+
+        # Run
+        for i in range(0, len(data), CHUNK_SIZE):
+            for message_type, records in decoder.feed(data[i : i + CHUNK_SIZE]).items():
+                chunks.setdefault(message_type, []).append(records)
+
+        # Test
+        assert_decoded(
+            {message_type: np.concatenate(records) for message_type, records in chunks.items()},
+            messages,
+        )
+
+    def test_resynchronize(self, stream: "tuple[bytes, list[object]]") -> None:
+        """
+        Garbage and corrupted frames are skipped without losing the frames after them.
+        """
+        # Setup
+        data, messages = stream
+        corrupted = bytearray(data)
+        # Flip a payload byte of the first frame
+        corrupted[12] ^= 0xFF
+        # Start markers in garbage would be taken for frames of other types and skipped
+        data = b"\x00\x05garbage" + bytes(corrupted)
+        decoder = bulk_decoder.BulkDecoder()
+
+        # Run
+        records = decoder.feed(data)
+
+        # Test
+        assert len(records["ATTITUDE"]) == MESSAGE_COUNT - 1
+        assert records["ATTITUDE"]["time_boot_ms"][0] == 1
+        assert decoder.frame_count == len(messages) - ACK_COUNT - 1
+        assert decoder.bad_frame_count > 0
+
+    def test_skipped_frames_unchecked(self, stream: "tuple[bytes, list[object]]") -> None:
+        """
+        Frames of other types are skipped by their header, without checking the checksum.
+        """
+        # Setup
+        data, messages = stream
+        ack_start = data.index(bytes(messages[3].get_msgbuf()))
+        corrupted = bytearray(data)
+        corrupted[ack_start + len(messages[3].get_msgbuf()) - 1] ^= 0xFF
+        decoder = bulk_decoder.BulkDecoder()
+
+        # Run
+        records = decoder.feed(bytes(corrupted))
+
+        # Test
+        assert messages[3].get_type() == "COMMAND_ACK"
+        assert_decoded(records, messages)
+        assert decoder.skipped_count == ACK_COUNT
+        assert decoder.bad_frame_count == 0
+
+    def test_receive(self, stream: "tuple[bytes, list[object]]") -> None:
+        """
+        Reads into the buffer from a socket until the peer closes it.
+        """
+        # Setup
+        data, messages = stream
+        sender, receiver = socket.socketpair()
+        sender.sendall(data)
+        sender.close()
+        decoder = bulk_decoder.BulkDecoder()
+        chunks: "dict[str, list[np.ndarray]]" = {}
+
+        # Run
+        with pytest.raises(EOFError):
+            while True:
+                for message_type, records in decoder.receive(receiver).items():
+                    chunks.setdefault(message_type, []).append(records)
+
+        receiver.close()
+
+        # Test
+        assert_decoded(
+            {message_type: np.concatenate(records) for message_type, records in chunks.items()},
+            messages,
+        )
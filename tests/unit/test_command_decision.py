@@ -0,0 +1,85 @@
+"""
+Test that batch decisions are identical to deciding each sample.
+"""
+
+import math
+
+import numpy as np
+
+from modules.command import command_decision
+
+
+TARGET = (10.0, 20.0, 30.0)
+
+
+def decide_each(x: np.ndarray, y: np.ndarray, z: np.ndarray, yaw: np.ndarray) -> "list[str | None]":
+    """
+    Scalar decisions and their descriptions, like `Command.run()` .
+    """
+    descriptions = []
+    for sample in zip(x.tolist(), y.tolist(), z.tolist(), yaw.tolist()):
+        decision = command_decision.decide(TARGET, *sample)
+        descriptions.append(None if decision is None else command_decision.describe(*decision))
+
+    return descriptions
+
+
+class TestDecideBatch:
+    """
+    Batch decisions match scalar decisions exactly.
+    """
+
+    def test_known_decisions(self) -> None:
+        """
+        Altitude first, then yaw, then nothing.
+        """
+        # Setup
+        x = np.array([0.0, 10.0, 10.0, 0.0])
+        y = np.array([0.0, 0.0, 0.0, 10.0])
+        z = np.array([31.0, 30.4, 30.0, 30.0])
+        # North, facing the target, then east, facing away
+        yaw = np.array([0.0, math.pi / 2, 0.0, math.radians(-135.0)])
+
+        # Run
+        commands, values = command_decision.decide_batch(TARGET, x, y, z, yaw)
+
+        # Test
+        assert commands.tolist() == [
+            command_decision.CHANGE_ALTITUDE,
+            command_decision.NO_COMMAND,
+            command_decision.CHANGE_YAW,
+            command_decision.CHANGE_YAW,
+        ]
+        assert values[0] == -1.0
+        assert math.isnan(values[1])
+        assert values[2] == 90.0
+        assert values[3] == -180.0
+        assert command_decision.describe_batch(commands, values) == decide_each(x, y, z, yaw)
+
+    def test_flight_identical(self) -> None:
+        """
+        Random samples, including ones at the tolerances, have identical descriptions.
+        """
+        # Setup
+        generator = np.random.default_rng(0)
+        count = 5000
+        x = generator.uniform(-100.0, 100.0, count)
+        y = generator.uniform(-100.0, 100.0, count)
+        z = TARGET[2] + generator.uniform(-1.0, 1.0, count)
+        yaw = generator.uniform(-math.pi, math.pi, count)
+        # Exactly at the altitude tolerance
+        z[:100] = TARGET[2] + command_decision.ALTITUDE_TOLERANCE
+        # Close to the yaw tolerance in both directions
+        for i in range(100, 300):
+            bearing = math.atan2(TARGET[1] - y[i], TARGET[0] - x[i])
+            offset = (1 if i % 2 == 0 else -1) * command_decision.YAW_TOLERANCE
+            yaw[i] = bearing - math.radians(offset + generator.uniform(-1e-9, 1e-9))
+            z[i] = TARGET[2]
+
+        # Run
+        commands, values = command_decision.decide_batch(TARGET, x, y, z, yaw)
+
+        # Test
+        assert command_decision.describe_batch(commands, values) == decide_each(x, y, z, yaw)
+        assert np.count_nonzero(commands == command_decision.NO_COMMAND) > 0
+        assert np.count_nonzero(commands == command_decision.CHANGE_YAW) > 0
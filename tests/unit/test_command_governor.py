@@ -0,0 +1,107 @@
+"""
+Test deduplication and rate limiting of outgoing commands.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command_governor
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+CHANGE_ALT = mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+YAW = mavutil.mavlink.MAV_CMD_CONDITION_YAW
+MIN_RESEND_INTERVAL = 0.2  # seconds
+IN_FLIGHT_TIMEOUT = 1.0  # seconds
+TOLERANCE = 0.5
+PARAMS = (1.0, 0, 0, 0, 0, 0, 30.0)
+
+
+@pytest.fixture
+def governor() -> command_governor.CommandGovernor:
+    """
+    Governor with a longer in flight timeout than resend interval.
+    """
+    return command_governor.CommandGovernor(MIN_RESEND_INTERVAL, IN_FLIGHT_TIMEOUT, TOLERANCE)
+
+
+class TestCommandGovernor:
+    """
+    Duplicates and too frequent commands are suppressed.
+    """
+
+    def test_duplicate_in_flight(self, governor: command_governor.CommandGovernor) -> None:
+        """
+        An identical command is suppressed until the in flight timeout.
+        """
+        # Run
+        sent = [
+            governor.should_send(CHANGE_ALT, PARAMS, 0.0),
+            governor.should_send(CHANGE_ALT, PARAMS, 0.5),
+            governor.should_send(CHANGE_ALT, PARAMS[:-1] + (30.4,), 0.9),
+            governor.should_send(CHANGE_ALT, PARAMS, 1.0),
+        ]
+
+        # Test
+        assert sent == [True, False, False, True]
+        assert governor.sent_count == 2
+        assert governor.duplicate_count == 2
+        assert governor.rate_limited_count == 0
+
+    def test_rate_limited(self, governor: command_governor.CommandGovernor) -> None:
+        """
+        A different command of the same type waits for the resend interval.
+        """
+        # Run
+        sent = [
+            governor.should_send(CHANGE_ALT, PARAMS, 0.0),
+            governor.should_send(CHANGE_ALT, PARAMS[:-1] + (31.0,), 0.1),
+            governor.should_send(CHANGE_ALT, PARAMS[:-1] + (31.0,), 0.2),
+        ]
+
+        # Test
+        assert sent == [True, False, True]
+        assert governor.rate_limited_count == 1
+        assert governor.get_suppressed_count() == 1
+
+    def test_per_command(self, governor: command_governor.CommandGovernor) -> None:
+        """
+        Each command type has its own interval and command in flight.
+        """
+        # Setup
+        per_command = command_governor.CommandGovernor(
+            MIN_RESEND_INTERVAL, IN_FLIGHT_TIMEOUT, TOLERANCE, {YAW: 0.05}
+        )
+
+        # Run
+        sent = [
+            governor.should_send(CHANGE_ALT, PARAMS, 0.0),
+            governor.should_send(YAW, PARAMS, 0.0),
+            per_command.should_send(YAW, (10.0,), 0.0),
+            per_command.should_send(YAW, (20.0,), 0.1),
+            per_command.should_send(CHANGE_ALT, PARAMS, 0.1),
+            per_command.should_send(CHANGE_ALT, PARAMS[:-1] + (31.0,), 0.2),
+        ]
+
+        # Test
+        assert sent == [True, True, True, True, True, False]
+
+    def test_complete(self, governor: command_governor.CommandGovernor) -> None:
+        """
+        A completed command may be repeated after the resend interval.
+        """
+        # Run
+        governor.should_send(CHANGE_ALT, PARAMS, 0.0)
+        governor.complete(CHANGE_ALT)
+        sent = [
+            governor.should_send(CHANGE_ALT, PARAMS, 0.1),
+            governor.should_send(CHANGE_ALT, PARAMS, 0.2),
+        ]
+
+        # Test
+        assert sent == [False, True]
+        assert governor.rate_limited_count == 1
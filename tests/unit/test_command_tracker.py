@@ -0,0 +1,135 @@
+"""
+Test acknowledgement tracking and retransmission of sent commands.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command_tracker
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+CHANGE_ALT = mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+YAW = mavutil.mavlink.MAV_CMD_CONDITION_YAW
+ACCEPTED = mavutil.mavlink.MAV_RESULT_ACCEPTED
+ACK_TIMEOUT = 0.2  # seconds
+BACKOFF = 2.0
+MAX_TRANSMISSIONS = 3
+PARAMS = (1.0, 0, 0, 0, 0, 0, 30.0)
+
+
+def ack(command_id: int, source_system: int = 1) -> mavutil.mavlink.MAVLink_message:
+    """
+    COMMAND_ACK as received from the source system.
+    """
+    encoder = mavutil.mavlink.MAVLink(None, source_system, 0)
+    data = encoder.command_ack_encode(command_id, ACCEPTED).pack(encoder)
+    return mavutil.mavlink.MAVLink(None).decode(bytearray(data))
+
+
+@pytest.fixture
+def tracker() -> command_tracker.CommandTracker:
+    """
+    Tracker retransmitting at most twice.
+    """
+    return command_tracker.CommandTracker(ACK_TIMEOUT, BACKOFF, MAX_TRANSMISSIONS)
+
+
+class TestCommandTracker:
+    """
+    Acks complete pending commands, others are retransmitted then given up on.
+    """
+
+    def test_ack(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        An ack completes the command of its system and ID, and its round trip is recorded.
+        """
+        # Setup
+        tracker.track(1, 0, CHANGE_ALT, PARAMS, 0.0)
+        tracker.track(1, 0, YAW, PARAMS, 0.0)
+
+        # Run
+        unknown_system = tracker.handle_ack(ack(CHANGE_ALT, 2), 0.01)
+        acked = tracker.handle_ack(ack(CHANGE_ALT), 0.003)
+        repeated = tracker.handle_ack(ack(CHANGE_ALT), 0.004)
+
+        # Test
+        assert unknown_system is None
+        assert acked is not None
+        assert acked.command_id == CHANGE_ALT
+        assert repeated is None
+        assert tracker.get_pending_count() == 1
+        assert tracker.acked_count == 1
+        assert tracker.result_counts == {ACCEPTED: 1}
+        # 3000 us is in [2048, 4096)
+        assert tracker.rtt_histogram[12] == 1
+        assert tracker.get_rtt_percentile(50) == pytest.approx(0.004096)
+
+    def test_retransmit_with_backoff(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        An unacknowledged command is retransmitted after each longer timeout, then given up on.
+        """
+        # Setup
+        tracker.track(1, 0, CHANGE_ALT, PARAMS, 0.0)
+
+        # Run
+        times = [0.1, 0.2, 0.5, 0.65, 1.4, 1.5]
+        results = [tracker.get_retransmissions(now) for now in times]
+
+        # Test
+        assert [len(retransmissions) for retransmissions, _ in results] == [0, 1, 0, 1, 0, 0]
+        assert [len(failures) for _, failures in results] == [0, 0, 0, 0, 0, 1]
+        assert results[3][0][0].confirmation == 2
+        assert results[3][0][0].params == PARAMS
+        assert tracker.retransmission_count == 2
+        assert tracker.failed_count == 1
+        assert tracker.get_pending_count() == 0
+
+    def test_retransmitted_rtt_not_recorded(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        The ack of a retransmitted command completes it without a round trip time.
+        """
+        # Setup
+        tracker.track(1, 0, YAW, PARAMS, 0.0)
+        tracker.get_retransmissions(0.2)
+
+        # Run
+        acked = tracker.handle_ack(ack(YAW), 0.25)
+
+        # Test
+        assert acked is not None
+        assert tracker.acked_count == 1
+        assert sum(tracker.rtt_histogram) == 0
+        assert tracker.get_rtt_percentile(50) is None
+
+    def test_replaced_rtt_not_recorded(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        A command with the same key replaces the pending one and is counted,
+        the ack completes it without a round trip time since it may answer the first.
+        """
+        # Setup
+        tracker.track(1, 0, YAW, PARAMS, 0.0)
+        tracker.get_retransmissions(0.2)
+
+        # Run
+        tracker.track(1, 0, YAW, (10.0, 5.0, 1, 1, 0, 0, 0), 0.3)
+        acked = tracker.handle_ack(ack(YAW), 0.301)
+        tracker.track(1, 0, CHANGE_ALT, PARAMS, 0.4)
+        not_replaced = tracker.handle_ack(ack(CHANGE_ALT), 0.401)
+
+        # Test
+        assert acked is not None
+        assert acked.replaced
+        assert acked.confirmation == 0
+        assert acked.params == (10.0, 5.0, 1, 1, 0, 0, 0)
+        assert not_replaced is not None
+        assert not not_replaced.replaced
+        assert tracker.replaced_count == 1
+        assert tracker.acked_count == 2
+        assert tracker.get_pending_count() == 0
+        # Only the round trip of the command that was not replaced
+        assert sum(tracker.rtt_histogram) == 1
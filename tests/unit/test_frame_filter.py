@@ -0,0 +1,100 @@
+"""
+Test selecting MAVLink frames by message ID before decoding.
+"""
+
+import pytest
+from pymavlink.dialects.v10 import common as mavlink_v1
+from pymavlink.dialects.v20 import common as mavlink_v2
+
+from modules.router import bulk_decoder
+from modules.router import frame_filter
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+MESSAGE_COUNT = 20
+CHUNK_SIZE = 7  # bytes, splits frames and headers
+
+
+@pytest.fixture(params=[mavlink_v1, mavlink_v2], ids=["v1", "v2"])
+def stream(request: pytest.FixtureRequest) -> bytes:
+    """
+    Encoded attitudes, each followed by a command acknowledgement.
+    """
+    encoder = request.param.MAVLink(None, 1, 0)
+    data = bytearray()
+    for i in range(MESSAGE_COUNT):
+        data += encoder.attitude_encode(i, 0.1 * i, -0.2, 3.0, 0, 0, 0).pack(encoder)
+        data += encoder.command_ack_encode(400, 0).pack(encoder)
+
+    return bytes(data)
+
+
+class TestFrameFilter:
+    """
+    Only frames of the accepted types are decoded.
+    """
+
+    def test_accepted_types(self, stream: bytes) -> None:
+        """
+        Accepted types are decoded in order across chunks, others are skipped.
+        """
+        # Setup
+        incoming = frame_filter.FrameFilter(["ATTITUDE"])
+
+        # Run
+        messages = []
+        for i in range(0, len(stream), CHUNK_SIZE):
+            messages += incoming.feed(stream[i : i + CHUNK_SIZE])
+
+        # Test
+        assert [message.get_type() for message in messages] == ["ATTITUDE"] * MESSAGE_COUNT
+        assert [message.time_boot_ms for message in messages] == list(range(MESSAGE_COUNT))
+        assert incoming.accepted_count == MESSAGE_COUNT
+        assert incoming.skipped_count == MESSAGE_COUNT
+        assert incoming.bad_frame_count == 0
+
+    def test_per_consumer(self, stream: bytes) -> None:
+        """
+        Each filter decodes its own types from the same stream.
+        """
+        # Setup
+        attitude_filter = frame_filter.FrameFilter(["ATTITUDE"])
+        ack_filter = frame_filter.FrameFilter(["COMMAND_ACK"])
+        nothing_filter = frame_filter.FrameFilter([])
+
+        # Run
+        attitudes = attitude_filter.feed(stream)
+        acks = ack_filter.feed(stream)
+        nothing = nothing_filter.feed(stream)
+
+        # Test
+        assert len(attitudes) == MESSAGE_COUNT
+        assert [message.command for message in acks] == [400] * MESSAGE_COUNT
+        assert len(nothing) == 0
+        assert nothing_filter.skipped_count == MESSAGE_COUNT * 2
+
+    def test_checksum_only_accepted(self, stream: bytes) -> None:
+        """
+        A corrupted accepted frame is dropped and resynchronized,
+        a corrupted skipped frame is not even checked.
+        """
+        # Setup
+        attitude_size = bulk_decoder.frame_size(stream, 0)
+        ack_size = bulk_decoder.frame_size(stream, attitude_size)
+        corrupted = bytearray(stream)
+        # Payload of the first attitude, checksum of the first acknowledgement
+        corrupted[attitude_size - 5] ^= 0xFF
+        corrupted[attitude_size + ack_size - 1] ^= 0xFF
+        incoming = frame_filter.FrameFilter(["ATTITUDE"])
+
+        # Run
+        messages = incoming.feed(bytes(corrupted))
+
+        # Test
+        assert [message.time_boot_ms for message in messages] == list(range(1, MESSAGE_COUNT))
+        assert incoming.bad_frame_count == 1
+        assert incoming.skipped_count == MESSAGE_COUNT
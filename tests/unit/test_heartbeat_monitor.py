@@ -0,0 +1,95 @@
+"""
+Test connection state from heartbeat arrival times.
+"""
+
+import pytest
+
+from modules.heartbeat import heartbeat_monitor
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+PERIOD = 1.0  # seconds
+DISCONNECT_THRESHOLD = 5
+
+
+@pytest.fixture
+def monitor() -> heartbeat_monitor.HeartbeatMonitor:
+    """
+    Monitor started at time 0, with the thresholds of the mock drone.
+    """
+    return heartbeat_monitor.HeartbeatMonitor(PERIOD, DISCONNECT_THRESHOLD, 0.0)
+
+
+class TestHeartbeatMonitor:
+    """
+    Only changes of state are reported, once the threshold is passed.
+    """
+
+    def test_transitions(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        Connects on the first heartbeat and disconnects after the threshold without one.
+        """
+        # Setup
+        states = []
+
+        # Run
+        for now in [0.5, 1.0, 2.0]:
+            monitor.record_heartbeat(now)
+            states.append(monitor.update(now))
+
+        # Dropped heartbeats within the threshold
+        states.append(monitor.update(6.9))
+        monitor.record_heartbeat(6.95)
+        states.append(monitor.update(6.95))
+        states.append(monitor.update(11.9))
+        states.append(monitor.update(12.0))
+        states.append(monitor.update(20.0))
+        monitor.record_heartbeat(20.5)
+        states.append(monitor.update(20.5))
+
+        # Test
+        assert states == [
+            "Connected",
+            None,
+            None,
+            None,
+            None,
+            None,
+            "Disconnected",
+            None,
+            "Connected",
+        ]
+
+    def test_no_heartbeat(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        Disconnects after the threshold from starting if no heartbeat arrives.
+        """
+        # Run
+        early = monitor.update(4.9)
+        late = monitor.update(5.0)
+
+        # Test
+        assert early is None
+        assert late == "Disconnected"
+        assert monitor.get_missed_count(5.0) == DISCONNECT_THRESHOLD
+
+    def test_timeout(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        Waits at most a period, and no later than the disconnect.
+        """
+        # Setup
+        monitor.record_heartbeat(1.0)
+        monitor.update(1.0)
+
+        # Run
+        timeouts = [monitor.get_timeout(now) for now in [1.0, 5.5, 6.5]]
+        monitor.update(6.5)
+        disconnected_timeout = monitor.get_timeout(6.5)
+
+        # Test
+        assert timeouts == [pytest.approx(PERIOD), pytest.approx(0.5), 0.0]
+        assert disconnected_timeout == pytest.approx(PERIOD)
@@ -0,0 +1,117 @@
+"""
+Test level-gated logging with deferred formatting.
+"""
+
+import logging
+
+import pytest
+
+from utilities.workers import lazy_logger
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class RecordingLogger:
+    """
+    Records messages like `Logger` would log them.
+    """
+
+    def __init__(self, level: int) -> None:
+        self.logger = logging.getLogger(f"test_lazy_logger_{level}")
+        self.logger.setLevel(level)
+        self.messages = []
+
+    def debug(self, message: str, log_with_frame_info: bool = True) -> None:
+        """
+        Records at debug level, only if enabled like `logging`.
+        """
+        assert not log_with_frame_info
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.messages.append(("debug", message))
+
+    def info(self, message: str, log_with_frame_info: bool = True) -> None:
+        """
+        Records at info level, only if enabled like `logging`.
+        """
+        assert not log_with_frame_info
+        if self.logger.isEnabledFor(logging.INFO):
+            self.messages.append(("info", message))
+
+
+class CountingArgument:
+    """
+    Counts how many times it is formatted.
+    """
+
+    def __init__(self) -> None:
+        self.format_count = 0
+
+    def __str__(self) -> str:
+        self.format_count += 1
+        return "argument"
+
+
+@pytest.fixture
+def info_logger() -> RecordingLogger:
+    """
+    Logger with debug disabled.
+    """
+    return RecordingLogger(logging.INFO)
+
+
+class TestLazyLogger:
+    """
+    Messages are formatted only at enabled levels.
+    """
+
+    def test_is_enabled(self, info_logger: RecordingLogger) -> None:
+        """
+        Levels follow the underlying logger.
+        """
+        # Setup
+        lazy = lazy_logger.LazyLogger(info_logger)
+
+        # Run
+        debug_enabled = lazy.is_enabled(logging.DEBUG)
+        info_enabled = lazy.is_enabled(logging.INFO)
+
+        # Test
+        assert not debug_enabled
+        assert info_enabled
+
+    def test_disabled_level_not_formatted(self, info_logger: RecordingLogger) -> None:
+        """
+        Arguments at a disabled level are never formatted or passed on.
+        """
+        # Setup
+        lazy = lazy_logger.LazyLogger(info_logger)
+        argument = CountingArgument()
+
+        # Run
+        lazy.debug("Value: %s", argument)
+
+        # Test
+        assert argument.format_count == 0
+        assert len(info_logger.messages) == 0
+
+    def test_enabled_level_formatted(self, info_logger: RecordingLogger) -> None:
+        """
+        Arguments are formatted, with the frame info of the caller when requested.
+        """
+        # Setup
+        lazy = lazy_logger.LazyLogger(info_logger)
+
+        # Run
+        lazy.info("Skipped %d stale telemetry", 3)
+        lazy.info("%s", "value", log_with_frame_info=False)
+
+        # Test
+        assert len(info_logger.messages) == 2
+        level, message = info_logger.messages[0]
+        assert level == "info"
+        assert message.startswith(f"[{__file__} | test_enabled_level_formatted | ")
+        assert message.endswith("] Skipped 3 stale telemetry")
+        assert info_logger.messages[1] == ("info", "value")
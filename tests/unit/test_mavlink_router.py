@@ -0,0 +1,190 @@
+"""
+Test routing MAVLink messages between the connection and workers.
+"""
+
+import io
+import multiprocessing as mp
+
+import pytest
+from pymavlink import mavutil
+
+from modules.router import mavlink_router
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+QUEUE_SIZE = 4
+SEND_COUNT = 5
+JOIN_TIMEOUT = 5  # seconds
+
+
+class BufferConnection:
+    """
+    Connection whose sends are written to a buffer.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+        self.mav = mavutil.mavlink.MAVLink(self.buffer, 255, 0)
+
+
+def decode(data: bytes) -> "list[mavutil.mavlink.MAVLink_message]":
+    """
+    Parses the frames written to a buffer.
+    """
+    return mavutil.mavlink.MAVLink(None).parse_buffer(data) or []
+
+
+def send_heartbeats(connection: mavlink_router.RoutedConnection) -> None:
+    """
+    Sends from another process.
+    """
+    for _ in range(SEND_COUNT):
+        connection.mav.heartbeat_send(
+            mavutil.mavlink.MAV_TYPE_GCS, mavutil.mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
+        )
+
+
+@pytest.fixture
+def encoder() -> mavutil.mavlink.MAVLink:
+    """
+    Encoder for messages from the drone.
+    """
+    return mavutil.mavlink.MAVLink(None, 1, 1)
+
+
+class TestRoute:
+    """
+    Each message goes to every subscriber of its type, and only to them.
+    """
+
+    def test_fan_out(self, encoder: mavutil.mavlink.MAVLink) -> None:
+        """
+        Subscribers receive their types in order.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter()
+        heartbeat_connection = router.subscribe(["HEARTBEAT"])
+        telemetry_connection = router.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"])
+        monitor_connection = router.subscribe(["HEARTBEAT", "ATTITUDE"])
+
+        heartbeat = encoder.heartbeat_encode(2, 3, 0, 0, 4)
+        attitude = encoder.attitude_encode(10, 0.1, 0.2, 0.3, 0, 0, 0)
+        position = encoder.local_position_ned_encode(20, 1, 2, 3, 0, 0, 0)
+
+        # Run
+        delivered = [router.route(message) for message in [heartbeat, attitude, position]]
+        unrouted = router.route(encoder.command_ack_encode(0, 0))
+
+        # Test
+        assert delivered == [2, 2, 1]
+        assert unrouted == 0
+        assert heartbeat_connection.recv_match().get_type() == "HEARTBEAT"
+        assert heartbeat_connection.recv_match() is None
+        assert telemetry_connection.recv_match().time_boot_ms == 10
+        assert telemetry_connection.recv_match().time_boot_ms == 20
+        assert monitor_connection.recv_match().get_type() == "HEARTBEAT"
+        assert monitor_connection.recv_match().get_type() == "ATTITUDE"
+
+    def test_message_types(self) -> None:
+        """
+        The types worth decoding are those with a subscriber.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter()
+        router.subscribe(["HEARTBEAT"])
+        router.subscribe([])
+        router.subscribe(["ATTITUDE", "HEARTBEAT"])
+
+        # Run
+        message_types = router.get_message_types()
+
+        # Test
+        assert sorted(message_types) == ["ATTITUDE", "HEARTBEAT"]
+
+    def test_type_filter(self, encoder: mavutil.mavlink.MAVLink) -> None:
+        """
+        Asking for some subscribed types discards the others.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter()
+        connection = router.subscribe(["ATTITUDE", "LOCAL_POSITION_NED"])
+        router.route(encoder.attitude_encode(10, 0, 0, 0, 0, 0, 0))
+        router.route(encoder.local_position_ned_encode(20, 0, 0, 0, 0, 0, 0))
+
+        # Run
+        message = connection.recv_match(type="LOCAL_POSITION_NED", blocking=True, timeout=0.1)
+
+        # Test
+        assert message.time_boot_ms == 20
+        assert connection.recv_match() is None
+
+    def test_slow_subscriber(self, encoder: mavutil.mavlink.MAVLink) -> None:
+        """
+        A full subscriber loses its oldest messages instead of stalling the router.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter()
+        connection = router.subscribe(["ATTITUDE"], QUEUE_SIZE)
+
+        # Run
+        for i in range(QUEUE_SIZE * 2):
+            router.route(encoder.attitude_encode(i, 0, 0, 0, 0, 0, 0))
+
+        # Test
+        times = [connection.recv_match().time_boot_ms for _ in range(QUEUE_SIZE)]
+        assert times == list(range(QUEUE_SIZE, QUEUE_SIZE * 2))
+
+    def test_shutdown(self, encoder: mavutil.mavlink.MAVLink) -> None:
+        """
+        Receives return None and sends are dropped once the router stops.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter()
+        connection = router.subscribe(["HEARTBEAT"])
+
+        # Run
+        router.shutdown()
+
+        # Test
+        assert connection.recv_match(blocking=True) is None
+        connection.mav.heartbeat_send(0, 0, 0, 0, 0)
+        assert router.send_pending(BufferConnection()) == 0
+        assert router.route(encoder.heartbeat_encode(2, 3, 0, 0, 4)) == 1
+
+
+class TestSend:
+    """
+    Sends of all subscriptions are written by the router in order.
+    """
+
+    def test_serialized(self) -> None:
+        """
+        Messages from several processes are written with consecutive sequence numbers.
+        """
+        # Setup
+        router = mavlink_router.MavlinkRouter(SEND_COUNT * 2)
+        connections = [router.subscribe([]), router.subscribe(["COMMAND_ACK"])]
+        workers = [
+            mp.Process(target=send_heartbeats, args=(connection,)) for connection in connections
+        ]
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join(JOIN_TIMEOUT)
+
+        output = BufferConnection()
+
+        # Run
+        count = router.send_pending(output)
+
+        # Test
+        messages = decode(output.buffer.getvalue())
+        assert count == SEND_COUNT * 2
+        assert [message.get_type() for message in messages] == ["HEARTBEAT"] * count
+        assert [message.get_seq() for message in messages] == list(range(count))
+        assert all(message.get_srcSystem() == 255 for message in messages)
@@ -0,0 +1,221 @@
+"""
+Test the overflow policies of bounded queues.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 3
+ITEM_COUNT = 10
+SAMPLE_INTERVAL = 4
+PUT_TIMEOUT = 0.1  # seconds
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.managers.SyncManager:  # type: ignore
+    """
+    Manager for the manager backend.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture(
+    params=[
+        queue_proxy_wrapper.QueueBackend.MANAGER,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+    ]
+)
+def backend(request: pytest.FixtureRequest) -> queue_proxy_wrapper.QueueBackend:
+    """
+    Each bounded backend.
+    """
+    return request.param
+
+
+def create_queue(
+    mp_manager: mp.managers.SyncManager,
+    backend: queue_proxy_wrapper.QueueBackend,
+    overflow_policy: queue_proxy_wrapper.OverflowPolicy,
+    **kwargs: object,
+) -> queue_proxy_wrapper.QueueProxyWrapper:
+    """
+    Bounded queue with the overflow policy.
+    """
+    return queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        QUEUE_MAX_SIZE,
+        backend,
+        overflow_policy=overflow_policy,
+        **kwargs,  # type: ignore
+    )
+
+
+def get_all(input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> "list[object]":
+    """
+    Removes and returns the items in the queue.
+    """
+    items = []
+    try:
+        while True:
+            items.append(input_queue.get(False))
+    except queue.Empty:
+        pass
+
+    return items
+
+
+class TestOverflowPolicy:
+    """
+    Full queues never stall the producer except with `OverflowPolicy.BLOCK` .
+    """
+
+    def test_block_timeout(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        Blocking puts wait for the per queue timeout, then raise.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager, backend, queue_proxy_wrapper.OverflowPolicy.BLOCK, put_timeout=PUT_TIMEOUT
+        )
+        for i in range(QUEUE_MAX_SIZE):
+            output_queue.put(i)
+
+        # Run
+        start = time.monotonic()
+        with pytest.raises(queue.Full):
+            output_queue.put(QUEUE_MAX_SIZE)
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert elapsed >= PUT_TIMEOUT * 0.9
+        assert get_all(output_queue) == list(range(QUEUE_MAX_SIZE))
+        assert output_queue.get_drop_counts() == {"newest": 0, "oldest": 0}
+
+    def test_drop_oldest(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        The newest items are kept.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager, backend, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+        )
+
+        # Run
+        for i in range(ITEM_COUNT):
+            output_queue.put(i)
+
+        # Test
+        assert get_all(output_queue) == list(range(ITEM_COUNT - QUEUE_MAX_SIZE, ITEM_COUNT))
+        assert output_queue.get_drop_counts() == {
+            "newest": 0,
+            "oldest": ITEM_COUNT - QUEUE_MAX_SIZE,
+        }
+
+    def test_drop_newest(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        The oldest items are kept.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager, backend, queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST
+        )
+
+        # Run
+        for i in range(ITEM_COUNT):
+            output_queue.put(i)
+
+        # Test
+        assert get_all(output_queue) == list(range(QUEUE_MAX_SIZE))
+        assert output_queue.get_drop_counts() == {
+            "newest": ITEM_COUNT - QUEUE_MAX_SIZE,
+            "oldest": 0,
+        }
+
+    def test_sample(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        Every Nth overflowing item replaces the oldest item.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager,
+            backend,
+            queue_proxy_wrapper.OverflowPolicy.SAMPLE,
+            sample_interval=SAMPLE_INTERVAL,
+        )
+
+        # Run
+        for i in range(ITEM_COUNT):
+            output_queue.put(i)
+
+        # Test
+        # 7 overflowing items: 3 to 9, the 4th overflowing item is 6
+        assert get_all(output_queue) == [1, 2, 6]
+        assert output_queue.get_drop_counts() == {"newest": 6, "oldest": 1}
+
+    def test_drops_recorded_in_statistics(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        Dropped items are not counted towards the depth.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager,
+            backend,
+            queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+            statistics_name="overflow",
+        )
+
+        # Run
+        for i in range(ITEM_COUNT):
+            output_queue.put(i)
+
+        sample = output_queue.statistics.sample()  # type: ignore
+
+        # Test
+        assert sample.put_count == ITEM_COUNT
+        assert sample.dropped_oldest_count == ITEM_COUNT - QUEUE_MAX_SIZE
+        assert sample.dropped_newest_count == 0
+        assert sample.depth == QUEUE_MAX_SIZE
+
+    def test_drops_counted_across_processes(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        Drop counters are shared by all producers.
+        """
+        # Setup
+        output_queue = create_queue(
+            mp_manager, backend, queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST
+        )
+        for i in range(QUEUE_MAX_SIZE):
+            output_queue.put(i)
+
+        # Run
+        worker = mp.Process(target=output_queue.put, args=(QUEUE_MAX_SIZE,))
+        worker.start()
+        worker.join()
+
+        # Test
+        assert output_queue.get_drop_counts() == {"newest": 1, "oldest": 0}
@@ -0,0 +1,326 @@
+"""
+Test the queue wrapper.
+"""
+
+import queue
+import time
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 2
+MAX_BATCH_SIZE = 3
+MAX_HOLD_TIME = 0.05  # seconds
+SLOT_SIZE = 1024  # bytes
+# Two fit in a batch in a slot, one fits in a slot but not in a batch
+LARGE_ITEM_SIZE = 300  # bytes
+HUGE_ITEM_SIZE = 900  # bytes
+
+
+class CountedItem:
+    """
+    Counts how many times items of this class are pickled.
+    """
+
+    pickle_count = 0
+
+    def __reduce__(self) -> "tuple":
+        CountedItem.pickle_count += 1
+        return CountedItem, ()
+
+
+@pytest.fixture()
+def batching_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue with adaptive batching.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        QUEUE_MAX_SIZE,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        adaptive_batching=True,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_hold_time=MAX_HOLD_TIME,
+    )
+    yield wrapper  # type: ignore
+
+
+@pytest.fixture()
+def plain_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue without batching.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        QUEUE_MAX_SIZE,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        max_batch_size=MAX_BATCH_SIZE,
+    )
+    yield wrapper  # type: ignore
+
+
+@pytest.fixture()
+def small_slot_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue with adaptive batching and slots that fit few large items.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        QUEUE_MAX_SIZE,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        adaptive_batching=True,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_hold_time=MAX_HOLD_TIME,
+        slot_size=SLOT_SIZE,
+    )
+    yield wrapper  # type: ignore
+
+
+class TestBatching:
+    """
+    put_many() and get_many() .
+    """
+
+    def test_put_many_single_queue_item(
+        self, plain_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        A batch occupies one queue slot and is unpacked in order.
+        """
+        # Setup
+        expected = [1, 2, 3]
+
+        # Run
+        plain_queue.put_many(expected)
+
+        # Test
+        assert plain_queue.queue.qsize() == 1
+        assert plain_queue.get_many(10, timeout=0.0) == expected
+
+    def test_put_many_splits_batches(
+        self, plain_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Batches are no larger than the maximum batch size.
+        """
+        # Setup
+        expected = [1, 2, 3, 4]
+
+        # Run
+        plain_queue.put_many(expected)
+
+        # Test
+        assert plain_queue.queue.qsize() == 2
+        assert [plain_queue.get() for _ in expected] == expected
+
+    def test_put_many_fits_slot(
+        self, small_slot_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Batches are split before they outgrow a slot, an item too large to batch is sent alone.
+        """
+        # Setup
+        expected = [bytes([i]) * LARGE_ITEM_SIZE for i in range(MAX_BATCH_SIZE)]
+        huge_item = bytes(HUGE_ITEM_SIZE)
+
+        # Run
+        small_slot_queue.put_many(expected)
+        first_size = small_slot_queue.queue.qsize()
+        first = small_slot_queue.get_many(10, timeout=0.0)
+        small_slot_queue.put_many([huge_item, expected[0]])
+        second_size = small_slot_queue.queue.qsize()
+        second = small_slot_queue.get_many(10, timeout=0.0)
+
+        # Test
+        assert first_size == 2
+        assert first == expected
+        assert second_size == 2
+        assert second == [huge_item, expected[0]]
+
+    def test_get_many_limit(self, plain_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Remaining items of a batch are kept for the next get.
+        """
+        # Setup
+        plain_queue.put_many([1, 2, 3])
+
+        # Run
+        first = plain_queue.get_many(2, timeout=0.0)
+        second = plain_queue.get_many(2, timeout=0.0)
+
+        # Test
+        assert first == [1, 2]
+        assert second == [3]
+
+    def test_get_many_timeout(self, plain_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Nothing available.
+        """
+        # Test
+        assert plain_queue.get_many(5, timeout=0.01) == []
+        assert plain_queue.get_many(0) == []
+
+
+class TestAdaptiveBatching:
+    """
+    put() with adaptive batching.
+    """
+
+    def test_single_when_keeping_up(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Items are sent individually while the queue has space.
+        """
+        # Run
+        batching_queue.put(1)
+        item = batching_queue.queue.get()
+
+        # Test
+        assert item == 1
+
+    def test_coalesce_when_lagging(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Items are held while the queue is full and then sent together.
+        """
+        # Setup
+        expected = list(range(QUEUE_MAX_SIZE + MAX_BATCH_SIZE - 1))
+
+        # Run
+        for item in expected:
+            batching_queue.put(item)
+
+        # Queue is full so the remaining items are held
+        held_count = batching_queue.queue.qsize()
+        first = [batching_queue.get(), batching_queue.get()]
+        # Space is available so all held items are sent as one
+        batching_queue.put(expected[-1] + 1)
+        batch = batching_queue.queue.get()
+
+        # Test
+        assert held_count == QUEUE_MAX_SIZE
+        assert first == expected[:QUEUE_MAX_SIZE]
+        assert isinstance(batch, queue_proxy_wrapper.ItemBatch)
+        assert batch.unpack() == expected[QUEUE_MAX_SIZE:] + [expected[-1] + 1]
+
+    def test_block_when_batch_full(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        A full batch blocks like a normal put, the last item is not kept on timeout.
+        """
+        # Setup
+        for item in range(QUEUE_MAX_SIZE + MAX_BATCH_SIZE - 1):
+            batching_queue.put(item)
+
+        # Test
+        with pytest.raises(queue.Full):
+            batching_queue.put(-1, timeout=0.01)
+        assert batching_queue._QueueProxyWrapper__pending_count == MAX_BATCH_SIZE - 1
+
+    def test_flush(self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Held items are sent on flush.
+        """
+        # Setup
+        for item in range(QUEUE_MAX_SIZE + 1):
+            batching_queue.put(item)
+        batching_queue.get()
+
+        # Run
+        batching_queue.flush()
+
+        # Test
+        assert batching_queue.get_many(10, timeout=0.0) == [1, 2]
+
+    def test_poll_after_hold_time(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Held items of a producer that stopped putting are sent by poll once held long enough.
+        """
+        # Setup
+        for item in range(QUEUE_MAX_SIZE + 1):
+            batching_queue.put(item)
+        batching_queue.get()
+
+        # Run
+        batching_queue.poll()
+        early_size = batching_queue.queue.qsize()
+        early_timeout = batching_queue.get_hold_timeout()
+        time.sleep(MAX_HOLD_TIME)
+        batching_queue.poll()
+
+        # Test
+        assert early_size == QUEUE_MAX_SIZE - 1
+        assert 0.0 < early_timeout <= MAX_HOLD_TIME
+        assert batching_queue.get_hold_timeout() is None
+        assert batching_queue.get_many(10, timeout=0.0) == [1, 2]
+
+    def test_held_batch_fits_slot(
+        self, small_slot_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Held items are sent before the next item makes their batch outgrow a slot.
+        """
+        # Setup
+        large_items = [bytes([i]) * LARGE_ITEM_SIZE for i in range(MAX_BATCH_SIZE)]
+        for item in range(QUEUE_MAX_SIZE):
+            small_slot_queue.put(item)
+        small_slot_queue.put(large_items[0])
+        small_slot_queue.put(large_items[1])
+        small_slot_queue.get_many(QUEUE_MAX_SIZE, timeout=0.0)
+
+        # Run
+        small_slot_queue.put(large_items[2])
+        small_slot_queue.flush()
+        batch = small_slot_queue.queue.get()
+
+        # Test
+        assert isinstance(batch, queue_proxy_wrapper.ItemBatch)
+        assert batch.unpack() == large_items[:2]
+        assert small_slot_queue.get_many(10, timeout=0.0) == large_items[2:]
+
+    def test_items_pickled_once(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Coalescing more items does not pickle the earlier ones again.
+        """
+        # Setup
+        for item in range(QUEUE_MAX_SIZE):
+            batching_queue.put(item)
+        CountedItem.pickle_count = 0
+
+        # Run
+        for _ in range(MAX_BATCH_SIZE - 1):
+            batching_queue.put(CountedItem())
+
+        # Test
+        # Once each when held, and the first by the put that found the queue full
+        assert CountedItem.pickle_count == (MAX_BATCH_SIZE - 1) + 1
+
+    def test_shutdown_counts_held_items(
+        self, batching_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Held items that do not fit when the queue is shut down are counted as dropped.
+        """
+        # Setup
+        for item in range(QUEUE_MAX_SIZE + 2):
+            batching_queue.put(item)
+
+        # Run
+        batching_queue.shutdown()
+
+        # Test
+        assert batching_queue.get_drop_counts() == {"newest": 2, "oldest": 0}
@@ -0,0 +1,161 @@
+"""
+Test waiting on several queues.
+"""
+
+import multiprocessing as mp
+import time
+
+import pytest
+
+from utilities.workers import queue_notifier
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 2
+PUT_DELAY = 0.2  # seconds
+SELECT_TIMEOUT = 0.1  # seconds
+JOIN_TIMEOUT = 5  # seconds
+WAKE_UP_LIMIT = 0.1  # seconds
+
+
+def put_after_delay(output_queue: queue_proxy_wrapper.QueueProxyWrapper, item: object) -> None:
+    """
+    Puts an item after the main process has started waiting.
+    """
+    time.sleep(PUT_DELAY)
+    output_queue.put(item)
+
+
+def shutdown_after_delay(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Shuts down the queue after the main process has started waiting.
+    """
+    time.sleep(PUT_DELAY)
+    output_queue.shutdown()
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.managers.SyncManager:  # type: ignore
+    """
+    Manager for the manager backend.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture
+def queues(mp_manager: mp.managers.SyncManager) -> "list[queue_proxy_wrapper.QueueProxyWrapper]":
+    """
+    One queue of each backend sharing a notifier.
+    """
+    notifier = queue_notifier.QueueNotifier()
+    return [
+        queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, QUEUE_MAX_SIZE, backend, notifier=notifier
+        )
+        for backend in [
+            queue_proxy_wrapper.QueueBackend.MANAGER,
+            queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            queue_proxy_wrapper.QueueBackend.CONFLATING,
+        ]
+    ]
+
+
+class TestSelect:
+    """
+    `select()` returns the ready queues as soon as any is ready.
+    """
+
+    def test_timeout(self, queues: "list[queue_proxy_wrapper.QueueProxyWrapper]") -> None:
+        """
+        Nothing is ready.
+        """
+        # Run
+        start = time.monotonic()
+        ready_queues = queue_proxy_wrapper.select(queues, SELECT_TIMEOUT)
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert ready_queues == []
+        assert elapsed >= SELECT_TIMEOUT * 0.9
+
+    def test_ready_queues(self, queues: "list[queue_proxy_wrapper.QueueProxyWrapper]") -> None:
+        """
+        Only queues with items are returned, until the items are taken.
+        """
+        # Setup
+        queues[0].put(1)
+        queues[2].put(2)
+
+        # Run
+        ready_queues = queue_proxy_wrapper.select(queues, 0.0)
+
+        # Test
+        assert ready_queues == [queues[0], queues[2]]
+        assert queues[0].get() == 1
+        assert queues[2].get() == 2
+        assert queue_proxy_wrapper.select(queues, 0.0) == []
+
+    @pytest.mark.parametrize("index", [0, 1, 2])
+    def test_wakes_on_put(
+        self, queues: "list[queue_proxy_wrapper.QueueProxyWrapper]", index: int
+    ) -> None:
+        """
+        A put by another process wakes up the wait.
+        """
+        # Setup
+        worker = mp.Process(target=put_after_delay, args=(queues[index], index))
+        worker.start()
+
+        # Run
+        start = time.monotonic()
+        ready_queues = queue_proxy_wrapper.select(queues)
+        elapsed = time.monotonic() - start
+
+        # Test
+        worker.join(JOIN_TIMEOUT)
+        assert ready_queues == [queues[index]]
+        assert elapsed < PUT_DELAY + WAKE_UP_LIMIT
+        assert queues[index].get() == index
+
+    def test_wakes_on_shutdown(self, queues: "list[queue_proxy_wrapper.QueueProxyWrapper]") -> None:
+        """
+        Shut down queues are ready.
+        """
+        # Setup
+        worker = mp.Process(target=shutdown_after_delay, args=(queues[1],))
+        worker.start()
+
+        # Run
+        ready_queues = queue_proxy_wrapper.select(queues)
+
+        # Test
+        worker.join(JOIN_TIMEOUT)
+        assert ready_queues == [queues[1]]
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            queues[1].get(False)
+
+    def test_notifier_required(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        Queues without a shared notifier cannot be waited on together.
+        """
+        # Setup
+        first_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, notifier=queue_notifier.QueueNotifier()
+        )
+        second_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, notifier=queue_notifier.QueueNotifier()
+        )
+
+        # Test
+        with pytest.raises(ValueError):
+            queue_proxy_wrapper.select([first_queue, second_queue])
+
+        with pytest.raises(ValueError):
+            queue_proxy_wrapper.select([queue_proxy_wrapper.QueueProxyWrapper(mp_manager)])
@@ -0,0 +1,259 @@
+"""
+Test shutting down queues.
+"""
+
+import multiprocessing as mp
+import time
+
+import pytest
+
+from utilities.workers import manager_queue
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 2
+BLOCK_DELAY = 0.3  # seconds
+JOIN_TIMEOUT = 5  # seconds
+WAKE_UP_LIMIT = 0.1  # seconds
+ITEM_COUNT = 10
+
+
+def get_until_shut_down(input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Blocks on an empty queue.
+    """
+    with pytest.raises(queue_proxy_wrapper.ShutDown):
+        input_queue.get()
+
+
+def put_until_shut_down(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Blocks on a full queue.
+    """
+    with pytest.raises(queue_proxy_wrapper.ShutDown):
+        while True:
+            output_queue.put(0)
+
+
+def put_then_close(
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper, first: int, delay: float
+) -> None:
+    """
+    Puts consecutive items after the delay, then ends its stream.
+    """
+    time.sleep(delay)
+    for item in range(first, first + ITEM_COUNT):
+        output_queue.put(item)
+
+    output_queue.close()
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.managers.SyncManager:  # type: ignore
+    """
+    Manager for the manager backend.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture(
+    params=[
+        queue_proxy_wrapper.QueueBackend.MANAGER,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        queue_proxy_wrapper.QueueBackend.CONFLATING,
+    ]
+)
+def any_queue(
+    request: pytest.FixtureRequest, mp_manager: mp.managers.SyncManager
+) -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue of each backend.
+    """
+    yield queue_proxy_wrapper.QueueProxyWrapper(  # type: ignore
+        mp_manager, QUEUE_MAX_SIZE, request.param
+    )
+
+
+class TestShutdown:
+    """
+    Shut down behaviour matches `queue.Queue.shutdown()` .
+    """
+
+    def test_items_delivered(self, any_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Items put before the shut down are still delivered, then gets raise.
+        """
+        # Setup
+        any_queue.put(1)
+
+        # Run
+        any_queue.shutdown()
+
+        # Test
+        assert any_queue.is_shut_down()
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            any_queue.put(2)
+        assert any_queue.get() == 1
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            any_queue.get()
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            any_queue.get_many(5, timeout=0.0)
+
+    def test_immediate(self, any_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Items are discarded.
+        """
+        # Setup
+        any_queue.put(1)
+
+        # Run
+        any_queue.shutdown(immediate=True)
+
+        # Test
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            any_queue.get(False)
+
+    def test_wakes_consumers(self, any_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Consumers blocked on an empty queue all return at once.
+        """
+        # Setup
+        consumers = [mp.Process(target=get_until_shut_down, args=(any_queue,)) for _ in range(3)]
+        for consumer in consumers:
+            consumer.start()
+        time.sleep(BLOCK_DELAY)
+
+        # Run
+        start = time.perf_counter()
+        any_queue.shutdown()
+        for consumer in consumers:
+            consumer.join(JOIN_TIMEOUT)
+        elapsed = time.perf_counter() - start
+
+        # Test
+        assert [consumer.exitcode for consumer in consumers] == [0] * len(consumers)
+        assert elapsed < WAKE_UP_LIMIT
+
+    @pytest.mark.parametrize("immediate_list", [[False], [True], [False, True]])
+    def test_manager_consumers_not_polling(
+        self,
+        mp_manager: mp.managers.SyncManager,
+        monkeypatch: pytest.MonkeyPatch,
+        immediate_list: "list[bool]",
+    ) -> None:
+        """
+        Consumers blocked on the manager are woken up by the shut down instead of checking,
+        also when a later immediate shut down discards the queue.
+        """
+        # Setup
+        monkeypatch.setattr(manager_queue.ManagerQueue, "SHUTDOWN_CHECK_PERIOD", 60)
+        input_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, QUEUE_MAX_SIZE, queue_proxy_wrapper.QueueBackend.MANAGER
+        )
+        consumers = [mp.Process(target=get_until_shut_down, args=(input_queue,)) for _ in range(3)]
+        for consumer in consumers:
+            consumer.start()
+        time.sleep(BLOCK_DELAY)
+
+        # Run
+        start = time.perf_counter()
+        for immediate in immediate_list:
+            input_queue.shutdown(immediate)
+        for consumer in consumers:
+            consumer.join(JOIN_TIMEOUT)
+        elapsed = time.perf_counter() - start
+
+        # Test
+        assert [consumer.exitcode for consumer in consumers] == [0] * len(consumers)
+        assert elapsed < WAKE_UP_LIMIT
+        with pytest.raises(queue_proxy_wrapper.ShutDown):
+            input_queue.get(False)
+
+    @pytest.mark.parametrize("maxsize", [1, 100])
+    def test_wakes_producers(self, mp_manager: mp.managers.SyncManager, maxsize: int) -> None:
+        """
+        Producers blocked on a full queue all return at once, regardless of the size.
+        """
+        # Setup
+        output_queues = [
+            queue_proxy_wrapper.QueueProxyWrapper(mp_manager, maxsize, backend)
+            for backend in [
+                queue_proxy_wrapper.QueueBackend.MANAGER,
+                queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            ]
+        ]
+        producers = [
+            mp.Process(target=put_until_shut_down, args=(output_queue,))
+            for output_queue in output_queues
+        ]
+        for producer in producers:
+            producer.start()
+        time.sleep(BLOCK_DELAY)
+
+        # Run
+        start = time.perf_counter()
+        for output_queue in output_queues:
+            output_queue.shutdown(immediate=True)
+        for producer in producers:
+            producer.join(JOIN_TIMEOUT)
+        elapsed = time.perf_counter() - start
+
+        # Test
+        assert [producer.exitcode for producer in producers] == [0] * len(producers)
+        assert elapsed < WAKE_UP_LIMIT
+
+    def test_drain_until_shut_down(self, any_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Remaining items are returned as soon as the queue is shut down.
+        """
+        # Setup
+        any_queue.put(1)
+        any_queue.shutdown()
+
+        # Run
+        start = time.perf_counter()
+        items = any_queue.drain_until_shut_down(JOIN_TIMEOUT)
+        elapsed = time.perf_counter() - start
+
+        # Test
+        assert items == [1]
+        assert elapsed < WAKE_UP_LIMIT
+
+    @pytest.mark.parametrize(
+        "backend",
+        [queue_proxy_wrapper.QueueBackend.MANAGER, queue_proxy_wrapper.QueueBackend.SHARED_MEMORY],
+    )
+    def test_close_by_every_producer(
+        self, mp_manager: mp.managers.SyncManager, backend: queue_proxy_wrapper.QueueBackend
+    ) -> None:
+        """
+        The queue is shut down once the last of several producers closes it, no item is lost.
+        """
+        # Setup
+        output_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, QUEUE_MAX_SIZE, backend, producer_count=2
+        )
+        producers = [
+            mp.Process(target=put_then_close, args=(output_queue, 0, 0.0)),
+            # Still putting after the first one has closed the queue
+            mp.Process(target=put_then_close, args=(output_queue, ITEM_COUNT, BLOCK_DELAY)),
+        ]
+        for producer in producers:
+            producer.start()
+
+        # Run
+        items = output_queue.drain_until_shut_down(JOIN_TIMEOUT)
+        for producer in producers:
+            producer.join(JOIN_TIMEOUT)
+
+        # Test
+        assert [producer.exitcode for producer in producers] == [0] * len(producers)
+        assert sorted(items) == list(range(2 * ITEM_COUNT))
+        assert output_queue.is_shut_down()
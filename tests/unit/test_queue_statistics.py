@@ -0,0 +1,184 @@
+"""
+Test the queue instrumentation.
+"""
+
+import json
+import multiprocessing as mp
+import pathlib
+import queue
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import queue_statistics
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 2
+ITEM_COUNT = 10
+
+
+def produce(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Puts ITEM_COUNT items.
+    """
+    for i in range(ITEM_COUNT):
+        output_queue.put(i)
+
+
+@pytest.fixture()
+def instrumented_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue with statistics.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        QUEUE_MAX_SIZE,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        statistics_name="test",
+    )
+    yield wrapper  # type: ignore
+
+
+class TestQueueStatistics:
+    """
+    Counters, histograms, and dumps.
+    """
+
+    def test_disabled(self) -> None:
+        """
+        No statistics unless named.
+        """
+        # Setup
+        plain_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            None, QUEUE_MAX_SIZE, queue_proxy_wrapper.QueueBackend.SHARED_MEMORY
+        )
+
+        # Run
+        plain_queue.put(1)
+
+        # Test
+        assert plain_queue.statistics is None
+        assert plain_queue.queue.get() == 1
+
+    def test_depth_and_dwell(
+        self, instrumented_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Depth follows puts and gets, every item has a dwell time.
+        """
+        # Run
+        instrumented_queue.put_many([1, 2, 3])
+        instrumented_queue.put(4)
+        high_sample = instrumented_queue.statistics.sample()
+        items = instrumented_queue.get_many(10, timeout=0.0)
+        sample = instrumented_queue.statistics.sample()
+
+        # Test
+        assert items == [1, 2, 3, 4]
+        assert high_sample.depth == 4
+        assert sample.put_count == 4
+        assert sample.get_count == 4
+        assert sample.depth == 0
+        assert sample.high_water_depth == 4
+        assert sample.dwell_count == 2
+        assert sum(sample.histograms["dwell"]) == 2
+        assert sample.blocked_put_count == 0
+        assert sample.waiting_get_count == 0
+
+    def test_blocked_and_waiting(
+        self, instrumented_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Puts on a full queue and gets on an empty queue are timed, even when they give up.
+        """
+        # Setup
+        for i in range(QUEUE_MAX_SIZE):
+            instrumented_queue.put(i)
+
+        # Run
+        with pytest.raises(queue.Full):
+            instrumented_queue.put(-1, timeout=0.01)
+        for _ in range(QUEUE_MAX_SIZE):
+            instrumented_queue.get()
+        with pytest.raises(queue.Empty):
+            instrumented_queue.get(timeout=0.01)
+        sample = instrumented_queue.statistics.sample()
+
+        # Test
+        assert sample.put_count == QUEUE_MAX_SIZE
+        assert sample.blocked_put_count == 1
+        assert sample.blocked_put_time >= 0.01
+        assert sample.waiting_get_count == 1
+        assert sample.waiting_get_time >= 0.01
+        # 10 ms is in the bucket of [8192, 16384) us
+        assert sample.histograms["blocked_put"][14] == 1
+
+    def test_multiple_processes(
+        self, instrumented_queue: queue_proxy_wrapper.QueueProxyWrapper
+    ) -> None:
+        """
+        Each process records into its own row and samples sum them.
+        """
+        # Setup
+        producers = [mp.Process(target=produce, args=(instrumented_queue,)) for _ in range(2)]
+        for producer in producers:
+            producer.start()
+
+        # Run
+        items = [instrumented_queue.get(timeout=5) for _ in range(2 * ITEM_COUNT)]
+        for producer in producers:
+            producer.join()
+        sample = instrumented_queue.statistics.sample()
+
+        # Test
+        assert sorted(items) == sorted(list(range(ITEM_COUNT)) * 2)
+        assert sample.put_count == 2 * ITEM_COUNT
+        assert sample.get_count == 2 * ITEM_COUNT
+        # A get may be recorded after the next put
+        assert 1 <= sample.high_water_depth <= QUEUE_MAX_SIZE + 1
+
+    def test_conflating_skipped(self) -> None:
+        """
+        Overwritten items count as removed.
+        """
+        # Setup
+        mailbox = queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            backend=queue_proxy_wrapper.QueueBackend.CONFLATING,
+            statistics_name="mailbox",
+        )
+        for i in range(3):
+            mailbox.put(i)
+
+        # Run
+        item, skipped = mailbox.get_latest()
+        sample = mailbox.statistics.sample()
+
+        # Test
+        assert (item, skipped) == (2, 2)
+        assert sample.get_count == 3
+        assert sample.depth == 0
+
+    def test_dump(
+        self, instrumented_queue: queue_proxy_wrapper.QueueProxyWrapper, tmp_path: pathlib.Path
+    ) -> None:
+        """
+        Samples are written as JSON.
+        """
+        # Setup
+        instrumented_queue.put(1)
+
+        # Run
+        result, path = queue_statistics.dump_statistics([instrumented_queue.statistics], tmp_path)
+
+        # Test
+        assert result
+        assert path is not None
+        samples = json.loads(path.read_text(encoding="utf-8"))
+        assert samples[0]["name"] == "test"
+        assert samples[0]["put_count"] == 1
@@ -0,0 +1,162 @@
+"""
+Test the conflating mailbox backend.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+WRITE_DELAY = 0.2  # seconds
+
+
+def put_later(output_queue: queue_proxy_wrapper.QueueProxyWrapper, item: object) -> None:
+    """
+    Puts the item after a delay.
+    """
+    time.sleep(WRITE_DELAY)
+    output_queue.put(item)
+
+
+def read_latest(
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    result_queue: "mp.Queue",
+) -> None:
+    """
+    Sends back what this process reads.
+    """
+    result_queue.put(input_queue.get_latest(timeout=1))
+
+
+@pytest.fixture()
+def mailbox() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Conflating channel.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        backend=queue_proxy_wrapper.QueueBackend.CONFLATING,
+    )
+    yield wrapper  # type: ignore
+
+
+class TestConflatingMailbox:
+    """
+    Latest value semantics.
+    """
+
+    def test_overwrite(self, mailbox: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Writers never block and readers get the newest item with the skipped count.
+        """
+        # Run
+        for i in range(5):
+            mailbox.put(i, timeout=0.0)
+
+        actual = mailbox.get_latest(timeout=0.0)
+
+        # Test
+        assert actual == (4, 4)
+        assert not mailbox.queue.full()
+
+    def test_seen_once(self, mailbox: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        An item is only returned once per reader.
+        """
+        # Setup
+        mailbox.put("a")
+
+        # Run
+        first = mailbox.get(timeout=0.0)
+
+        # Test
+        assert first == "a"
+        assert mailbox.queue.empty()
+        with pytest.raises(queue.Empty):
+            mailbox.get(block=False)
+        with pytest.raises(queue.Empty):
+            mailbox.get(timeout=0.01)
+
+    def test_put_many(self, mailbox: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Only the last item is kept and the rest count as skipped.
+        """
+        # Setup
+        mailbox.put(0)
+        mailbox.get_latest()
+
+        # Run
+        mailbox.put_many([1, 2, 3])
+        actual = mailbox.get_latest(timeout=0.0)
+
+        # Test
+        assert actual == (3, 2)
+
+    def test_blocking_get(self, mailbox: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        A waiting reader wakes up on a write from another process.
+        """
+        # Setup
+        writer = mp.Process(target=put_later, args=(mailbox, "late"))
+
+        # Run
+        writer.start()
+        actual = mailbox.get_latest(timeout=5)
+        writer.join()
+
+        # Test
+        assert actual == ("late", 0)
+
+    def test_independent_readers(self, mailbox: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Reading in one process does not consume the item for another.
+        """
+        # Setup
+        result_queue = mp.Queue()
+        mailbox.put(1)
+        mailbox.put(2)
+        assert mailbox.get_latest(timeout=0.0) == (2, 1)
+        reader = mp.Process(target=read_latest, args=(mailbox, result_queue))
+
+        # Run
+        reader.start()
+        actual = result_queue.get(timeout=5)
+        reader.join()
+
+        # Test
+        assert actual == (2, 1)
+
+
+class TestGetLatest:
+    """
+    get_latest() on queue backends.
+    """
+
+    def test_drains_queue(self) -> None:
+        """
+        Older items are discarded and counted.
+        """
+        # Setup
+        shared_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            5,
+            queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        )
+        shared_queue.put_many([1, 2])
+        shared_queue.put(3)
+
+        # Run
+        actual = shared_queue.get_latest(timeout=0.0)
+
+        # Test
+        assert actual == (3, 2)
+        assert shared_queue.queue.empty()
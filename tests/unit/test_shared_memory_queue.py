@@ -0,0 +1,134 @@
+"""
+Test the shared memory queue backend.
+"""
+
+import multiprocessing as mp
+import queue
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_memory_queue
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+QUEUE_MAX_SIZE = 3
+ITEM_COUNT = 200
+
+
+def produce(output_queue: queue_proxy_wrapper.QueueProxyWrapper, start: int, count: int) -> None:
+    """
+    Puts count consecutive integers.
+    """
+    for i in range(start, start + count):
+        output_queue.queue.put(i)
+
+
+@pytest.fixture()
+def shared_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Bounded queue with the shared memory backend.
+    """
+    wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        QUEUE_MAX_SIZE,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+    )
+    yield wrapper  # type: ignore
+
+
+class TestSharedMemoryQueue:
+    """
+    Queue behaviour matches `queue.Queue` .
+    """
+
+    def test_fifo(self, shared_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Items come out in the order they went in, including around the ring.
+        """
+        # Setup
+        expected = [0, "one", (2.0, None), {"three": 3}, None]
+
+        # Run
+        actual = []
+        for item in expected:
+            shared_queue.queue.put(item)
+            actual.append(shared_queue.queue.get())
+
+        # Test
+        assert actual == expected
+
+    def test_full(self, shared_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Put raises when maxsize is reached.
+        """
+        # Setup
+        for i in range(QUEUE_MAX_SIZE):
+            shared_queue.queue.put(i)
+
+        # Test
+        assert shared_queue.queue.full()
+        assert shared_queue.queue.qsize() == QUEUE_MAX_SIZE
+        with pytest.raises(queue.Full):
+            shared_queue.queue.put_nowait(QUEUE_MAX_SIZE)
+        with pytest.raises(queue.Full):
+            shared_queue.queue.put(QUEUE_MAX_SIZE, timeout=0.01)
+
+    def test_empty(self, shared_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Get raises when there are no items.
+        """
+        # Test
+        assert shared_queue.queue.empty()
+        with pytest.raises(queue.Empty):
+            shared_queue.queue.get_nowait()
+        with pytest.raises(queue.Empty):
+            shared_queue.queue.get(timeout=0.01)
+
+    def test_item_too_large(self) -> None:
+        """
+        Items larger than a slot are rejected.
+        """
+        # Setup
+        small_queue = shared_memory_queue.SharedMemoryQueue(1, 16)
+
+        # Test
+        with pytest.raises(ValueError):
+            small_queue.put(bytes(16))
+        assert small_queue.empty()
+
+    def test_unbounded_rejected(self) -> None:
+        """
+        Shared memory is preallocated so it cannot be infinite.
+        """
+        # Test
+        with pytest.raises(ValueError):
+            shared_memory_queue.SharedMemoryQueue(0)
+
+    def test_multiple_producers(self, shared_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        Items from producer processes all arrive exactly once.
+        """
+        # Setup
+        producers = [
+            mp.Process(target=produce, args=(shared_queue, 0, ITEM_COUNT)),
+            mp.Process(target=produce, args=(shared_queue, ITEM_COUNT, ITEM_COUNT)),
+        ]
+        expected = list(range(2 * ITEM_COUNT))
+
+        # Run
+        for producer in producers:
+            producer.start()
+
+        actual = [shared_queue.queue.get(timeout=5) for _ in range(2 * ITEM_COUNT)]
+
+        for producer in producers:
+            producer.join()
+
+        # Test
+        assert sorted(actual) == expected
+        assert shared_queue.queue.empty()
@@ -0,0 +1,112 @@
+"""
+Test fusing the latest attitude and position.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.telemetry import telemetry_assembler
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+MAX_OTHER_AGE = 100  # ms
+
+
+def attitude(time_boot_ms: int, yaw: float = 0.5) -> mavutil.mavlink.MAVLink_message:
+    """
+    ATTITUDE at the time.
+    """
+    return mavutil.mavlink.MAVLink_attitude_message(time_boot_ms, 0.1, 0.2, yaw, 0.01, 0.02, 0.03)
+
+
+def position(time_boot_ms: int, z: float = -30.0) -> mavutil.mavlink.MAVLink_message:
+    """
+    LOCAL_POSITION_NED at the time.
+    """
+    return mavutil.mavlink.MAVLink_local_position_ned_message(
+        time_boot_ms, 1.0, 2.0, z, 0.4, 0.5, 0.6
+    )
+
+
+@pytest.fixture()
+def assembler() -> telemetry_assembler.TelemetryAssembler:
+    """
+    Fuses messages at most 100 ms apart.
+    """
+    return telemetry_assembler.TelemetryAssembler(MAX_OTHER_AGE)
+
+
+class TestTelemetryAssembler:
+    """
+    Every update is fused with the latest of the other type.
+    """
+
+    def test_waits_for_both(self, assembler: telemetry_assembler.TelemetryAssembler) -> None:
+        """
+        Nothing is fused until both types have been received, other types are ignored.
+        """
+        # Run
+        first = assembler.update(attitude(1000))
+        other = assembler.update(mavutil.mavlink.MAVLink_heartbeat_message(2, 3, 0, 0, 4, 3))
+        fused = assembler.update(position(1020))
+
+        # Test
+        assert first is None
+        assert other is None
+        assert fused is not None
+        assert fused.time_since_boot == 1020
+        assert (fused.x, fused.y, fused.z) == (1.0, 2.0, -30.0)
+        assert (fused.x_velocity, fused.y_velocity, fused.z_velocity) == pytest.approx(
+            (0.4, 0.5, 0.6)
+        )
+        assert (fused.roll, fused.pitch, fused.yaw) == pytest.approx((0.1, 0.2, 0.5))
+        assert (fused.roll_speed, fused.pitch_speed, fused.yaw_speed) == pytest.approx(
+            (0.01, 0.02, 0.03)
+        )
+        assert fused.other_age == 20
+
+    def test_fuses_every_update(self, assembler: telemetry_assembler.TelemetryAssembler) -> None:
+        """
+        Each update of either type gives telemetry at the newer timestamp,
+        with the age of the other.
+        """
+        # Setup
+        assembler.update(position(1000))
+
+        # Run
+        results = [
+            assembler.update(attitude(1010, yaw=0.1)),
+            assembler.update(attitude(1030, yaw=0.2)),
+            assembler.update(position(1040, z=-31.0)),
+            assembler.update(attitude(1050, yaw=0.3)),
+        ]
+
+        # Test
+        assert all(result is not None for result in results)
+        assert [result.time_since_boot for result in results] == [1010, 1030, 1040, 1050]
+        assert [result.other_age for result in results] == [10, 30, 10, 10]
+        assert [result.yaw for result in results] == pytest.approx([0.1, 0.2, 0.2, 0.3])
+        assert [result.z for result in results] == [-30.0, -30.0, -31.0, -31.0]
+
+    def test_max_other_age(self, assembler: telemetry_assembler.TelemetryAssembler) -> None:
+        """
+        Nothing is fused while the other stream is too old, up to the limit is fused.
+        """
+        # Setup
+        assembler.update(position(1000))
+
+        # Run
+        at_limit = assembler.update(attitude(1000 + MAX_OTHER_AGE))
+        too_old = assembler.update(attitude(1001 + MAX_OTHER_AGE))
+        resumed = assembler.update(position(1050 + MAX_OTHER_AGE))
+
+        # Test
+        assert at_limit is not None
+        assert at_limit.other_age == MAX_OTHER_AGE
+        assert too_old is None
+        assert resumed is not None
+        assert resumed.other_age == 49
@@ -0,0 +1,127 @@
+"""
+Test the binary encodings of TelemetryData and Position.
+"""
+
+import pickle
+
+import pytest
+
+from modules.command import position
+from modules.telemetry import telemetry_data
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+ALL_VALUES = (123456, 1.0, 2.0, 30.0, 0.1, 0.2, -0.3, 0.01, 0.02, 1.1, 0.0, -0.0, 3.14, 40)
+SOME_VALUES = (123456, 1.0, None, 30.0, None, None, None, 0.01, 0.02, 1.1, None, None, None, 0)
+NO_VALUES = (None,) * len(telemetry_data.TelemetryData.FIELD_NAMES)
+QUEUE_MAX_SIZE = 4
+
+
+def get_values(data: telemetry_data.TelemetryData) -> "tuple":
+    """
+    Field values in order.
+    """
+    return tuple(getattr(data, name) for name in telemetry_data.TelemetryData.FIELD_NAMES)
+
+
+@pytest.fixture()
+def shared_memory_queue() -> queue_proxy_wrapper.QueueProxyWrapper:  # type: ignore
+    """
+    Queue which pickles its items.
+    """
+    yield queue_proxy_wrapper.QueueProxyWrapper(  # type: ignore
+        None, QUEUE_MAX_SIZE, queue_proxy_wrapper.QueueBackend.SHARED_MEMORY
+    )
+
+
+class TestTelemetryData:
+    """
+    Encoding, decoding, views, and pickling.
+    """
+
+    @pytest.mark.parametrize("values", [ALL_VALUES, SOME_VALUES, NO_VALUES])
+    def test_round_trip(self, values: tuple) -> None:
+        """
+        Decoding the encoding gives the same values, None included.
+        """
+        # Setup
+        data = telemetry_data.TelemetryData(*values)
+
+        # Run
+        encoded = data.to_bytes()
+        decoded = telemetry_data.TelemetryData.from_buffer(bytearray(8) + encoded, 8)
+
+        # Test
+        assert len(encoded) == telemetry_data.TelemetryData.ENCODED_SIZE
+        assert get_values(decoded) == values
+
+    def test_view_buffer(self) -> None:
+        """
+        Consecutive encodings are viewed as records, with the bits of None fields cleared.
+        """
+        # Setup
+        records = [ALL_VALUES, SOME_VALUES, NO_VALUES]
+        buffer = b"".join(telemetry_data.TelemetryData(*values).to_bytes() for values in records)
+
+        # Run
+        view = telemetry_data.TelemetryData.view_buffer(buffer)
+
+        # Test
+        assert len(view) == len(records)
+        assert view["time_since_boot"].tolist() == [123456, 123456, 0]
+        assert view["z"].tolist() == [30.0, 30.0, 0.0]
+        all_present = (1 << len(telemetry_data.TelemetryData.FIELD_NAMES)) - 1
+        assert view["present"][0] == all_present
+        # y, the velocities, and the angular speeds are None
+        assert view["present"][1] == all_present & ~0b1110001110100
+        assert view["present"][2] == 0
+        assert not view.flags.writeable
+
+    @pytest.mark.parametrize("values", [ALL_VALUES, SOME_VALUES])
+    def test_through_queue(
+        self, shared_memory_queue: queue_proxy_wrapper.QueueProxyWrapper, values: tuple
+    ) -> None:
+        """
+        The object goes through a queue that pickles it as its encoding,
+        and comes out as an object.
+        """
+        # Setup
+        data = telemetry_data.TelemetryData(*values)
+
+        # Run
+        shared_memory_queue.put(data)
+        from_object = shared_memory_queue.get()
+
+        # Test
+        assert isinstance(from_object, telemetry_data.TelemetryData)
+        assert get_values(from_object) == values
+        assert data.to_bytes() in pickle.dumps(data)
+
+
+class TestPosition:
+    """
+    Encoding, decoding, views, and pickling.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        Decoding the encoding or unpickling gives the same values.
+        """
+        # Setup
+        target = position.Position(10.0, -20.5, 30.0)
+
+        # Run
+        decoded = position.Position.from_buffer(target.to_bytes())
+        unpickled = pickle.loads(pickle.dumps(target))
+        view = position.Position.view_buffer(target.to_bytes() * 2)
+
+        # Test
+        assert len(target.to_bytes()) == position.Position.ENCODED_SIZE
+        assert (decoded.x, decoded.y, decoded.z) == (10.0, -20.5, 30.0)
+        assert (unpickled.x, unpickled.y, unpickled.z) == (10.0, -20.5, 30.0)
+        assert view["y"].tolist() == [-20.5, -20.5]
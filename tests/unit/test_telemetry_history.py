@@ -0,0 +1,133 @@
+"""
+Test the columnar telemetry history.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.telemetry import telemetry_history
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+CAPACITY = 8
+PERIOD = 100  # ms
+
+
+class Sample:
+    """
+    Same attributes as `TelemetryData` .
+    """
+
+    def __init__(self, time_since_boot: int, x: "float | None") -> None:
+        self.time_since_boot = time_since_boot
+        for name in telemetry_history.TelemetryHistory.FIELD_NAMES:
+            setattr(self, name, 0.0)
+
+        self.x = x
+        self.z = time_since_boot / 1000 * 2.0
+
+
+@pytest.fixture
+def history() -> telemetry_history.TelemetryHistory:
+    """
+    History of samples every 100 ms, x counting up, z climbing at 2 m/s.
+    """
+    history = telemetry_history.TelemetryHistory(CAPACITY)
+    for i in range(12):
+        history.append(Sample(i * PERIOD, float(i)))
+
+    return history
+
+
+class TestTelemetryHistory:
+    """
+    Windows are the newest samples, and statistics are per field.
+    """
+
+    def test_ring(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Only the newest samples up to the capacity are kept, in order.
+        """
+        # Run
+        times, values = history.window()
+        last_three_times, _ = history.window(count=3)
+
+        # Test
+        assert len(history) == CAPACITY
+        assert times.tolist() == [i * PERIOD for i in range(4, 12)]
+        assert values[0].tolist() == [float(i) for i in range(4, 12)]
+        assert last_three_times.tolist() == [900, 1000, 1100]
+        assert not values.flags.writeable
+
+    def test_statistics(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Mean, minimum, maximum, and rates over count and duration windows.
+        """
+        # Run
+        mean = history.mean(count=4)
+        minimum = history.minimum(duration=200)
+        maximum = history.maximum()
+        rate_times, rates = history.rates(count=3)
+        mean_rate = history.mean_rate(duration=500)
+
+        # Test
+        assert mean["x"] == pytest.approx(9.5)
+        assert minimum["x"] == pytest.approx(9.0)
+        assert maximum["x"] == pytest.approx(11.0)
+        assert rate_times.tolist() == [1000, 1100]
+        assert rates[0].tolist() == pytest.approx([10.0, 10.0])
+        assert mean_rate["z"] == pytest.approx(2.0)
+
+    def test_missing_and_old(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        None is ignored by the statistics, older samples are dropped, and a reboot clears.
+        """
+        # Setup
+        history.append(Sample(1200, None))
+
+        # Run
+        stale = history.append(Sample(1150, 100.0))
+        mean = history.mean(count=3)
+        rebooted = history.append(Sample(0, 1.0))
+        empty_rate = history.mean_rate()
+
+        # Test
+        assert not stale
+        assert mean["x"] == pytest.approx(10.5)
+        assert rebooted
+        assert len(history) == 1
+        assert math.isnan(empty_rate["x"])
+
+    def test_append_records(self) -> None:
+        """
+        Bulk appends of encoded records honour their present bits.
+        """
+        # Setup
+        dtype = np.dtype(
+            [("present", "<u2"), ("time_since_boot", "<i8")]
+            + [(name, "<f8") for name in telemetry_history.TelemetryHistory.FIELD_NAMES]
+            + [("other_age", "<i8")]
+        )
+        records = np.zeros(CAPACITY + 2, dtype=dtype)
+        records["present"] = 0xFFFF
+        records["time_since_boot"] = np.arange(len(records)) * PERIOD
+        records["x"] = np.arange(len(records))
+        # x is the second bit, after time_since_boot
+        records["present"][-1] &= ~np.uint16(1 << 1)
+        history = telemetry_history.TelemetryHistory(CAPACITY)
+
+        # Run
+        appended = history.append_records(records)
+        times, values = history.window()
+
+        # Test
+        assert appended == CAPACITY
+        assert times[0] == 2 * PERIOD
+        assert math.isnan(values[0, -1])
+        assert history.maximum()["x"] == pytest.approx(CAPACITY)
@@ -0,0 +1,154 @@
+"""
+Test interpolating attitude and position to common timestamps.
+"""
+
+import math
+
+import pytest
+from pymavlink import mavutil
+
+from modules.telemetry import telemetry_resampler
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+MAX_OTHER_AGE = 100  # ms
+
+
+def attitude(time_boot_ms: int, yaw: float = 0.5) -> mavutil.mavlink.MAVLink_message:
+    """
+    ATTITUDE at the time.
+    """
+    return mavutil.mavlink.MAVLink_attitude_message(time_boot_ms, 0.1, 0.2, yaw, 0.01, 0.02, 0.03)
+
+
+def position(time_boot_ms: int, x: float = 1.0) -> mavutil.mavlink.MAVLink_message:
+    """
+    LOCAL_POSITION_NED at the time.
+    """
+    return mavutil.mavlink.MAVLink_local_position_ned_message(
+        time_boot_ms, x, 2.0, -30.0, 0.4, 0.5, 0.6
+    )
+
+
+@pytest.fixture()
+def resampler() -> telemetry_resampler.TelemetryResampler:
+    """
+    Clears on timestamps going back more than 100 ms.
+    """
+    return telemetry_resampler.TelemetryResampler(max_other_age=MAX_OTHER_AGE)
+
+
+class TestTelemetryResampler:
+    """
+    Interpolation, yaw unwrapping, reboots, and the output grid.
+    """
+
+    def test_interpolates_both(self, resampler: telemetry_resampler.TelemetryResampler) -> None:
+        """
+        Both streams are interpolated at the same timestamps, only within both.
+        """
+        # Setup
+        resampler.add_many([attitude(1000, yaw=0.0), attitude(1100, yaw=1.0)])
+        resampler.add_many([position(1020, x=0.0), position(1120, x=10.0)])
+
+        # Run
+        covered_range = resampler.covered_range()
+        records = resampler.resample([1050])
+
+        # Test
+        assert covered_range == (1020, 1100)
+        assert records["time_since_boot"].tolist() == [1050]
+        assert records["yaw"].tolist() == pytest.approx([0.5])
+        assert records["x"].tolist() == pytest.approx([3.0])
+        assert records["other_age"].tolist() == [0]
+
+    def test_yaw_unwrapped(self, resampler: telemetry_resampler.TelemetryResampler) -> None:
+        """
+        Yaw going through +-pi is interpolated the short way around and wrapped back.
+        """
+        # Setup
+        resampler.add_many([attitude(1000, yaw=3.0), attitude(1100, yaw=-3.0)])
+        resampler.add_many([position(1000), position(1100)])
+        step = (2 * math.pi - 6.0) / 4
+
+        # Run
+        records = resampler.resample([1000, 1025, 1075, 1100])
+
+        # Test
+        assert records["yaw"].tolist() == pytest.approx([3.0, 3.0 + step, -3.0 - step, -3.0])
+
+    def test_cleared_on_reboot(self, resampler: telemetry_resampler.TelemetryResampler) -> None:
+        """
+        A timestamp going back by less than max_other_age is dropped,
+        by more clears both streams.
+        """
+        # Setup
+        resampler.add_many([attitude(5000), attitude(5100)])
+        resampler.add_many([position(5000), position(5100)])
+        latest = resampler.resample_latest()
+
+        # Run
+        resampler.add(attitude(5100 - MAX_OTHER_AGE))
+        range_after_late = resampler.covered_range()
+        resampler.add(attitude(100))
+        range_after_reboot = resampler.covered_range()
+        # The only position, between the attitudes
+        resampler.add(position(120))
+        resampler.add(attitude(140))
+        after_reboot = resampler.resample_latest()
+
+        # Test
+        assert latest is not None
+        assert latest.time_since_boot == 5100
+        assert range_after_late == (5000, 5100)
+        assert range_after_reboot is None
+        assert resampler.covered_range() == (120, 120)
+        assert after_reboot is not None
+        assert after_reboot.time_since_boot == 120
+
+    def test_mixed_batch_after_reboot(
+        self, resampler: telemetry_resampler.TelemetryResampler
+    ) -> None:
+        """
+        A reboot seen in one stream of a batch clears both before the batch is added,
+        so the other stream of the batch is kept.
+        """
+        # Setup
+        # Attitude arrives only after the reboot
+        resampler.add_many([position(5000), position(5100)])
+
+        # Run
+        resampler.add_many(
+            [attitude(100, yaw=0.0), position(100, x=0.0), attitude(200, yaw=1.0), position(200)]
+        )
+        covered_range = resampler.covered_range()
+        records = resampler.resample([150])
+
+        # Test
+        assert covered_range == (100, 200)
+        assert records["yaw"].tolist() == pytest.approx([0.5])
+        assert records["x"].tolist() == pytest.approx([0.5])
+
+    def test_grid(self, resampler: telemetry_resampler.TelemetryResampler) -> None:
+        """
+        The grid is multiples of the period within both streams,
+        and continues after the last resampled timestamp.
+        """
+        # Setup
+        resampler.add_many([attitude(1003), attitude(1047)])
+        resampler.add_many([position(1001), position(1049)])
+
+        # Run
+        first = resampler.resample_grid(10)
+        resampler.add_many([attitude(1091), position(1095)])
+        second = resampler.resample_grid(10)
+        third = resampler.resample_grid(10)
+
+        # Test
+        assert first["time_since_boot"].tolist() == [1010, 1020, 1030, 1040]
+        assert second["time_since_boot"].tolist() == [1050, 1060, 1070, 1080, 1090]
+        assert len(third) == 0
@@ -0,0 +1,109 @@
+"""
+Test periodic tasks on absolute deadlines.
+"""
+
+import pytest
+
+from utilities.workers import timer_wheel
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+TICK = 0.001  # seconds
+SLOT_COUNT = 8
+
+
+@pytest.fixture
+def wheel() -> timer_wheel.TimerWheel:
+    """
+    Wheel with a rotation of 8 ms, shorter than most periods.
+    """
+    return timer_wheel.TimerWheel(TICK, SLOT_COUNT)
+
+
+class TestTimerWheel:
+    """
+    Tasks run on their deadlines, which do not drift with late runs.
+    """
+
+    def test_no_drift(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Late runs do not move the following deadlines.
+        """
+        # Setup
+        runs = []
+        task = wheel.add_task("heartbeat", 1.0, lambda: runs.append(len(runs)), 0.0)
+
+        # Run
+        counts = [wheel.run_pending(now) for now in [0.0, 0.5, 1.003, 2.0005, 2.9, 3.0]]
+
+        # Test
+        assert counts == [1, 0, 1, 1, 0, 1]
+        assert runs == [0, 1, 2, 3]
+        assert task.deadline == pytest.approx(4.0)
+        assert task.missed_count == 0
+        assert task.max_lateness == pytest.approx(0.003)
+        # Lateness of 0, 3000 us, 500 us, and 0
+        assert task.lateness_histogram[0] == 2
+        assert task.lateness_histogram[9] == 1
+        assert task.lateness_histogram[12] == 1
+        assert task.get_lateness_percentile(100) == pytest.approx(0.004096)
+
+    def test_tasks_in_deadline_order(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Tasks with periods longer and shorter than a rotation run in deadline order.
+        """
+        # Setup
+        runs = []
+        wheel.add_task("slow", 0.05, lambda: runs.append("slow"), 0.0105)
+        wheel.add_task("fast", 0.02, lambda: runs.append("fast"), 0.0)
+
+        # Run
+        for step in range(71):
+            wheel.run_pending(step * TICK)
+
+        # Test
+        assert runs == ["fast", "slow", "fast", "fast", "fast", "slow"]
+
+    def test_missed_deadlines(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Deadlines passed by more than a period are skipped, not run in a burst.
+        """
+        # Setup
+        runs = []
+        task = wheel.add_task("status", 1.0, lambda: runs.append(len(runs)), 0.0)
+
+        # Run
+        wheel.run_pending(0.0)
+        late_count = wheel.run_pending(3.5)
+
+        # Test
+        assert late_count == 1
+        assert task.missed_count == 2
+        assert task.deadline == pytest.approx(4.0)
+        assert wheel.get_timeout(3.5) == pytest.approx(0.5)
+
+    def test_remove(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Removed tasks no longer run, and the next deadline is of the remaining tasks.
+        """
+        # Setup
+        runs = []
+        wheel.add_task("first", 0.5, lambda: runs.append("first"), 0.2)
+        wheel.add_task("second", 0.5, lambda: runs.append("second"), 0.3)
+
+        # Run
+        removed = wheel.remove_task("first")
+        removed_again = wheel.remove_task("first")
+        next_deadline = wheel.get_next_deadline()
+        wheel.run_pending(0.4)
+
+        # Test
+        assert removed
+        assert not removed_again
+        assert next_deadline == pytest.approx(0.3)
+        assert runs == ["second"]
+        assert [task.name for task in wheel.get_tasks()] == ["second"]
@@ -0,0 +1,92 @@
+"""
+Test incremental velocity statistics.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from modules.command import velocity_statistics
+
+
+WINDOW_SIZE = 4
+EWMA_ALPHA = 0.5
+
+
+class TestStreamStatistics:
+    """
+    Each statistic matches computing it from all values.
+    """
+
+    def test_statistics(self) -> None:
+        """
+        Mean, variance, weighted average, and window mean of a short stream.
+        """
+        # Setup
+        statistics = velocity_statistics.StreamStatistics(WINDOW_SIZE, EWMA_ALPHA)
+        values = [1.0, 3.0, 2.0, 6.0, 4.0, 8.0]
+
+        # Run
+        empty = (statistics.get_mean(), statistics.get_ewma(), statistics.get_window_mean())
+        for value in values:
+            statistics.update(value)
+
+        # Test
+        assert all(math.isnan(value) for value in empty)
+        assert statistics.count == len(values)
+        assert statistics.get_mean() == pytest.approx(np.mean(values))
+        assert statistics.get_variance() == pytest.approx(np.var(values, ddof=1))
+        # 1, 2, 2, 4, 4, 6
+        assert statistics.get_ewma() == pytest.approx(6.0)
+        assert statistics.get_window_mean() == pytest.approx(np.mean(values[-WINDOW_SIZE:]))
+
+    def test_long_flight_precision(self) -> None:
+        """
+        Values with a large offset keep their precision over many updates.
+        """
+        # Setup
+        statistics = velocity_statistics.StreamStatistics(WINDOW_SIZE, EWMA_ALPHA)
+        generator = random.Random(0)
+        # Hours of samples at 10 Hz, around a large offset
+        values = [1e8 + generator.uniform(-1.0, 1.0) for _ in range(100000)]
+
+        # Run
+        for value in values:
+            statistics.update(value)
+
+        # Test
+        exact_mean = math.fsum(values) / len(values)
+        exact_variance = math.fsum((value - exact_mean) ** 2 for value in values) / (
+            len(values) - 1
+        )
+        assert statistics.get_mean() == pytest.approx(exact_mean, abs=1e-6)
+        assert statistics.get_variance() == pytest.approx(exact_variance, rel=1e-6)
+        assert statistics.get_window_mean() == pytest.approx(
+            math.fsum(values[-WINDOW_SIZE:]) / WINDOW_SIZE, abs=1e-7
+        )
+
+
+class TestVelocityStatistics:
+    """
+    Each axis has its own statistics.
+    """
+
+    def test_axes(self) -> None:
+        """
+        Axes are averaged independently.
+        """
+        # Setup
+        statistics = velocity_statistics.VelocityStatistics(WINDOW_SIZE, EWMA_ALPHA)
+
+        # Run
+        statistics.update(1.0, 10.0, -1.0)
+        statistics.update(3.0, 10.0, -3.0)
+
+        # Test
+        assert statistics.get_count() == 2
+        assert statistics.get_mean() == pytest.approx((2.0, 10.0, -2.0))
+        assert statistics.get_variance() == pytest.approx((2.0, 0.0, 2.0))
+        assert statistics.get_ewma() == pytest.approx((2.0, 10.0, -2.0))
+        assert statistics.get_window_mean() == pytest.approx((2.0, 10.0, -2.0))
@@ -0,0 +1,301 @@
+"""
+Test the worker controller.
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+PAUSE_CHECK_DELAY = 0.2  # seconds
+JOIN_TIMEOUT = 5  # seconds
+BLOCK_DELAY = 0.5  # seconds
+SHUTDOWN_LATENCY_LIMIT = 0.1  # seconds
+
+
+def pause_then_report(controller: worker_controller.WorkerController) -> None:
+    """
+    Reports running, waits on the pause, then reports exited.
+    """
+    controller.report_status(worker_controller.WorkerStatus.RUNNING)
+    controller.check_pause()
+    controller.report_status(worker_controller.WorkerStatus.EXITED)
+
+
+def raise_error(controller: worker_controller.WorkerController) -> None:
+    """
+    Crashes without reporting.
+    """
+    raise RuntimeError(f"Crash with {controller}")
+
+
+def wait_for_exit(controller: worker_controller.WorkerController) -> None:
+    """
+    Sleeps for longer than the test.
+    """
+    assert controller.wait(60)
+
+
+def get_until_exit(
+    controller: worker_controller.WorkerController,
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+) -> None:
+    """
+    Waits on an empty queue.
+    """
+    with pytest.raises(queue.Empty):
+        controller.queue_get(input_queue)
+
+
+def get_latest_until_exit(
+    controller: worker_controller.WorkerController,
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+) -> None:
+    """
+    Waits on an empty mailbox.
+    """
+    with pytest.raises(queue.Empty):
+        controller.queue_get_latest(input_queue, 60)
+
+
+def receive_until_exit(controller: worker_controller.WorkerController) -> None:
+    """
+    Waits on a connection nothing is sent to.
+    """
+    connection = mavutil.mavlink_connection("udpin:127.0.0.1:0")
+    assert controller.recv_match(connection, 60, type="HEARTBEAT") is None
+
+
+@pytest.fixture()
+def controller() -> worker_controller.WorkerController:  # type: ignore
+    """
+    Controller with room for 2 workers.
+    """
+    yield worker_controller.WorkerController(2)  # type: ignore
+
+
+class TestFlags:
+    """
+    Exit and pause requests.
+    """
+
+    def test_exit(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Exit is visible immediately and each change increments the generation.
+        """
+        # Run
+        controller.request_exit()
+        requested = controller.is_exit_requested()
+        controller.request_exit()
+        generation = controller.get_generation()
+        controller.clear_exit()
+
+        # Test
+        assert requested
+        assert generation == 1
+        assert not controller.is_exit_requested()
+        assert controller.get_generation() == 2
+
+    def test_pause_and_resume(self, controller: worker_controller.WorkerController) -> None:
+        """
+        A paused worker blocks until resumed and reports its status.
+        """
+        # Setup
+        controller.request_pause()
+        worker = mp.Process(target=pause_then_report, args=(controller,))
+
+        # Run
+        worker.start()
+        time.sleep(PAUSE_CHECK_DELAY)
+        paused_statuses = controller.get_worker_statuses()
+        controller.request_resume()
+        worker.join(JOIN_TIMEOUT)
+
+        # Test
+        assert list(paused_statuses.values()) == [worker_controller.WorkerStatus.PAUSED]
+        assert controller.get_worker_statuses() == {
+            worker.pid: worker_controller.WorkerStatus.EXITED
+        }
+
+    def test_exit_while_paused(self, controller: worker_controller.WorkerController) -> None:
+        """
+        A paused worker returns when exit is requested.
+        """
+        # Setup
+        controller.request_pause()
+        worker = mp.Process(target=pause_then_report, args=(controller,))
+
+        # Run
+        worker.start()
+        time.sleep(PAUSE_CHECK_DELAY)
+        controller.request_exit()
+        worker.join(JOIN_TIMEOUT)
+
+        # Test
+        assert worker.exitcode == 0
+
+
+class TestStatus:
+    """
+    Worker status words.
+    """
+
+    def test_slot_limit(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Each process takes one slot and reports fail when there are none left.
+        """
+        # Setup
+        workers = [mp.Process(target=pause_then_report, args=(controller,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+            worker.join(JOIN_TIMEOUT)
+
+        # Run
+        result = controller.report_status(worker_controller.WorkerStatus.RUNNING)
+
+        # Test
+        assert not result
+        assert len(controller.get_worker_statuses()) == 2
+
+    def test_unfinished_workers(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Workers run through the controller are stuck while alive,
+        and crashed if they end without returning.
+        """
+        # Setup
+        targets = [wait_for_exit, raise_error]
+        workers = [
+            mp.Process(target=controller.run_worker, args=(target, (controller,)))
+            for target in targets
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Run
+        workers[1].join(JOIN_TIMEOUT)
+        before_exit = controller.find_unfinished_workers(workers)
+        controller.request_exit()
+        for worker in workers:
+            worker.join(JOIN_TIMEOUT)
+
+        after_exit = controller.find_unfinished_workers(workers)
+
+        # Test
+        assert before_exit == ([workers[0]], [workers[1]])
+        assert after_exit == ([], [workers[1]])
+        assert controller.get_worker_statuses()[workers[0].pid] == (
+            worker_controller.WorkerStatus.EXITED
+        )
+        assert controller.get_worker_statuses()[workers[1].pid] == (
+            worker_controller.WorkerStatus.RUNNING
+        )
+
+
+class TestInterruptibleWaits:
+    """
+    Blocking calls return as soon as exit is requested.
+    """
+
+    def test_shutdown_latency(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Worst case time from the exit request until every blocked worker has returned.
+        """
+        # Setup
+        mp_manager = mp.Manager()
+        queues = [
+            queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 1, backend)
+            for backend in [
+                queue_proxy_wrapper.QueueBackend.MANAGER,
+                queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            ]
+        ]
+        mailbox = queue_proxy_wrapper.QueueProxyWrapper(
+            None, backend=queue_proxy_wrapper.QueueBackend.CONFLATING
+        )
+        workers = [
+            mp.Process(target=wait_for_exit, args=(controller,)),
+            mp.Process(target=get_latest_until_exit, args=(controller, mailbox)),
+            mp.Process(target=receive_until_exit, args=(controller,)),
+        ] + [
+            mp.Process(target=get_until_exit, args=(controller, input_queue))
+            for input_queue in queues
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(BLOCK_DELAY)
+
+        # Run
+        start = time.perf_counter()
+        controller.request_exit()
+        for worker in workers:
+            worker.join(JOIN_TIMEOUT)
+        latency = time.perf_counter() - start
+
+        mp_manager.shutdown()
+
+        # Test
+        assert [worker.exitcode for worker in workers] == [0] * len(workers)
+        assert latency < SHUTDOWN_LATENCY_LIMIT
+
+    def test_notified_waits(self) -> None:
+        """
+        Waits on queues with the notifier of the controller block without checking for exit,
+        and wake up on both puts and the exit request.
+        """
+        # Setup
+        controller = worker_controller.WorkerController(exit_check_period=60)
+        mp_manager = mp.Manager()
+        queues = [
+            queue_proxy_wrapper.QueueProxyWrapper(
+                mp_manager, 1, backend, notifier=controller.notifier
+            )
+            for backend in [
+                queue_proxy_wrapper.QueueBackend.MANAGER,
+                queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+            ]
+        ]
+        workers = [
+            mp.Process(target=get_until_exit, args=(controller, input_queue))
+            for input_queue in queues
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(BLOCK_DELAY)
+
+        # Nobody else gets from this one
+        input_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            None, 1, queue_proxy_wrapper.QueueBackend.SHARED_MEMORY, notifier=controller.notifier
+        )
+        put_timer = threading.Timer(BLOCK_DELAY, input_queue.put, args=("item",))
+
+        # Run
+        start = time.perf_counter()
+        put_timer.start()
+        item = controller.queue_get(input_queue, 60)
+        put_latency = time.perf_counter() - start - BLOCK_DELAY
+
+        start = time.perf_counter()
+        controller.request_exit()
+        for worker in workers:
+            worker.join(JOIN_TIMEOUT)
+        exit_latency = time.perf_counter() - start
+
+        mp_manager.shutdown()
+
+        # Test
+        assert item == "item"
+        assert put_latency < SHUTDOWN_LATENCY_LIMIT
+        assert [worker.exitcode for worker in workers] == [0] * len(workers)
+        assert exit_latency < SHUTDOWN_LATENCY_LIMIT
@@ -0,0 +1,125 @@
+"""
+For controlling workers running as tasks in one event loop.
+"""
+
+import asyncio
+import queue
+
+
+class AsyncWorkerController:
+    """
+    Same as `WorkerController` for asyncio tasks: the exit request is an event,
+    so waits return as soon as it is set instead of polling for it.
+
+    All methods must be called from the event loop the workers run in.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor creates the exit event.
+        """
+        self.__exit = asyncio.Event()
+
+    def request_exit(self) -> None:
+        """
+        Requests the workers to exit.
+        """
+        self.__exit.set()
+
+    def clear_exit(self) -> None:
+        """
+        Clears the exit request.
+        """
+        self.__exit.clear()
+
+    def is_exit_requested(self) -> bool:
+        """
+        Returns whether main has requested the workers to exit.
+        """
+        return self.__exit.is_set()
+
+    async def wait(self, timeout: "float | None" = None) -> bool:
+        """
+        Sleeps until the timeout or until exit is requested, whichever is first.
+
+        timeout: Seconds, None to wait for exit only.
+
+        Returns whether exit was requested.
+        """
+        try:
+            await asyncio.wait_for(self.__exit.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        return self.__exit.is_set()
+
+    async def until_exit(
+        self, awaitable: "asyncio.Future | object", timeout: "float | None" = None
+    ) -> "tuple[bool, object]":
+        """
+        Awaits the awaitable, cancelling it if the timeout expires or exit is requested first.
+
+        timeout: Seconds, None to wait until it completes or exit.
+
+        Returns whether it completed and its result.
+        """
+        task = asyncio.ensure_future(awaitable)
+        if self.__exit.is_set():
+            task.cancel()
+            return False, None
+
+        exit_waiter = asyncio.ensure_future(self.__exit.wait())
+        await asyncio.wait(
+            [task, exit_waiter], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        exit_waiter.cancel()
+        if not task.done():
+            task.cancel()
+            return False, None
+
+        return True, task.result()
+
+    async def queue_get(self, input_queue: asyncio.Queue, timeout: "float | None" = None) -> object:
+        """
+        Gets an item from the queue, returning early if exit is requested.
+
+        timeout: Seconds, None to wait until an item or exit.
+
+        Raises `queue.Empty` if there is no item in time or exit was requested.
+        """
+        completed, item = await self.until_exit(input_queue.get(), timeout)
+        if not completed:
+            raise queue.Empty
+
+        return item
+
+    async def queue_get_latest(
+        self, input_queue: asyncio.Queue, timeout: "float | None" = None
+    ) -> "tuple[object, int]":
+        """
+        Same as `queue_get()` but skips to the newest item.
+
+        Returns the newest item and the number of older items skipped.
+        """
+        item = await self.queue_get(input_queue, timeout)
+        skipped = 0
+        while not input_queue.empty():
+            item = input_queue.get_nowait()
+            skipped += 1
+
+        return item, skipped
+
+    async def recv_match(
+        self, connection: object, timeout: "float | None" = None, **kwargs: object
+    ) -> "object | None":
+        """
+        Receives a MAVLink message, returning early if exit is requested.
+
+        connection: Has a coroutine `recv_match()` , such as `AsyncRoutedConnection` .
+        timeout: Seconds, None to wait until a message or exit.
+        kwargs: Other arguments of `recv_match()` , such as type.
+
+        Returns the message, or None if there is none in time or exit was requested.
+        """
+        _, message = await self.until_exit(connection.recv_match(**kwargs), timeout)
+        return message
@@ -0,0 +1,122 @@
+"""
+For managing workers running as tasks in one event loop.
+"""
+
+import asyncio
+
+from modules.common.modules.logger import logger
+from utilities.workers import worker_manager
+
+
+class AsyncWorkerManager:
+    """
+    Same as `WorkerManager` with each worker a task in the running event loop
+    instead of a process.
+
+    The worker properties are the same, with a coroutine function as target,
+    `asyncio.Queue` queues, and an `AsyncWorkerController` .
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        worker_properties: worker_manager.WorkerProperties,
+        local_logger: logger.Logger,
+    ) -> "tuple[bool, AsyncWorkerManager | None]":
+        """
+        Creates the manager, the tasks are created when started.
+
+        worker_properties: Worker properties.
+        local_logger: Existing logger from process.
+
+        Returns whether the manager was able to be created and the manager.
+        """
+        if not asyncio.iscoroutinefunction(worker_properties.get_worker_target()):
+            local_logger.error(
+                f"{worker_properties.get_target_name()} is not a coroutine function", True
+            )
+            return False, None
+
+        return True, AsyncWorkerManager(cls.__create_key, worker_properties, local_logger)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        worker_properties: worker_manager.WorkerProperties,
+        local_logger: logger.Logger,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is AsyncWorkerManager.__create_key, "Use create() method"
+
+        self.__workers: "list[asyncio.Task]" = []
+        self.__worker_properties = worker_properties
+        self.__local_logger = local_logger
+
+    def __create_single_worker(self, index: int) -> asyncio.Task:
+        """
+        Creates a task running the target, must be called from the event loop.
+        """
+        target = self.__worker_properties.get_worker_target()
+        return asyncio.create_task(
+            target(*self.__worker_properties.get_worker_arguments()),
+            name=f"{self.__worker_properties.get_target_name()}-{index}",
+        )
+
+    def start_workers(self) -> None:
+        """
+        Start workers, must be called from the event loop.
+        """
+        self.__workers = [
+            self.__create_single_worker(index)
+            for index in range(self.__worker_properties.get_worker_count())
+        ]
+
+    async def join_workers(self, timeout: "float | None" = None) -> bool:
+        """
+        Waits for the workers to finish, cancelling those still running after the timeout.
+
+        timeout: Seconds, None to wait forever.
+
+        Returns whether all workers finished by themselves.
+        """
+        if len(self.__workers) == 0:
+            return True
+
+        _, pending = await asyncio.wait(self.__workers, timeout=timeout)
+        for worker in pending:
+            self.__local_logger.warning(
+                f"Worker did not exit, cancelling {worker.get_name()}", True
+            )
+            worker.cancel()
+
+        await asyncio.gather(*pending, return_exceptions=True)
+        return len(pending) == 0
+
+    def check_and_restart_dead_workers(self) -> bool:
+        """
+        Check and restart workers that have finished, must be called from the event loop.
+
+        Returns whether the dead workers were able to be restarted.
+        """
+        new_workers = []
+        for index, worker in enumerate(self.__workers):
+            if not worker.done():
+                new_workers.append(worker)
+                continue
+
+            # Log dead worker, retrieving the exception so it is not reported again
+            exception = None if worker.cancelled() else worker.exception()
+            self.__local_logger.warning(
+                f"Worker died, restarting {worker.get_name()}: {exception}",
+                True,
+            )
+
+            new_workers.append(self.__create_single_worker(index))
+
+        self.__workers = new_workers
+
+        return True
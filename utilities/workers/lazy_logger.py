@@ -0,0 +1,86 @@
+"""
+Level-gated logging with deferred formatting, for hot loops.
+"""
+
+import inspect
+import logging
+
+
+class LazyLogger:
+    """
+    Wraps a worker `Logger` so that a message at a disabled level costs one level check:
+    its arguments are only formatted, and the caller looked up for the frame info,
+    if it is logged.
+
+    Messages are %-style format strings with the arguments passed separately, like `logging` .
+    Anything expensive to compute for a message belongs behind `is_enabled()` .
+    Code that logs on every run, such as the multiprocess example classes,
+    logs at debug level through it so the messages only cost anything when debug is enabled.
+    """
+
+    def __init__(self, local_logger: object) -> None:
+        """
+        local_logger: `Logger` to log through, the underlying `logging.Logger` is its logger.
+        """
+        self.local_logger = local_logger
+        # Its level check is cached by logging
+        self.__logger: "logging.Logger | None" = getattr(local_logger, "logger", None)
+
+    def is_enabled(self, level: int) -> bool:
+        """
+        level: `logging` level, such as `logging.DEBUG` .
+
+        Returns whether messages at the level are logged.
+        """
+        if self.__logger is None:
+            return True
+
+        return self.__logger.isEnabledFor(level)
+
+    @staticmethod
+    def __format(message: str, args: "tuple[object, ...]", log_with_frame_info: bool) -> str:
+        """
+        Formats the message, with the frame info of the caller of the log method
+        in the format of `Logger` .
+        """
+        if len(args) > 0:
+            message = message % args
+
+        if not log_with_frame_info:
+            return message
+
+        # This function, the log method, then its caller
+        frame = inspect.currentframe().f_back.f_back
+        code = frame.f_code
+        return f"[{code.co_filename} | {code.co_name} | {frame.f_lineno}] {message}"
+
+    def debug(self, message: str, *args: object, log_with_frame_info: bool = True) -> None:
+        """
+        Logs at debug level.
+
+        message: Format string for args.
+        log_with_frame_info: Whether to prefix the file, function, and line of the caller.
+        """
+        if self.is_enabled(logging.DEBUG):
+            self.local_logger.debug(self.__format(message, args, log_with_frame_info), False)
+
+    def info(self, message: str, *args: object, log_with_frame_info: bool = True) -> None:
+        """
+        Same as `debug()` at info level.
+        """
+        if self.is_enabled(logging.INFO):
+            self.local_logger.info(self.__format(message, args, log_with_frame_info), False)
+
+    def warning(self, message: str, *args: object, log_with_frame_info: bool = True) -> None:
+        """
+        Same as `debug()` at warning level.
+        """
+        if self.is_enabled(logging.WARNING):
+            self.local_logger.warning(self.__format(message, args, log_with_frame_info), False)
+
+    def error(self, message: str, *args: object, log_with_frame_info: bool = True) -> None:
+        """
+        Same as `debug()` at error level.
+        """
+        if self.is_enabled(logging.ERROR):
+            self.local_logger.error(self.__format(message, args, log_with_frame_info), False)
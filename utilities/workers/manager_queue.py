@@ -0,0 +1,240 @@
+"""
+Manager hosted queue that can be shut down.
+"""
+
+import multiprocessing as mp
+import multiprocessing.managers
+import queue
+import time
+
+from . import queue_shutdown
+from . import shared_memory_block
+
+
+class ShutDownSentinel:  # pylint: disable=too-few-public-methods
+    """
+    Put into the queue on shut down for each blocked get, which returns it and raises `ShutDown` .
+    """
+
+
+class ManagerQueue:
+    """
+    Queue hosted by a manager server process with the same interface as `queue.Queue` .
+
+    The manager cannot wake up a blocked call from the outside. Blocked gets are counted,
+    and shutting down puts a `ShutDownSentinel` after the items for each of them,
+    so they block in a single call. A get that takes a sentinel it was not counted for
+    puts it back. If the queue is full, each get that frees a slot
+    puts one of the sentinels that did not fit.
+
+    A sentinel cannot wake up a put blocked on a full queue, so blocking puts wait in slices
+    of at most `SHUTDOWN_CHECK_PERIOD` and check a shut down flag in shared memory in between.
+    """
+
+    SHUTDOWN_CHECK_PERIOD = 0.01  # seconds
+
+    def __init__(self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int) -> None:
+        """
+        mp_manager: Manager hosting the queue.
+        maxsize: Maximum number of items, <= 0 for infinite.
+        """
+        self.maxsize = maxsize
+        self.__queue = mp_manager.Queue(maxsize)
+        self.__shutdown_flag = shared_memory_block.SharedMemoryBlock(1)
+
+        # Shared by all processes: gets blocked on the manager, sentinels still to put
+        self.__lock = mp.Lock()
+        self.__blocked_get_count = mp.RawValue("i", 0)
+        self.__missing_sentinel_count = mp.RawValue("i", 0)
+
+    def __wait(
+        self,
+        function: "(bool, float | None) -> object",  # type: ignore
+        block: bool,
+        timeout: "float | None",
+        exception: "type[Exception]",
+    ) -> object:
+        """
+        Calls function with block and a timeout of at most the check period
+        until it does not raise exception, the timeout expires, or the queue is shut down.
+        """
+        if not block:
+            return function(False, None)
+
+        if timeout is not None and timeout < 0.0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_shut_down():
+            period = self.SHUTDOWN_CHECK_PERIOD
+            if deadline is not None:
+                period = min(period, max(deadline - time.monotonic(), 0.0))
+
+            try:
+                return function(True, period)
+            except exception:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+        raise queue_shutdown.ShutDown
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Puts an item into the queue.
+
+        block and timeout: Same as `queue.Queue.put()` .
+
+        Raises `queue.Full` if there is no space in time.
+        Raises `ShutDown` if the queue is shut down.
+        """
+        if self.is_shut_down():
+            raise queue_shutdown.ShutDown
+
+        self.__wait(
+            lambda block, timeout: self.__queue.put(item, block, timeout),
+            block,
+            timeout,
+            queue.Full,
+        )
+
+    def __get_blocking(self, timeout: "float | None") -> object:
+        """
+        Waits for an item in a single call, counted so that shutting down wakes it up.
+
+        Raises `queue.Empty` if there is no item in time.
+        Raises `ShutDown` if the queue is shut down before the call.
+        """
+        if timeout is not None and timeout < 0.0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        # The count and the flag change together, so a shut down either sees this get or stops it
+        with self.__lock:
+            if self.is_shut_down():
+                raise queue_shutdown.ShutDown
+
+            self.__blocked_get_count.value += 1
+
+        try:
+            return self.__queue.get(True, timeout)
+        finally:
+            with self.__lock:
+                self.__blocked_get_count.value -= 1
+
+    def __put_sentinel(self) -> None:
+        """
+        Puts a sentinel, or counts it as missing if the queue is full.
+        """
+        try:
+            self.__queue.put(ShutDownSentinel(), False)
+        except queue.Full:
+            with self.__lock:
+                self.__missing_sentinel_count.value += 1
+
+    def __put_missing_sentinel(self) -> None:
+        """
+        Puts a sentinel that did not fit into the slot a get just freed.
+        """
+        with self.__lock:
+            if self.__missing_sentinel_count.value == 0:
+                return
+
+            self.__missing_sentinel_count.value -= 1
+
+        self.__put_sentinel()
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Removes and returns an item from the queue.
+
+        block and timeout: Same as `queue.Queue.get()` .
+
+        Raises `queue.Empty` if there is no item in time.
+        Raises `ShutDown` if the queue is shut down and empty.
+        """
+        # Only a counted get owns the sentinel it receives
+        is_counted = block
+        try:
+            item = self.__get_blocking(timeout) if block else self.__queue.get(False)
+        except (queue.Empty, queue_shutdown.ShutDown):
+            if not self.is_shut_down():
+                raise
+
+            # Items put before the shut down are still delivered
+            is_counted = False
+            try:
+                item = self.__queue.get(False)
+            except queue.Empty:
+                raise queue_shutdown.ShutDown from None
+
+        if isinstance(item, ShutDownSentinel):
+            # The items put before the shut down are all ahead of the sentinels
+            if not is_counted:
+                # It belongs to a blocked get
+                self.__put_sentinel()
+
+            raise queue_shutdown.ShutDown
+
+        if self.is_shut_down():
+            self.__put_missing_sentinel()
+
+        return item
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Same as `put(item, False)` .
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Same as `get(False)` .
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Returns the number of items in the queue, including sentinels once shut down.
+        """
+        return self.__queue.qsize()
+
+    def empty(self) -> bool:
+        """
+        Returns whether the queue is empty.
+        """
+        return self.__queue.empty()
+
+    def full(self) -> bool:
+        """
+        Returns whether the queue is full.
+        """
+        return self.__queue.full()
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Shuts down the queue, blocked gets return at once and blocked puts within the check period.
+
+        immediate: Whether to discard the items in the queue,
+            otherwise gets return them until it is empty.
+        """
+        with self.__lock:
+            # Gets that blocked before an earlier shut down already have their sentinels
+            sentinel_count = 0 if self.is_shut_down() else self.__blocked_get_count.value
+            self.__shutdown_flag.buf[0] = 1
+
+        if immediate:
+            # Sentinels are discarded with the items, they are put back after
+            try:
+                while True:
+                    if isinstance(self.__queue.get(False), ShutDownSentinel):
+                        sentinel_count += 1
+            except queue.Empty:
+                pass
+
+        for _ in range(sentinel_count):
+            self.__put_sentinel()
+
+    def is_shut_down(self) -> bool:
+        """
+        Returns whether the queue has been shut down.
+        """
+        return self.__shutdown_flag.buf[0] != 0
@@ -0,0 +1,82 @@
+"""
+Wake up for waits over several queues.
+"""
+
+import multiprocessing as mp
+import struct
+
+from . import shared_memory_block
+
+
+class QueueNotifier:
+    """
+    Generation counter in shared memory incremented on every put into and shut down of
+    the queues sharing the notifier, with a condition waiters block on until it changes.
+
+    Waiters read the generation before checking the queues,
+    so a put after the check always wakes them up.
+    """
+
+    __GENERATION_FORMAT = "=Q"
+    __BLOCK_SIZE = 8  # bytes
+
+    def __init__(self) -> None:
+        """
+        Constructor creates the counter and the condition.
+        """
+        self.__block = shared_memory_block.SharedMemoryBlock(self.__BLOCK_SIZE)
+
+        self.__lock = mp.Lock()
+        self.__changed = mp.Condition(self.__lock)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Copies in other processes are equal, since they share the counter.
+        """
+        if not isinstance(other, QueueNotifier):
+            return NotImplemented
+
+        return self.get_name() == other.get_name()
+
+    def __hash__(self) -> int:
+        """
+        Same for equal notifiers.
+        """
+        return hash(self.get_name())
+
+    def get_name(self) -> str:
+        """
+        Returns the name of the shared counter, the same in every process.
+        """
+        return self.__block.name
+
+    def get_generation(self) -> int:
+        """
+        Returns the number of notifications so far.
+        """
+        (generation,) = struct.unpack_from(self.__GENERATION_FORMAT, self.__block.buf, 0)
+        return generation
+
+    def notify(self) -> None:
+        """
+        Increments the generation and wakes up all waiters.
+        """
+        with self.__lock:
+            struct.pack_into(
+                self.__GENERATION_FORMAT, self.__block.buf, 0, self.get_generation() + 1
+            )
+            self.__changed.notify_all()
+
+    def wait(self, generation: int, timeout: "float | None" = None) -> bool:
+        """
+        Blocks until the generation differs from the given one.
+
+        timeout: Seconds, None to wait forever.
+
+        Returns whether the generation changed.
+        """
+        if timeout is not None and timeout <= 0.0:
+            return self.get_generation() != generation
+
+        with self.__lock:
+            return self.__changed.wait_for(lambda: self.get_generation() != generation, timeout)
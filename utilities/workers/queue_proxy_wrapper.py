@@ -2,59 +2,766 @@
 Queue.
 """
 
+import collections
+import collections.abc
+import enum
+import io
+import multiprocessing as mp
 import multiprocessing.managers
+import pickle
 import queue
 import time
 
+from . import manager_queue
+from . import queue_notifier
+from . import queue_shutdown
+from . import queue_statistics
+from . import shared_memory_mailbox
+from . import shared_memory_queue
 
-class QueueProxyWrapper:
+
+# Raised by puts after shut down and by gets once the queue is also empty
+ShutDown = queue_shutdown.ShutDown
+
+
+class QueueBackend(enum.Enum):
+    """
+    Underlying queue implementation.
+    """
+
+    # Queue hosted by the manager server process, every access is a round trip to it
+    MANAGER = 0
+    # Ring buffer in shared memory, must be bounded
+    SHARED_MEMORY = 1
+    # Single slot in shared memory holding only the newest item, puts never block
+    CONFLATING = 2
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    What a put does when a bounded queue is full.
+    """
+
+    # Wait for space up to the timeout, then raise `queue.Full`
+    BLOCK = 0
+    # Remove the oldest item in the queue to make space
+    DROP_OLDEST = 1
+    # Drop the item being put
+    DROP_NEWEST = 2
+    # Drop the items being put except every Nth, which replaces the oldest item in the queue
+    SAMPLE = 3
+
+
+class ItemBatch:
+    """
+    Several items sent as a single queue item, unpacked by `QueueProxyWrapper.get()` .
+
+    Items are pickled back to back as they are added, so sending a growing batch
+    copies the bytes instead of pickling every item again.
+    """
+
+    def __init__(self, data: bytes, count: int) -> None:
+        """
+        data: Pickled items back to back.
+        count: Number of items.
+        """
+        self.data = data
+        self.count = count
+
+    @staticmethod
+    def pickle_item(item: object) -> bytes:
+        """
+        Returns the item pickled for the data of a batch.
+        """
+        return pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+
+    def unpack(self) -> "list[object]":
+        """
+        Returns the items in order.
+        """
+        stream = io.BytesIO(self.data)
+        return [pickle.load(stream) for _ in range(self.count)]
+
+
+class QueueProxyWrapper:  # pylint: disable=too-many-instance-attributes
     """
     Wrapper for an underlying queue proxy which also stores `maxsize`.
 
     `maxsize <= 0` means infinite size.
+
+    Batches count as a single item towards `maxsize` ,
+    and are sent before they outgrow a slot of the shared memory backends.
+    Producers and consumers should use the methods of this class rather than the queue directly,
+    which unpack batches and keep per process state.
     """
 
-    __QUEUE_TIMEOUT = 0.1  # seconds
-    __QUEUE_DELAY = 0.1  # seconds
+    DEFAULT_MAX_BATCH_SIZE = 16
+    DEFAULT_MAX_HOLD_TIME = 0.01  # seconds
+    DEFAULT_SAMPLE_INTERVAL = 10
+
+    # Indices of the drop counters
+    __DROPPED_NEWEST = 0
+    __DROPPED_OLDEST = 1
+
+    # Upper bound of the pickled size of a batch with a statistics stamp, besides its items
+    __BATCH_OVERHEAD = len(
+        pickle.dumps(
+            queue_statistics.StampedItem(ItemBatch(bytes(1 << 16), 1 << 62), 1 << 63),
+            pickle.HIGHEST_PROTOCOL,
+        )
+    ) - (1 << 16)
+
+    def __init__(
+        self,
+        mp_manager: multiprocessing.managers.SyncManager | None,
+        maxsize: int = 0,
+        backend: QueueBackend = QueueBackend.MANAGER,
+        adaptive_batching: bool = False,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_hold_time: float = DEFAULT_MAX_HOLD_TIME,
+        statistics_name: "str | None" = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        put_timeout: "float | None" = None,
+        sample_interval: int = DEFAULT_SAMPLE_INTERVAL,
+        notifier: queue_notifier.QueueNotifier | None = None,
+        producer_count: int = 1,
+        slot_size: int = shared_memory_queue.SharedMemoryQueue.DEFAULT_SLOT_SIZE,
+    ) -> None:
+        """
+        mp_manager: Manager hosting the queue, unused by the shared memory backend.
+        maxsize: Maximum number of items, ignored by the conflating backend which holds 1 .
+        backend: Underlying queue implementation.
+        adaptive_batching: Whether `put()` coalesces items while the queue is full
+            instead of blocking, until `max_batch_size` items are pending.
+            Only has an effect on bounded queues.
+        max_batch_size: Maximum number of items sent in a single batch, must be greater than 0 .
+        max_hold_time: Seconds adaptive batching holds an item before the next `put()`
+            or `poll()` sends it regardless, waiting for space like a normal put.
+        statistics_name: If given, depth, rates, blocked and waiting times, and dwell times
+            are recorded under this name in `statistics` , otherwise it is None.
+        overflow_policy: What puts do when the queue is full.
+            Only has an effect on bounded queues, the conflating backend always replaces its item.
+        put_timeout: Time in seconds blocking puts wait for space when the call does not
+            give a timeout, None to wait forever. Only used by `OverflowPolicy.BLOCK` .
+        sample_interval: N of `OverflowPolicy.SAMPLE` , must be greater than 0 .
+        notifier: If given, notified on every put and shut down so `select()` wakes up.
+            Queues waited on together must share the same notifier.
+        producer_count: Number of producers that `close()` the queue,
+            it is shut down once all of them have.
+        slot_size: Maximum size in bytes of a pickled item in the shared memory
+            and conflating backends, unused by the manager backend.
+        """
+        # Per process: maximum size of the pickled items of a batch, None if unlimited
+        self.__max_batch_data_size = None
+        if backend == QueueBackend.SHARED_MEMORY:
+            self.queue = shared_memory_queue.SharedMemoryQueue(maxsize, slot_size)
+            self.__max_batch_data_size = slot_size - self.__BATCH_OVERHEAD
+        elif backend == QueueBackend.CONFLATING:
+            self.queue = shared_memory_mailbox.SharedMemoryMailbox(slot_size)
+            maxsize = self.queue.maxsize
+            self.__max_batch_data_size = slot_size - self.__BATCH_OVERHEAD
+        else:
+            self.queue = manager_queue.ManagerQueue(mp_manager, maxsize)
 
-    def __init__(self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int = 0) -> None:
-        self.queue = mp_manager.Queue(maxsize)
         self.maxsize = maxsize
+        self.backend = backend
+
+        self.statistics = None
+        if statistics_name is not None:
+            self.statistics = queue_statistics.QueueStatistics(statistics_name)
+
+        self.notifier = notifier
+
+        self.overflow_policy = overflow_policy
+        self.__put_timeout = put_timeout
+        self.__sample_interval = max(sample_interval, 1)
+        # Shared by all processes: items dropped instead of being put, items removed from the queue
+        self.__drop_counts = mp.Array("Q", 2)
+        # Shared by all processes: producers that have not closed the queue
+        self.__open_producer_count = mp.Value("i", max(producer_count, 1))
+        # Per process: consecutive puts that found the queue full
+        self.__overflow_count = 0
+
+        self.__adaptive_batching = adaptive_batching
+        self.__max_batch_size = max(max_batch_size, 1)
+        self.__max_hold_time = max_hold_time
+
+        # Per process: items coalesced by this producer, pickled back to back,
+        # and when the first of them has to be sent
+        self.__pending_data = bytearray()
+        self.__pending_count = 0
+        self.__hold_deadline = 0.0
+        # Per process: items unpacked by this consumer
+        self.__received_items: "collections.deque[object]" = collections.deque()
+
+    def __fits_batch(self, data_size: int) -> bool:
+        """
+        Whether a batch of items pickled to data_size bytes fits in a slot.
+        """
+        return self.__max_batch_data_size is None or data_size <= self.__max_batch_data_size
+
+    def __split(self, items: "list[object]") -> "collections.abc.Iterator[tuple[object, int]]":
+        """
+        Groups items into batches of up to `max_batch_size` items that fit in a slot,
+        pickling each item once. Single items are sent as is.
+
+        Yields the payloads and their numbers of items, in order.
+        """
+        batch_items: "list[object]" = []
+        batch_data = bytearray()
+        for item in items:
+            data = ItemBatch.pickle_item(item)
+            if len(batch_items) > 0 and (
+                len(batch_items) == self.__max_batch_size
+                or not self.__fits_batch(len(batch_data) + len(data))
+            ):
+                yield self.__pack(batch_items, batch_data), len(batch_items)
+                batch_items = []
+                batch_data = bytearray()
+
+            batch_items.append(item)
+            batch_data += data
+
+        if len(batch_items) > 0:
+            yield self.__pack(batch_items, batch_data), len(batch_items)
+
+    @staticmethod
+    def __pack(items: "list[object]", data: bytearray) -> object:
+        """
+        Single items are sent as is.
+
+        data: The items pickled back to back.
+        """
+        if len(items) == 1:
+            return items[0]
+
+        return ItemBatch(bytes(data), len(items))
+
+    def __hold(self, data: bytes) -> None:
+        """
+        Adds the pickled item to the items held by adaptive batching.
+        """
+        if self.__pending_count == 0:
+            self.__hold_deadline = time.monotonic() + self.__max_hold_time
+
+        self.__pending_data += data
+        self.__pending_count += 1
+
+    def __get_pending_batch(self) -> ItemBatch:
+        """
+        Returns the held items as a batch, they are still held.
+        """
+        return ItemBatch(bytes(self.__pending_data), self.__pending_count)
+
+    def __clear_pending(self) -> None:
+        """
+        Stops holding the held items.
+        """
+        self.__pending_data = bytearray()
+        self.__pending_count = 0
+
+    def __send(
+        self, payload: object, item_count: int, block: bool, timeout: "float | None"
+    ) -> None:
+        """
+        Same as `__put_payload()` , notifying if enabled.
+        """
+        self.__put_payload(payload, item_count, block, timeout)
+
+        if self.notifier is not None:
+            self.notifier.notify()
+
+    def __put_payload(
+        self, payload: object, item_count: int, block: bool, timeout: "float | None"
+    ) -> None:
+        """
+        Puts a payload of item_count items into the queue, recording statistics if enabled.
+        """
+        if self.statistics is None:
+            self.queue.put(payload, block, timeout)
+            return
+
+        payload = queue_statistics.StampedItem(payload, time.monotonic_ns())
+        try:
+            self.queue.put(payload, False)
+            self.statistics.record_put(item_count, None)
+            return
+        except queue.Full:
+            if not block:
+                raise
+
+        # Only time the put if the queue was full
+        start = time.monotonic_ns()
+        try:
+            self.queue.put(payload, True, timeout)
+        except queue.Full:
+            self.statistics.record_put(0, time.monotonic_ns() - start)
+            raise
+
+        self.statistics.record_put(item_count, time.monotonic_ns() - start)
+
+    @staticmethod
+    def __count_items(payload: object) -> int:
+        """
+        Number of items in a payload taken from the queue.
+        """
+        if isinstance(payload, queue_statistics.StampedItem):
+            payload = payload.item
 
-    def fill_queue_with_sentinel(self, timeout: float = 0.0) -> None:
+        if isinstance(payload, ItemBatch):
+            return payload.count
+
+        return 1
+
+    def __record_drop(self, item_count: int, oldest: bool) -> None:
+        """
+        Counts dropped items, recording statistics if enabled.
+        """
+        index = self.__DROPPED_OLDEST if oldest else self.__DROPPED_NEWEST
+        with self.__drop_counts.get_lock():
+            self.__drop_counts[index] += item_count
+
+        if self.statistics is not None:
+            self.statistics.record_drop(item_count, oldest)
+
+    def __replace_oldest(self, payload: object, item_count: int) -> None:
+        """
+        Removes the oldest payloads until the payload fits.
+        Another producer may take the space first, so this can take several removals.
         """
-        Fills the queue with sentinel (None).
+        while True:
+            try:
+                oldest = self.queue.get_nowait()
+            except queue.Empty:
+                # A consumer made space
+                pass
+            else:
+                self.__record_drop(self.__count_items(oldest), True)
 
-        timeout: Time waiting before giving up, must be greater than 0 .
+            try:
+                self.__send(payload, item_count, False, None)
+                return
+            except queue.Full:
+                pass
+
+    def __offer(
+        self, payload: object, item_count: int, block: bool, timeout: "float | None"
+    ) -> None:
+        """
+        Same as `__send()` , applying the overflow policy when the queue is full.
         """
-        if timeout <= 0.0:
-            timeout = self.__QUEUE_TIMEOUT
+        if (
+            self.overflow_policy == OverflowPolicy.BLOCK
+            or self.maxsize <= 0
+            or self.backend == QueueBackend.CONFLATING
+        ):
+            if timeout is None:
+                timeout = self.__put_timeout
+
+            self.__send(payload, item_count, block, timeout)
+            return
 
         try:
-            for _ in range(self.maxsize):
-                self.queue.put(None, timeout=timeout)
+            self.__send(payload, item_count, False, None)
+            self.__overflow_count = 0
+            return
         except queue.Full:
+            self.__overflow_count += 1
+
+        if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+            self.__replace_oldest(payload, item_count)
             return
 
-    def drain_queue(self, timeout: float = 0.0) -> None:
+        if (
+            self.overflow_policy == OverflowPolicy.SAMPLE
+            and self.__overflow_count % self.__sample_interval == 0
+        ):
+            self.__replace_oldest(payload, item_count)
+            return
+
+        self.__record_drop(item_count, False)
+
+    def __get_payload(
+        self, block: bool, timeout: "float | None", latest: bool
+    ) -> "tuple[object, int]":
         """
-        Drains the queue.
+        Gets a payload from the queue.
 
-        timeout: Time waiting in seconds before giving up, must be greater than 0 .
+        latest: Whether to use `get_latest()` of the conflating backend.
+
+        Returns the payload and the number of items skipped by `get_latest()` .
+        """
+        if latest:
+            return self.queue.get_latest(block, timeout)
+
+        return self.queue.get(block, timeout), 0
+
+    def __receive(self, block: bool, timeout: "float | None", latest: bool) -> "tuple[object, int]":
+        """
+        Same as `__get_payload()` , recording statistics if enabled.
         """
-        if timeout <= 0.0:
-            timeout = self.__QUEUE_TIMEOUT
+        if self.statistics is None:
+            return self.__get_payload(block, timeout, latest)
 
+        waited_ns = None
         try:
-            for _ in range(self.maxsize):
-                self.queue.get(timeout=timeout)
+            payload, skipped = self.__get_payload(False, None, latest)
         except queue.Empty:
+            if not block:
+                raise
+
+            # Only time the get if the queue was empty
+            start = time.monotonic_ns()
+            try:
+                payload, skipped = self.__get_payload(True, timeout, latest)
+            except queue.Empty:
+                self.statistics.record_get(0, time.monotonic_ns() - start, None)
+                raise
+
+            waited_ns = time.monotonic_ns() - start
+
+        dwell_ns = None
+        if isinstance(payload, queue_statistics.StampedItem):
+            dwell_ns = time.monotonic_ns() - payload.put_time_ns
+            payload = payload.item
+
+        item_count = payload.count if isinstance(payload, ItemBatch) else 1
+        self.statistics.record_get(item_count + skipped, waited_ns, dwell_ns)
+
+        return payload, skipped
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Puts an item into the queue.
+
+        With adaptive batching, the item is sent immediately if the consumer is keeping up.
+        Otherwise it is held and sent as part of a batch once the queue has space,
+        `max_batch_size` items are pending, or the first of them has been held for
+        `max_hold_time` , only then applying the overflow policy.
+        Held items are sent first if this item would make their batch outgrow a slot,
+        and an item too large to batch is sent on its own.
+
+        block and timeout: Same as `queue.Queue.put()` , only used by `OverflowPolicy.BLOCK` .
+
+        Raises `queue.Full` if the item could not be put in time.
+        Items dropped by the other overflow policies are counted instead.
+        Raises `ShutDown` if the queue is shut down.
+        """
+        if not self.__adaptive_batching or self.maxsize <= 0:
+            self.__offer(item, 1, block, timeout)
+            return
+
+        if self.__pending_count == 0:
+            try:
+                self.__send(item, 1, False, None)
+                return
+            except queue.Full:
+                # Consumer is lagging, start coalescing
+                pass
+
+        data = ItemBatch.pickle_item(item)
+        if not self.__fits_batch(len(self.__pending_data) + len(data)):
+            if self.__pending_count > 0:
+                self.__offer(self.__get_pending_batch(), self.__pending_count, block, timeout)
+                self.__clear_pending()
+
+            if not self.__fits_batch(len(data)):
+                self.__offer(item, 1, block, timeout)
+                return
+
+        held_size = len(self.__pending_data)
+        self.__hold(data)
+        if self.__pending_count > 1:
+            try:
+                self.flush(False)
+                return
+            except queue.Full:
+                pass
+
+        if self.__pending_count < self.__max_batch_size and time.monotonic() < self.__hold_deadline:
+            # Keep coalescing
+            return
+
+        try:
+            self.__offer(self.__get_pending_batch(), self.__pending_count, block, timeout)
+        except queue.Full:
+            # The caller keeps this item
+            del self.__pending_data[held_size:]
+            self.__pending_count -= 1
+            raise
+
+        self.__clear_pending()
+
+    def put_many(
+        self, items: "list[object]", block: bool = True, timeout: "float | None" = None
+    ) -> None:
+        """
+        Puts items into the queue in batches of up to `max_batch_size` that fit in a slot.
+        Items held by adaptive batching are sent first, as a batch of their own.
+        The conflating backend only keeps the last item.
+
+        block and timeout: Same as `queue.Queue.put()` , applied to each batch
+            and only used by `OverflowPolicy.BLOCK` .
+
+        Raises `queue.Full` if a batch could not be put in time,
+        earlier batches have already been put.
+        """
+        items = list(items)
+        if self.__pending_count > 0:
+            self.__offer(self.__get_pending_batch(), self.__pending_count, block, timeout)
+            self.__clear_pending()
+
+        if self.backend == QueueBackend.CONFLATING:
+            if self.statistics is not None and len(items) > 0:
+                # Only the last item is sent
+                items[-1] = queue_statistics.StampedItem(items[-1], time.monotonic_ns())
+                self.statistics.record_put(len(items), None)
+
+            self.queue.put_many(items)
+            if self.notifier is not None and len(items) > 0:
+                self.notifier.notify()
+
+            return
+
+        for payload, item_count in self.__split(items):
+            self.__offer(payload, item_count, block, timeout)
+
+    def flush(self, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Sends items held by adaptive batching.
+
+        block and timeout: Same as `queue.Queue.put()` .
+
+        Raises `queue.Full` if the items could not be put in time, they remain held.
+        """
+        if self.__pending_count == 0:
+            return
+
+        self.__send(self.__get_pending_batch(), self.__pending_count, block, timeout)
+        self.__clear_pending()
+
+    def poll(self) -> None:
+        """
+        Sends items held by adaptive batching once the first of them has been held for
+        `max_hold_time` , applying the overflow policy like `put()` .
+        Producers that stop putting, such as while waiting for input, call it so held items
+        are not delayed further, `get_hold_timeout()` is when it has to be called.
+
+        Raises `queue.Full` if the items could not be put in time, they remain held.
+        Raises `ShutDown` if the queue is shut down.
+        """
+        if self.__pending_count == 0 or time.monotonic() < self.__hold_deadline:
             return
 
-    def fill_and_drain_queue(self) -> None:
+        self.__offer(self.__get_pending_batch(), self.__pending_count, True, None)
+        self.__clear_pending()
+
+    def get_hold_timeout(self) -> "float | None":
+        """
+        Returns the seconds until `poll()` sends the held items, None if none is held.
+        """
+        if self.__pending_count == 0:
+            return None
+
+        return max(self.__hold_deadline - time.monotonic(), 0.0)
+
+    def __drop_pending(self) -> None:
+        """
+        Discards the held items, counting them as dropped.
+        """
+        if self.__pending_count > 0:
+            self.__record_drop(self.__pending_count, False)
+
+        self.__clear_pending()
+
+    def get_drop_counts(self) -> "dict[str, int]":
+        """
+        Returns the number of items dropped by the overflow policy across all producers:
+        newest were dropped instead of being put, oldest were removed from the queue.
+        Items still held by adaptive batching when the queue is shut down count as newest.
+        """
+        with self.__drop_counts.get_lock():
+            return {
+                "newest": self.__drop_counts[self.__DROPPED_NEWEST],
+                "oldest": self.__drop_counts[self.__DROPPED_OLDEST],
+            }
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Removes and returns an item from the queue, unpacking batches.
+
+        block and timeout: Same as `queue.Queue.get()` .
+
+        Raises `queue.Empty` if there is no item in time.
+        Raises `ShutDown` if the queue is shut down and empty.
+        """
+        if len(self.__received_items) > 0:
+            return self.__received_items.popleft()
+
+        item, _ = self.__receive(block, timeout, False)
+        if isinstance(item, ItemBatch):
+            items = item.unpack()
+            self.__received_items.extend(items[1:])
+            return items[0]
+
+        return item
+
+    def get_latest(
+        self, block: bool = True, timeout: "float | None" = None
+    ) -> "tuple[object, int]":
+        """
+        Removes and returns the newest available item, discarding older ones.
+
+        block and timeout: Same as `queue.Queue.get()` , waiting for the first item.
+
+        Returns the item and the number of older items that were skipped.
+        Raises `queue.Empty` if there is no item in time.
+        Raises `ShutDown` if the queue is shut down and empty.
+        """
+        if self.backend == QueueBackend.CONFLATING and len(self.__received_items) == 0:
+            return self.__receive(block, timeout, True)
+
+        item = self.get(block, timeout)
+        skipped = 0
+        while True:
+            try:
+                newer_item = self.get(False)
+            except (queue.Empty, queue_shutdown.ShutDown):
+                return item, skipped
+
+            item = newer_item
+            skipped += 1
+
+    def get_many(self, max_items: int, timeout: "float | None" = None) -> "list[object]":
+        """
+        Removes and returns up to max_items items that are available,
+        waiting only for the first one.
+
+        timeout: Time waiting in seconds for the first item, None to wait forever.
+
+        Returns an empty list if there is no item in time.
+        Raises `ShutDown` if the queue is shut down and empty.
+        """
+        items = []
+        if max_items <= 0:
+            return items
+
+        try:
+            items.append(self.get(True, timeout))
+            while len(items) < max_items:
+                items.append(self.get(False))
+        except queue.Empty:
+            pass
+        except queue_shutdown.ShutDown:
+            if len(items) == 0:
+                raise
+
+        return items
+
+    def close(self) -> None:
+        """
+        Ends the stream of this producer: sends the items it holds, waiting for space,
+        then shuts down the queue if it is the last of `producer_count` producers to close it.
+
+        Workers close their output queues when they exit,
+        so end of stream propagates stage by stage to main once every worker of a stage exits.
+        """
+        try:
+            self.flush(True, self.__put_timeout)
+        except (queue.Full, queue_shutdown.ShutDown):
+            self.__drop_pending()
+
+        with self.__open_producer_count.get_lock():
+            self.__open_producer_count.value -= 1
+            if self.__open_producer_count.value > 0:
+                return
+
+        self.shutdown()
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Shuts down the queue: puts raise `ShutDown` and gets raise it once the queue is empty.
+        Wakes up all producers and consumers blocked on the queue.
+
+        Producers should `close()` the queue instead, this is for stopping every producer.
+
+        immediate: Whether to discard the items in the queue and held by adaptive batching.
+            Otherwise held items are sent if there is space, and dropped if not.
+            Held items that are not sent are counted as dropped newest.
+        """
+        if immediate:
+            self.__drop_pending()
+
+        try:
+            self.flush(False)
+        except (queue.Full, queue_shutdown.ShutDown):
+            self.__drop_pending()
+
+        self.queue.shutdown(immediate)
+
+        if self.notifier is not None:
+            self.notifier.notify()
+
+    def is_ready(self) -> bool:
         """
-        Fill with sentinel and then drain.
+        Returns whether a get would not block: there is an item, or the queue is shut down.
+        """
+        return len(self.__received_items) > 0 or self.queue.qsize() > 0 or self.queue.is_shut_down()
+
+    def is_shut_down(self) -> bool:
+        """
+        Returns whether the queue has been shut down.
+        """
+        return self.queue.is_shut_down()
+
+    def drain_until_shut_down(self, timeout: float) -> "list[object]":
+        """
+        Removes and returns the items in the queue until it is shut down and empty.
+
+        timeout: Time in seconds to wait for the shut down, after which the items so far are returned.
         """
-        self.fill_queue_with_sentinel()
-        time.sleep(self.__QUEUE_DELAY)
-        self.drain_queue()
+        items = []
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                items.append(self.get(timeout=max(deadline - time.monotonic(), 0.0)))
+        except (queue.Empty, queue_shutdown.ShutDown):
+            pass
+
+        return items
+
+
+def select(
+    queues: "list[QueueProxyWrapper]", timeout: "float | None" = None
+) -> "list[QueueProxyWrapper]":
+    """
+    Blocks until any of the queues is ready, like `select.select()` for file descriptors.
+    Shut down queues are ready, their gets raise `ShutDown` once empty.
+
+    queues: Queues created with the same notifier.
+    timeout: Seconds, None to wait forever.
+
+    Returns the ready queues, empty if none is ready in time.
+    Raises `ValueError` if the queues do not share a notifier.
+    """
+    if len(queues) == 0:
+        raise ValueError("No queues to select")
+
+    notifier = queues[0].notifier
+    if notifier is None or any(input_queue.notifier != notifier for input_queue in queues):
+        raise ValueError("Selected queues must share a notifier")
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        # Read before checking, a put after the check changes it
+        generation = notifier.get_generation()
+
+        ready_queues = [input_queue for input_queue in queues if input_queue.is_ready()]
+        if len(ready_queues) > 0:
+            return ready_queues
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0.0:
+            return []
+
+        notifier.wait(generation, remaining)
@@ -0,0 +1,12 @@
+"""
+Queue shut down signal.
+"""
+
+
+class ShutDown(Exception):
+    """
+    Raised by put on a queue that has been shut down,
+    and by get on a queue that has been shut down and is empty.
+
+    Same as `queue.ShutDown` in Python 3.13 .
+    """
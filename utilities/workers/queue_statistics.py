@@ -0,0 +1,367 @@
+"""
+Queue instrumentation shared between processes.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import pathlib
+import struct
+import time
+
+from . import shared_memory_block
+
+
+class StampedItem:
+    """
+    Queue item with the time it was put, for the dwell time.
+    """
+
+    def __init__(self, item: object, put_time_ns: int) -> None:
+        self.item = item
+        self.put_time_ns = put_time_ns
+
+    def __reduce__(self) -> "tuple":
+        return StampedItem, (self.item, self.put_time_ns)
+
+
+class QueueStatisticsSample:  # pylint: disable=too-many-instance-attributes
+    """
+    Totals of a queue at one point in time, from `QueueStatistics.sample()` .
+
+    Histograms count durations in buckets of powers of 2 microseconds:
+    bucket 0 is below 1 us, bucket i is [2^(i-1), 2^i) us, and the last bucket has no upper bound.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sample_time: float,
+        totals: "dict[str, int]",
+        high_water_depth: int,
+        histograms: "dict[str, list[int]]",
+    ) -> None:
+        """
+        sample_time: `time.monotonic()` when sampled.
+        """
+        self.name = name
+        self.sample_time = sample_time
+        self.put_count = totals["put_count"]
+        self.get_count = totals["get_count"]
+        # Removed from the queue to make space, and never put because the queue was full
+        self.dropped_oldest_count = totals["dropped_oldest_count"]
+        self.dropped_newest_count = totals["dropped_newest_count"]
+        self.depth = max(self.put_count - self.get_count - self.dropped_oldest_count, 0)
+        self.high_water_depth = high_water_depth
+        # Puts that found the queue full and gets that found it empty
+        self.blocked_put_count = totals["blocked_put_count"]
+        self.blocked_put_time = totals["blocked_put_ns"] / 1e9
+        self.waiting_get_count = totals["waiting_get_count"]
+        self.waiting_get_time = totals["waiting_get_ns"] / 1e9
+        self.dwell_count = totals["dwell_count"]
+        self.dwell_time = totals["dwell_ns"] / 1e9
+        self.histograms = histograms
+
+    def rates_since(self, previous: "QueueStatisticsSample") -> "tuple[float, float]":
+        """
+        Returns the put and get rates in items per second since the previous sample.
+        """
+        elapsed = self.sample_time - previous.sample_time
+        if elapsed <= 0.0:
+            return 0.0, 0.0
+
+        return (
+            (self.put_count - previous.put_count) / elapsed,
+            (self.get_count - previous.get_count) / elapsed,
+        )
+
+    def summary(self, previous: "QueueStatisticsSample | None" = None) -> str:
+        """
+        Single line description, with rates if there is a previous sample.
+        """
+        text = f"{self.name}: depth {self.depth} (high water {self.high_water_depth})"
+        if previous is not None:
+            put_rate, get_rate = self.rates_since(previous)
+            text += f", put {put_rate:.1f}/s, get {get_rate:.1f}/s"
+
+        dropped_count = self.dropped_oldest_count + self.dropped_newest_count
+        if dropped_count > 0:
+            text += f", dropped {dropped_count}"
+
+        mean_dwell_ms = self.dwell_time / self.dwell_count * 1e3 if self.dwell_count > 0 else 0.0
+        return (
+            text + f", blocked on full {self.blocked_put_time:.3f} s ({self.blocked_put_count}), "
+            f"waiting on empty {self.waiting_get_time:.3f} s ({self.waiting_get_count}), "
+            f"mean dwell {mean_dwell_ms:.3f} ms"
+        )
+
+    def to_dict(self) -> dict:
+        """
+        JSON serializable form.
+        """
+        return {
+            "name": self.name,
+            "put_count": self.put_count,
+            "get_count": self.get_count,
+            "dropped_oldest_count": self.dropped_oldest_count,
+            "dropped_newest_count": self.dropped_newest_count,
+            "depth": self.depth,
+            "high_water_depth": self.high_water_depth,
+            "blocked_put_count": self.blocked_put_count,
+            "blocked_put_time": self.blocked_put_time,
+            "waiting_get_count": self.waiting_get_count,
+            "waiting_get_time": self.waiting_get_time,
+            "dwell_count": self.dwell_count,
+            "dwell_time": self.dwell_time,
+            "histograms_us_log2": self.histograms,
+        }
+
+
+class QueueStatistics:  # pylint: disable=too-many-instance-attributes
+    """
+    Counters and histograms of a queue, updated by every process using it.
+
+    Each process writes only to its own row in shared memory, so recording takes no lock
+    and costs a few field writes. Sampling sums the rows.
+    Depth is computed from the counts when recording a put, so with concurrent consumers
+    the high water depth can be off by the gets not recorded yet.
+    """
+
+    DEFAULT_MAX_PROCESS_COUNT = 16
+    HISTOGRAM_BUCKET_COUNT = 24
+    HISTOGRAM_NAMES = ("blocked_put", "waiting_get", "dwell")
+
+    # Header: number of rows taken
+    __ROW_COUNT = struct.Struct("=Q")
+    __HEADER_SIZE = 64  # bytes
+    # Row: process ID, totals, then the histograms
+    __TOTAL_NAMES = (
+        "put_count",
+        "get_count",
+        "dropped_oldest_count",
+        "dropped_newest_count",
+        "high_water_depth",
+        "blocked_put_count",
+        "blocked_put_ns",
+        "waiting_get_count",
+        "waiting_get_ns",
+        "dwell_count",
+        "dwell_ns",
+    )
+    __FIELD = struct.Struct("=Q")
+    # Put, get, and dropped oldest counts
+    __DEPTH_COUNTS = struct.Struct("=QQQ")
+    __TOTALS = struct.Struct(f"={1 + len(__TOTAL_NAMES)}Q")
+    __PUT_COUNT_FIELD = 1
+    __GET_COUNT_FIELD = 2
+    __DROPPED_OLDEST_FIELD = 3
+    __DROPPED_NEWEST_FIELD = 4
+    __HIGH_WATER_FIELD = 5
+    # Count field of each duration, followed by its total
+    __BLOCKED_PUT_FIELD = 6
+    __WAITING_GET_FIELD = 8
+    __DWELL_FIELD = 10
+    __HISTOGRAM_FIELD = 1 + len(__TOTAL_NAMES)
+    __ROW_LENGTH = __HISTOGRAM_FIELD + len(HISTOGRAM_NAMES) * HISTOGRAM_BUCKET_COUNT
+
+    def __init__(self, name: str, max_process_count: int = DEFAULT_MAX_PROCESS_COUNT) -> None:
+        """
+        name: Queue name used in samples and dumps.
+        max_process_count: Maximum number of processes recording, others are ignored.
+        """
+        self.name = name
+        self.__max_process_count = max_process_count
+        self.__row_size = self.__ROW_LENGTH * self.__FIELD.size
+
+        self.__block = shared_memory_block.SharedMemoryBlock(
+            self.__HEADER_SIZE + max_process_count * self.__row_size
+        )
+        # Keep a reference to skip the property lookup when recording
+        self.__buffer = self.__block.buf
+        self.__lock = mp.Lock()
+
+        # Per process: row offset and a copy of the row, since only this process writes it
+        self.__row_pid = os.getpid()
+        self.__row_offset: "int | None" = None
+        self.__row: "list[int]" = []
+
+    def __getstate__(self) -> dict:
+        """
+        The buffer is recreated from the block.
+        """
+        state = self.__dict__.copy()
+        del state["_QueueStatistics__buffer"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attaches to the block.
+        """
+        self.__dict__.update(state)
+        self.__buffer = self.__block.buf
+
+    def __take_row(self) -> bool:
+        """
+        Takes a row for this process if it does not have one.
+
+        Returns whether this process has a row.
+        """
+        if self.__row_pid != os.getpid():
+            self.__row_pid = os.getpid()
+            self.__row_offset = None
+
+        if self.__row_offset is not None:
+            return True
+
+        with self.__lock:
+            (row_count,) = self.__ROW_COUNT.unpack_from(self.__buffer, 0)
+            if row_count >= self.__max_process_count:
+                return False
+
+            self.__ROW_COUNT.pack_into(self.__buffer, 0, row_count + 1)
+
+        self.__row_offset = self.__HEADER_SIZE + row_count * self.__row_size
+        self.__row = [0] * self.__ROW_LENGTH
+        self.__row[0] = os.getpid()
+        return True
+
+    def __record_duration(self, field: int, duration_ns: int) -> None:
+        """
+        Adds the duration to its count, total, and histogram.
+        Only the histogram is written, the totals are written by the caller.
+
+        field: Count field of the duration.
+        """
+        row = self.__row
+        row[field] += 1
+        row[field + 1] += duration_ns
+
+        bucket = min((duration_ns // 1000).bit_length(), self.HISTOGRAM_BUCKET_COUNT - 1)
+        histogram = (field - self.__BLOCKED_PUT_FIELD) // 2
+        histogram_field = self.__HISTOGRAM_FIELD + histogram * self.HISTOGRAM_BUCKET_COUNT + bucket
+        row[histogram_field] += 1
+        self.__FIELD.pack_into(
+            self.__buffer,
+            self.__row_offset + histogram_field * self.__FIELD.size,
+            row[histogram_field],
+        )
+
+    def __write_totals(self) -> None:
+        """
+        Writes the process ID and totals of the row of this process.
+        """
+        self.__TOTALS.pack_into(
+            self.__buffer, self.__row_offset, *self.__row[: self.__HISTOGRAM_FIELD]
+        )
+
+    def record_put(self, item_count: int, blocked_ns: "int | None") -> None:
+        """
+        Records items put into the queue.
+
+        blocked_ns: Time the put waited for space, None if the queue was not full.
+        """
+        if not self.__take_row():
+            return
+
+        row = self.__row
+        row[self.__PUT_COUNT_FIELD] += item_count
+        if blocked_ns is not None:
+            self.__record_duration(self.__BLOCKED_PUT_FIELD, blocked_ns)
+
+        # Put count of this row is not written yet
+        (row_count,) = self.__ROW_COUNT.unpack_from(self.__buffer, 0)
+        depth = item_count
+        for offset in range(
+            self.__HEADER_SIZE + self.__FIELD.size,
+            self.__HEADER_SIZE + row_count * self.__row_size,
+            self.__row_size,
+        ):
+            put_count, get_count, dropped_count = self.__DEPTH_COUNTS.unpack_from(
+                self.__buffer, offset
+            )
+            depth += put_count - get_count - dropped_count
+
+        row[self.__HIGH_WATER_FIELD] = max(row[self.__HIGH_WATER_FIELD], depth)
+        self.__write_totals()
+
+    def record_get(self, item_count: int, waited_ns: "int | None", dwell_ns: "int | None") -> None:
+        """
+        Records items removed from the queue.
+
+        waited_ns: Time the get waited for an item, None if the queue was not empty.
+        dwell_ns: Time the items spent in the queue, None if unknown.
+        """
+        if not self.__take_row():
+            return
+
+        self.__row[self.__GET_COUNT_FIELD] += item_count
+        if waited_ns is not None:
+            self.__record_duration(self.__WAITING_GET_FIELD, waited_ns)
+
+        if dwell_ns is not None:
+            self.__record_duration(self.__DWELL_FIELD, max(dwell_ns, 0))
+
+        self.__write_totals()
+
+    def record_drop(self, item_count: int, oldest: bool) -> None:
+        """
+        Records items dropped by the overflow policy.
+
+        oldest: Whether the items were removed from the queue,
+            otherwise they were dropped instead of being put.
+        """
+        if not self.__take_row():
+            return
+
+        if oldest:
+            self.__row[self.__DROPPED_OLDEST_FIELD] += item_count
+        else:
+            self.__row[self.__DROPPED_NEWEST_FIELD] += item_count
+
+        self.__write_totals()
+
+    def sample(self) -> QueueStatisticsSample:
+        """
+        Returns the totals over all processes.
+        """
+        (row_count,) = self.__ROW_COUNT.unpack_from(self.__buffer, 0)
+        sample_time = time.monotonic()
+
+        sums = [0] * self.__ROW_LENGTH
+        high_water_depth = 0
+        for row in range(row_count):
+            values = struct.unpack_from(
+                f"={self.__ROW_LENGTH}Q",
+                self.__buffer,
+                self.__HEADER_SIZE + row * self.__row_size,
+            )
+            sums = [total + value for total, value in zip(sums, values)]
+            high_water_depth = max(high_water_depth, values[self.__HIGH_WATER_FIELD])
+
+        totals = dict(zip(self.__TOTAL_NAMES, sums[1 : self.__HISTOGRAM_FIELD]))
+        histograms = {}
+        for i, histogram_name in enumerate(self.HISTOGRAM_NAMES):
+            start = self.__HISTOGRAM_FIELD + i * self.HISTOGRAM_BUCKET_COUNT
+            histograms[histogram_name] = sums[start : start + self.HISTOGRAM_BUCKET_COUNT]
+
+        return QueueStatisticsSample(self.name, sample_time, totals, high_water_depth, histograms)
+
+
+def dump_statistics(
+    statistics: "list[QueueStatistics]", directory: "str | pathlib.Path"
+) -> "tuple[bool, pathlib.Path | None]":
+    """
+    Writes a sample of each queue to a timestamped JSON file in the directory.
+
+    Returns whether the file was written and its path.
+    """
+    path = pathlib.Path(directory, f"queue_statistics_{time.strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    samples = [entry.sample().to_dict() for entry in statistics]
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(samples, indent=4), encoding="utf-8")
+    except OSError:
+        return False, None
+
+    return True, path
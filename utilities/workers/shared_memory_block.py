@@ -0,0 +1,89 @@
+"""
+Shared memory segment.
+"""
+
+import os
+import weakref
+from multiprocessing import shared_memory
+
+
+class SharedMemoryBlock:
+    """
+    Wrapper for a shared memory segment which is unlinked by the process that created it.
+
+    Can be passed to worker processes as an argument, where it attaches to the same segment.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Constructor creates the segment, zero filled.
+
+        size: Size in bytes, must be greater than 0 .
+        """
+        self.__memory = shared_memory.SharedMemory(create=True, size=size)
+        self.__memory.buf[:] = bytes(self.__memory.size)
+        self.__finalizer = weakref.finalize(
+            self,
+            SharedMemoryBlock.__release,
+            self.__memory,
+            os.getpid(),
+        )
+
+    @staticmethod
+    def __release(memory: shared_memory.SharedMemory, owner_pid: int) -> None:
+        """
+        Closes and unlinks the segment.
+        Forked processes inherit the finalizer, so only the creator unlinks.
+        """
+        if os.getpid() != owner_pid:
+            return
+
+        try:
+            memory.close()
+        except BufferError:
+            # A view is still exported, the mapping is released on process exit
+            pass
+
+        memory.unlink()
+
+    def __getstate__(self) -> "dict":
+        """
+        Only the segment is sent to other processes, which attach to it by name.
+        """
+        return {"memory": self.__memory}
+
+    def __setstate__(self, state: "dict") -> None:
+        """
+        Attached processes do not own the segment.
+        """
+        self.__memory = state["memory"]
+        self.__finalizer = None
+
+    @property
+    def buf(self) -> memoryview:
+        """
+        Returns the memory of the segment.
+        """
+        return self.__memory.buf
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name of the segment, the same in every process attached to it.
+        """
+        return self.__memory.name
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the segment in bytes.
+        """
+        return self.__memory.size
+
+    def unlink(self) -> None:
+        """
+        Releases the segment early.
+        Does nothing if not the owner or already released.
+        """
+        if self.__finalizer is not None:
+            self.__finalizer()
@@ -0,0 +1,250 @@
+"""
+Latest value channel over shared memory.
+"""
+
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import struct
+
+from . import queue_shutdown
+from . import shared_memory_block
+
+
+class SharedMemoryMailbox:
+    """
+    Single slot channel with the same interface as `queue.Queue` ,
+    where a put overwrites the previous item instead of blocking.
+
+    Writers are serialized by a lock and bracket each write with a sequence counter (seqlock),
+    so readers copy the slot without taking the lock and retry if a write overlapped.
+    Each reader process gets the newest item once, and can ask how many it skipped.
+    """
+
+    DEFAULT_SLOT_SIZE = 4096  # bytes
+
+    # Header: sequence counter (odd while a write is in progress), item length,
+    # then the shut down flag (2 if the item was discarded)
+    __HEADER_FORMAT = "=QI"
+    __SHUTDOWN_OFFSET = 16
+    __SEQUENCE_FORMAT = "=Q"
+    __HEADER_SIZE = 64  # bytes
+
+    def __init__(self, slot_size: int = DEFAULT_SLOT_SIZE) -> None:
+        """
+        Constructor creates the slot and synchronization primitives.
+
+        slot_size: Maximum size in bytes of a pickled item.
+        """
+        if slot_size <= 0:
+            raise ValueError("Slot size must be greater than 0")
+
+        self.maxsize = 1
+        self.__slot_size = slot_size
+
+        self.__block = shared_memory_block.SharedMemoryBlock(self.__HEADER_SIZE + slot_size)
+
+        self.__write_lock = mp.Lock()
+        self.__written = mp.Condition(self.__write_lock)
+
+        # Number of the last write seen by the reader process, forked copies start from 0
+        self.__reader_pid = os.getpid()
+        self.__last_write_count_value = 0
+
+    @property
+    def __last_write_count(self) -> int:
+        """
+        Number of the last write seen by this process.
+        """
+        if self.__reader_pid != os.getpid():
+            self.__reader_pid = os.getpid()
+            self.__last_write_count_value = 0
+
+        return self.__last_write_count_value
+
+    def __write_count(self) -> int:
+        """
+        Number of completed writes.
+        """
+        (sequence,) = struct.unpack_from(self.__SEQUENCE_FORMAT, self.__block.buf, 0)
+        return sequence // 2
+
+    def __has_new_item(self) -> bool:
+        """
+        Whether there is an item not yet seen by this process.
+        """
+        return (
+            self.__write_count() > self.__last_write_count
+            and self.__block.buf[self.__SHUTDOWN_OFFSET] != 2
+        )
+
+    def __write(self, data: bytes, write_count: int) -> None:
+        """
+        Overwrites the slot, counting write_count writes. Lock must be held.
+        """
+        buffer = self.__block.buf
+        (sequence,) = struct.unpack_from(self.__SEQUENCE_FORMAT, buffer, 0)
+
+        struct.pack_into(self.__HEADER_FORMAT, buffer, 0, sequence + 1, len(data))
+        buffer[self.__HEADER_SIZE : self.__HEADER_SIZE + len(data)] = data
+        struct.pack_into(self.__SEQUENCE_FORMAT, buffer, 0, sequence + 2 * write_count)
+
+        self.__written.notify_all()
+
+    def __read(self) -> "tuple[bytes, int]":
+        """
+        Copies the slot, retrying while a write is in progress.
+
+        Returns the pickled item and the number of writes it corresponds to.
+        """
+        buffer = self.__block.buf
+        while True:
+            sequence, length = struct.unpack_from(self.__HEADER_FORMAT, buffer, 0)
+            if sequence % 2 == 1:
+                continue
+
+            data = bytes(buffer[self.__HEADER_SIZE : self.__HEADER_SIZE + length])
+            (sequence_after,) = struct.unpack_from(self.__SEQUENCE_FORMAT, buffer, 0)
+            if sequence_after == sequence:
+                return data, sequence // 2
+
+    def __put_pickled(self, data: bytes, write_count: int) -> None:
+        """
+        Checks the size and overwrites the slot.
+        """
+        if len(data) > self.__slot_size:
+            raise ValueError(f"Item of {len(data)} bytes exceeds slot size {self.__slot_size}")
+
+        with self.__write_lock:
+            if self.is_shut_down():
+                raise queue_shutdown.ShutDown
+
+            self.__write(data, write_count)
+
+    # Same signature as queue.Queue
+    # pylint: disable-next=unused-argument
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Overwrites the item, never blocks.
+
+        block and timeout: Unused, for compatibility with `queue.Queue.put()` .
+
+        Raises `ShutDown` if the mailbox is shut down.
+        Raises `ValueError` if the pickled item is larger than the slot size.
+        """
+        self.__put_pickled(pickle.dumps(item, pickle.HIGHEST_PROTOCOL), 1)
+
+    def put_many(self, items: "list[object]") -> None:
+        """
+        Overwrites the item with the last of items, counting the others as skipped.
+        """
+        if len(items) == 0:
+            return
+
+        self.__put_pickled(pickle.dumps(items[-1], pickle.HIGHEST_PROTOCOL), len(items))
+
+    def get_latest(
+        self, block: bool = True, timeout: "float | None" = None
+    ) -> "tuple[object, int]":
+        """
+        Returns the newest item not yet seen by this process.
+
+        block and timeout: Same as `queue.Queue.get()` , waiting for a write.
+
+        Returns the item and the number of items written since the last get that were overwritten.
+        Raises `queue.Empty` if there is no new item in time.
+        Raises `ShutDown` if the mailbox is shut down and there is no new item.
+        """
+        if self.__has_new_item():
+            data, write_count = self.__read()
+        elif self.is_shut_down():
+            raise queue_shutdown.ShutDown
+        elif not block:
+            raise queue.Empty
+        else:
+            if timeout is not None and timeout < 0.0:
+                raise ValueError("'timeout' must be a non-negative number")
+
+            with self.__write_lock:
+                if not self.__written.wait_for(
+                    lambda: self.__has_new_item() or self.is_shut_down(),
+                    timeout,
+                ):
+                    raise queue.Empty
+
+                if not self.__has_new_item():
+                    raise queue_shutdown.ShutDown
+
+                # No writer can be in progress while the lock is held
+                data, write_count = self.__read()
+
+        skipped = write_count - self.__last_write_count - 1
+        self.__last_write_count_value = write_count
+
+        return pickle.loads(data), skipped
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Returns the newest item not yet seen by this process.
+
+        block and timeout: Same as `queue.Queue.get()` .
+
+        Raises `queue.Empty` if there is no new item in time.
+        Raises `ShutDown` if the mailbox is shut down and there is no new item.
+        """
+        item, _ = self.get_latest(block, timeout)
+        return item
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Same as `put(item, False)` .
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Same as `get(False)` .
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Returns 1 if there is an item not yet seen by this process, otherwise 0 .
+        """
+        return 1 if self.__has_new_item() else 0
+
+    def empty(self) -> bool:
+        """
+        Returns whether there is no item not yet seen by this process.
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Writes never block, so the mailbox is never full.
+        """
+        return False
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Shuts down the mailbox and wakes up all blocked readers.
+
+        immediate: Whether to discard the item, otherwise readers that have not seen it get it.
+        """
+        with self.__write_lock:
+            self.__block.buf[self.__SHUTDOWN_OFFSET] = 2 if immediate else 1
+            self.__written.notify_all()
+
+    def is_shut_down(self) -> bool:
+        """
+        Returns whether the mailbox has been shut down.
+        """
+        return self.__block.buf[self.__SHUTDOWN_OFFSET] != 0
+
+    def unlink(self) -> None:
+        """
+        Releases the shared memory early, only valid in the creating process.
+        The mailbox must not be used afterwards.
+        """
+        self.__block.unlink()
@@ -0,0 +1,233 @@
+"""
+Queue over shared memory.
+"""
+
+import multiprocessing as mp
+import pickle
+import queue
+import struct
+
+from . import queue_shutdown
+from . import shared_memory_block
+
+
+class SharedMemoryQueue:
+    """
+    Bounded multi-producer multi-consumer queue with the same interface as `queue.Queue` .
+
+    Items are pickled into fixed size slots of a ring buffer in shared memory,
+    so transfers do not go through a manager server process.
+    """
+
+    DEFAULT_SLOT_SIZE = 4096  # bytes
+
+    # Header: total number of puts, total number of gets, then the shut down flag
+    __HEADER_FORMAT = "=QQ"
+    __SHUTDOWN_OFFSET = 16
+    __HEADER_SIZE = 64  # bytes
+    # Slot: item length followed by the pickled item
+    __LENGTH_FORMAT = "=I"
+    __LENGTH_SIZE = struct.calcsize(__LENGTH_FORMAT)
+
+    def __init__(self, maxsize: int, slot_size: int = DEFAULT_SLOT_SIZE) -> None:
+        """
+        Constructor creates the ring buffer and synchronization primitives.
+
+        maxsize: Number of slots, must be greater than 0 .
+        slot_size: Maximum size in bytes of a pickled item.
+        """
+        if maxsize <= 0:
+            raise ValueError("Shared memory queue must be bounded")
+
+        if slot_size <= 0:
+            raise ValueError("Slot size must be greater than 0")
+
+        self.maxsize = maxsize
+        self.__slot_size = slot_size
+        self.__stride = self.__LENGTH_SIZE + slot_size
+
+        self.__block = shared_memory_block.SharedMemoryBlock(
+            self.__HEADER_SIZE + maxsize * self.__stride,
+        )
+
+        self.__lock = mp.Lock()
+        self.__not_empty = mp.Condition(self.__lock)
+        self.__not_full = mp.Condition(self.__lock)
+
+    def __read_counts(self) -> "tuple[int, int]":
+        """
+        Returns total puts and total gets. Lock must be held.
+        """
+        return struct.unpack_from(self.__HEADER_FORMAT, self.__block.buf, 0)
+
+    def __write_counts(self, put_count: int, get_count: int) -> None:
+        """
+        Writes total puts and total gets. Lock must be held.
+        """
+        struct.pack_into(self.__HEADER_FORMAT, self.__block.buf, 0, put_count, get_count)
+
+    def __is_shut_down(self) -> bool:
+        """
+        Whether the queue has been shut down.
+        """
+        return self.__block.buf[self.__SHUTDOWN_OFFSET] != 0
+
+    def __size(self) -> int:
+        """
+        Number of items. Lock must be held.
+        """
+        put_count, get_count = self.__read_counts()
+        return put_count - get_count
+
+    @staticmethod
+    def __wait(
+        condition: "mp.synchronize.Condition",
+        predicate: "() -> bool",  # type: ignore
+        block: bool,
+        timeout: "float | None",
+    ) -> bool:
+        """
+        Waits until the predicate is true. Lock must be held.
+
+        Returns whether the predicate is true.
+        """
+        if not block:
+            return predicate()
+
+        if timeout is None:
+            return condition.wait_for(predicate)
+
+        if timeout < 0.0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        return condition.wait_for(predicate, timeout)
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Puts an item into the queue.
+
+        block and timeout: Same as `queue.Queue.put()` .
+
+        Raises `queue.Full` if there is no free slot in time.
+        Raises `ShutDown` if the queue is shut down.
+        Raises `ValueError` if the pickled item is larger than the slot size.
+        """
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.__slot_size:
+            raise ValueError(f"Item of {len(data)} bytes exceeds slot size {self.__slot_size}")
+
+        with self.__lock:
+            self.__wait(
+                self.__not_full,
+                lambda: self.__size() < self.maxsize or self.__is_shut_down(),
+                block,
+                timeout,
+            )
+            if self.__is_shut_down():
+                raise queue_shutdown.ShutDown
+
+            if self.__size() >= self.maxsize:
+                raise queue.Full
+
+            put_count, get_count = self.__read_counts()
+            offset = self.__HEADER_SIZE + (put_count % self.maxsize) * self.__stride
+            buffer = self.__block.buf
+            struct.pack_into(self.__LENGTH_FORMAT, buffer, offset, len(data))
+            start = offset + self.__LENGTH_SIZE
+            buffer[start : start + len(data)] = data
+            self.__write_counts(put_count + 1, get_count)
+
+            self.__not_empty.notify()
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Removes and returns an item from the queue.
+
+        block and timeout: Same as `queue.Queue.get()` .
+
+        Raises `queue.Empty` if there is no item in time.
+        Raises `ShutDown` if the queue is shut down and empty.
+        """
+        with self.__lock:
+            if not self.__wait(
+                self.__not_empty,
+                lambda: self.__size() > 0 or self.__is_shut_down(),
+                block,
+                timeout,
+            ):
+                raise queue.Empty
+
+            if self.__size() == 0:
+                raise queue_shutdown.ShutDown
+
+            put_count, get_count = self.__read_counts()
+            offset = self.__HEADER_SIZE + (get_count % self.maxsize) * self.__stride
+            buffer = self.__block.buf
+            (length,) = struct.unpack_from(self.__LENGTH_FORMAT, buffer, offset)
+            start = offset + self.__LENGTH_SIZE
+            data = bytes(buffer[start : start + length])
+            self.__write_counts(put_count, get_count + 1)
+
+            self.__not_full.notify()
+
+        return pickle.loads(data)
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Same as `put(item, False)` .
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Same as `get(False)` .
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Returns the number of items in the queue.
+        """
+        with self.__lock:
+            return self.__size()
+
+    def empty(self) -> bool:
+        """
+        Returns whether the queue is empty.
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Returns whether the queue is full.
+        """
+        return self.qsize() >= self.maxsize
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Shuts down the queue and wakes up all blocked producers and consumers.
+
+        immediate: Whether to discard the items in the queue,
+            otherwise gets return them until it is empty.
+        """
+        with self.__lock:
+            self.__block.buf[self.__SHUTDOWN_OFFSET] = 1
+            if immediate:
+                put_count, _ = self.__read_counts()
+                self.__write_counts(put_count, put_count)
+
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+    def is_shut_down(self) -> bool:
+        """
+        Returns whether the queue has been shut down.
+        """
+        return self.__is_shut_down()
+
+    def unlink(self) -> None:
+        """
+        Releases the shared memory early, only valid in the creating process.
+        The queue must not be used afterwards.
+        """
+        self.__block.unlink()
@@ -0,0 +1,232 @@
+"""
+Periodic tasks on absolute deadlines in one thread.
+"""
+
+import time
+
+
+class PeriodicTask:  # pylint: disable=too-many-instance-attributes
+    """
+    Task of a `TimerWheel` , with its lateness.
+
+    The lateness histogram counts how long after its deadline each run started,
+    in buckets of powers of 2 microseconds like the queue statistics:
+    bucket 0 is below 1 us, bucket i is [2^(i-1), 2^i) us, and the last bucket has no upper bound.
+    """
+
+    HISTOGRAM_BUCKET_COUNT = 24
+
+    def __init__(
+        self, name: str, period: float, callback: "() -> object", deadline: float  # type: ignore
+    ) -> None:
+        """
+        period: Seconds between deadlines.
+        callback: Called on each deadline.
+        deadline: Monotonic time of the first run, in seconds.
+        """
+        self.name = name
+        self.period = period
+        self.callback = callback
+        self.deadline = deadline
+        # Deadline in ticks of the wheel, set when scheduled
+        self.deadline_tick = 0
+
+        self.run_count = 0
+        # Deadlines passed by more than a period, skipped instead of run late in a burst
+        self.missed_count = 0
+        self.max_lateness = 0.0
+        self.lateness_histogram = [0] * self.HISTOGRAM_BUCKET_COUNT
+
+    def record_lateness(self, lateness: float) -> None:
+        """
+        Records how late a run started, in seconds.
+        """
+        self.max_lateness = max(self.max_lateness, lateness)
+        lateness_us = max(int(lateness * 1e6), 0)
+        self.lateness_histogram[min(lateness_us.bit_length(), self.HISTOGRAM_BUCKET_COUNT - 1)] += 1
+
+    def get_lateness_percentile(self, percentile: float) -> "float | None":
+        """
+        Upper bound of the histogram bucket containing the percentile.
+
+        percentile: Between 0 and 100.
+
+        Returns the bound in seconds, infinity for the last bucket, or None without runs.
+        """
+        total = sum(self.lateness_histogram)
+        if total == 0:
+            return None
+
+        rank = total * percentile / 100
+        count = 0
+        for bucket, bucket_count in enumerate(self.lateness_histogram[:-1]):
+            count += bucket_count
+            if count >= rank and bucket_count > 0:
+                return 2**bucket / 1e6
+
+        return float("inf")
+
+    def summary(self) -> str:
+        """
+        Single line description of the runs and lateness.
+        """
+        median = self.get_lateness_percentile(50)
+        p99 = self.get_lateness_percentile(99)
+        if median is None or p99 is None:
+            return f"{self.name}: no runs"
+
+        return (
+            f"{self.name}: {self.run_count} runs, missed {self.missed_count}, "
+            f"late by under {median * 1e3:.3f} ms median, {p99 * 1e3:.3f} ms p99, "
+            f"max {self.max_lateness * 1e3:.3f} ms"
+        )
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel running periodic tasks on the monotonic clock.
+
+    Time is divided into ticks, and each task is in the slot of its deadline tick modulo
+    the number of slots, so finding the due tasks only looks at the slots of the ticks passed.
+    Each deadline is the previous one plus the period, not the run time plus the period,
+    so the time taken by the callbacks and late wake ups do not accumulate as drift.
+    """
+
+    DEFAULT_TICK = 0.001  # seconds
+    DEFAULT_SLOT_COUNT = 512
+
+    def __init__(self, tick: float = DEFAULT_TICK, slot_count: int = DEFAULT_SLOT_COUNT) -> None:
+        """
+        tick: Seconds per slot, deadlines are exact regardless.
+        slot_count: Number of slots, tasks with longer periods stay in their slot for rotations.
+        """
+        self.__tick = tick
+        self.__slots: "list[list[PeriodicTask]]" = [[] for _ in range(slot_count)]
+        self.__tasks: "dict[str, PeriodicTask]" = {}
+        # Every slot of earlier ticks has been run
+        self.__current_tick: "int | None" = None
+
+    def __schedule(self, task: PeriodicTask) -> None:
+        """
+        Puts the task in the slot of its deadline, or of the current tick if it has passed.
+        """
+        task.deadline_tick = max(int(task.deadline / self.__tick), self.__current_tick)
+        self.__slots[task.deadline_tick % len(self.__slots)].append(task)
+
+    def add_task(
+        self,
+        name: str,
+        period: float,
+        callback: "() -> object",  # type: ignore
+        start: "float | None" = None,
+    ) -> PeriodicTask:
+        """
+        Adds a task, replacing any with the same name.
+
+        period: Seconds between runs, greater than 0.
+        callback: Called with no arguments on each deadline.
+        start: Monotonic time of the first run in seconds, None for now.
+
+        Returns the task, for its statistics.
+        """
+        self.remove_task(name)
+        start = time.monotonic() if start is None else start
+        task = PeriodicTask(name, period, callback, start)
+        if self.__current_tick is None:
+            self.__current_tick = int(start / self.__tick)
+
+        self.__tasks[name] = task
+        self.__schedule(task)
+        return task
+
+    def remove_task(self, name: str) -> bool:
+        """
+        Returns whether there was a task with the name.
+        """
+        task = self.__tasks.pop(name, None)
+        if task is None:
+            return False
+
+        self.__slots[task.deadline_tick % len(self.__slots)].remove(task)
+        return True
+
+    def get_tasks(self) -> "list[PeriodicTask]":
+        """
+        Returns the tasks in the order they were added.
+        """
+        return list(self.__tasks.values())
+
+    def run_pending(self, now: "float | None" = None) -> int:
+        """
+        Runs the tasks with deadlines up to now, in deadline order within a tick.
+
+        now: Monotonic time in seconds, None for the current time.
+
+        Returns the number of callbacks run.
+        """
+        if self.__current_tick is None:
+            return 0
+
+        now = time.monotonic() if now is None else now
+        now_tick = int(now / self.__tick)
+        # After a full rotation every slot has been looked at
+        first_tick = max(self.__current_tick, now_tick - len(self.__slots) + 1)
+        run_count = 0
+        for tick in range(first_tick, now_tick + 1):
+            slot = self.__slots[tick % len(self.__slots)]
+            due = [task for task in slot if task.deadline_tick <= tick and task.deadline <= now]
+            if len(due) == 0:
+                continue
+
+            slot[:] = [task for task in slot if task not in due]
+            due.sort(key=lambda task: task.deadline)
+            for task in due:
+                task.record_lateness(now - task.deadline)
+                task.callback()
+                task.run_count += 1
+                run_count += 1
+
+                task.deadline += task.period
+                if task.deadline <= now:
+                    missed = int((now - task.deadline) / task.period) + 1
+                    task.missed_count += missed
+                    task.deadline += missed * task.period
+
+                # Removed by its callback
+                if self.__tasks.get(task.name) is task:
+                    self.__schedule(task)
+
+        # The slot of the current tick may still have tasks due later in the tick
+        self.__current_tick = now_tick
+        return run_count
+
+    def get_next_deadline(self) -> "float | None":
+        """
+        Returns the monotonic time of the earliest deadline in seconds, None without tasks.
+        """
+        if len(self.__tasks) == 0 or self.__current_tick is None:
+            return None
+
+        # Nearest slots first, the earliest task is usually within a rotation
+        for offset in range(len(self.__slots)):
+            tick = self.__current_tick + offset
+            deadlines = [
+                task.deadline
+                for task in self.__slots[tick % len(self.__slots)]
+                if task.deadline_tick <= tick
+            ]
+            if len(deadlines) > 0:
+                return min(deadlines)
+
+        return min(task.deadline for task in self.__tasks.values())
+
+    def get_timeout(self, now: "float | None" = None) -> "float | None":
+        """
+        Returns seconds until the earliest deadline, 0 if it has passed, None without tasks.
+        """
+        deadline = self.get_next_deadline()
+        if deadline is None:
+            return None
+
+        now = time.monotonic() if now is None else now
+        return max(deadline - now, 0.0)
@@ -2,71 +2,414 @@
 For controlling workers.
 """
 
+import enum
 import multiprocessing as mp
+import os
+import queue
+import struct
 import time
 
+from pymavlink import mavutil
 
-class WorkerController:
+from . import queue_notifier
+from . import queue_proxy_wrapper
+from . import shared_memory_block
+
+
+class WorkerStatus(enum.Enum):
+    """
+    Status word reported by a worker process.
+    """
+
+    # 0 marks an unused slot
+    RUNNING = 1
+    PAUSED = 2
+    EXITED = 3
+
+
+class WorkerController:  # pylint: disable=too-many-instance-attributes
     """
     For interprocess communication from main to worker.
     Contains exit and pause requests.
+
+    The requests are flags in a shared memory control block, so checking them is a single read.
+    The block also holds a generation counter incremented on every request,
+    and one status word per worker process.
+
+    Every request also notifies `notifier` . Queues created with it as their notifier,
+    and MAVLink routers created with it, wake up blocked gets and receives of the controller
+    both when an item arrives and when exit is requested, in a single blocking wait.
     """
 
-    __QUEUE_DELAY = 0.1  # seconds
+    DEFAULT_MAX_WORKER_COUNT = 32
+    DEFAULT_EXIT_CHECK_PERIOD = 0.01  # seconds
+
+    # Control block: exit flag, pause flag, generation counter, registered worker count
+    # The flag checks index the buffer with literals, the offsets must match
+    __EXIT_OFFSET = 0
+    __PAUSE_OFFSET = 1
+    __COUNTER_FORMAT = "=Q"
+    __GENERATION_OFFSET = 8
+    __WORKER_COUNT_OFFSET = 16
+    __HEADER_SIZE = 64  # bytes
+
+    # Worker slot: process ID, status
+    __SLOT_FORMAT = "=QQ"
+    __SLOT_SIZE = struct.calcsize(__SLOT_FORMAT)
+
+    def __init__(
+        self,
+        max_worker_count: int = DEFAULT_MAX_WORKER_COUNT,
+        exit_check_period: float = DEFAULT_EXIT_CHECK_PERIOD,
+    ) -> None:
+        """
+        Constructor creates the control block and the condition paused workers wait on.
+
+        max_worker_count: Maximum number of worker processes that can report a status.
+        exit_check_period: Longest in seconds a get or receive that cannot be woken up blocks
+            before checking for exit: on a queue without `notifier` or on a MAVLink connection.
+            The default of 10 ms keeps the exit latency far below the shutdown timeouts of main
+            and below a telemetry period at 50 Hz, for 100 wake ups per second of a blocked worker.
+        """
+        if max_worker_count <= 0:
+            raise ValueError("Maximum worker count must be greater than 0")
+
+        self.__max_worker_count = max_worker_count
+        self.__exit_check_period = exit_check_period
+
+        self.__block = shared_memory_block.SharedMemoryBlock(
+            self.__HEADER_SIZE + max_worker_count * self.__SLOT_SIZE
+        )
+        # Keep a reference to skip the property lookup in the flag checks
+        self.__buffer = self.__block.buf
+
+        self.__lock = mp.Lock()
+        self.__changed = mp.Condition(self.__lock)
+
+        self.notifier = queue_notifier.QueueNotifier()
+
+        # Slot of the worker in this process, forked copies have none
+        self.__slot_pid = os.getpid()
+        self.__slot_index_value: "int | None" = None
+
+    def __getstate__(self) -> dict:
+        """
+        The buffer is recreated from the block.
+        """
+        state = self.__dict__.copy()
+        del state["_WorkerController__buffer"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attaches to the control block.
+        """
+        self.__dict__.update(state)
+        self.__buffer = self.__block.buf
 
-    def __init__(self) -> None:
+    def __set_flag(self, offset: int, value: bool) -> None:
         """
-        Constructor creates internal queue and semaphore.
+        Sets the flag and wakes up waiting workers if it changed.
         """
-        self.__pause = mp.BoundedSemaphore(1)
-        self.__is_paused = False
-        self.__exit_queue = mp.Queue(1)
+        with self.__lock:
+            if self.__buffer[offset] == int(value):
+                return
+
+            self.__buffer[offset] = int(value)
+            (generation,) = struct.unpack_from(
+                self.__COUNTER_FORMAT, self.__buffer, self.__GENERATION_OFFSET
+            )
+            struct.pack_into(
+                self.__COUNTER_FORMAT, self.__buffer, self.__GENERATION_OFFSET, generation + 1
+            )
+            self.__changed.notify_all()
+
+        self.notifier.notify()
 
     def request_pause(self) -> None:
         """
         Requests worker processes to pause.
         """
-        if not self.__is_paused:
-            self.__pause.acquire()
-            self.__is_paused = True
+        self.__set_flag(self.__PAUSE_OFFSET, True)
 
     def request_resume(self) -> None:
         """
         Requests worker processes to resume.
         """
-        if self.__is_paused:
-            self.__pause.release()
-            self.__is_paused = False
+        self.__set_flag(self.__PAUSE_OFFSET, False)
 
     def check_pause(self) -> None:
         """
         Blocks worker if main has requested it to pause, otherwise continues.
+        Returns early if exit is requested while paused.
         """
-        self.__pause.acquire()
-        self.__pause.release()
+        if not self.__buffer[1]:
+            return
+
+        self.__report_if_registered(WorkerStatus.PAUSED)
+        with self.__lock:
+            self.__changed.wait_for(lambda: not self.__buffer[1] or self.__buffer[0])
+        self.__report_if_registered(WorkerStatus.RUNNING)
 
     def request_exit(self) -> None:
         """
         Requests worker processes to exit.
         Does nothing if already requested.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if self.__exit_queue.empty():
-            self.__exit_queue.put(None)
+        self.__set_flag(self.__EXIT_OFFSET, True)
 
     def clear_exit(self) -> None:
         """
         Clears the exit request condition.
         Does nothing if already cleared.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if not self.__exit_queue.empty():
-            _ = self.__exit_queue.get()
+        self.__set_flag(self.__EXIT_OFFSET, False)
 
     def is_exit_requested(self) -> bool:
         """
         Returns whether main has requested the worker process to exit.
-        There is a race condition, but it's fine because the worker process
-        will do at most 1 additional loop.
         """
-        return not self.__exit_queue.empty()
+        return self.__buffer[0] != 0
+
+    def wait(self, timeout: "float | None" = None) -> bool:
+        """
+        Sleeps until the timeout or until exit is requested, whichever is first.
+
+        timeout: Seconds, None to wait for exit only.
+
+        Returns whether exit was requested.
+        """
+        if self.__buffer[0]:
+            return True
+
+        with self.__lock:
+            return self.__changed.wait_for(lambda: self.__buffer[0] != 0, timeout)
+
+    def __poll(
+        self,
+        function: "(float) -> object",  # type: ignore
+        timeout: "float | None",
+        notifier: "queue_notifier.QueueNotifier | None",
+    ) -> object:
+        """
+        Calls function until it returns an item, the timeout expires, or exit is requested.
+
+        function: Takes the timeout in seconds,
+        returns None or raises `queue.Empty` if nothing was received.
+        notifier: Notified when function may have an item. If it is the same as `notifier` ,
+            function does not block and waits block on the notifier, otherwise
+            function blocks for at most the exit check period at a time.
+
+        Returns the item or None.
+        """
+        if notifier == self.notifier:
+            return self.__wait_notified(function, timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.__buffer[0]:
+            period = self.__exit_check_period
+            if deadline is not None:
+                period = min(period, max(deadline - time.monotonic(), 0.0))
+
+            try:
+                item = function(period)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                return item
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        return None
+
+    def __wait_notified(self, function: "(float) -> object", timeout: "float | None") -> object:  # type: ignore
+        """
+        Same as `__poll()` with every wait on `notifier` , which exit requests also notify.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Read before checking, so a notification after the check always wakes up the wait
+            generation = self.notifier.get_generation()
+            if self.__buffer[0]:
+                return None
+
+            try:
+                item = function(0.0)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                return item
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0.0:
+                return None
+
+            self.notifier.wait(generation, remaining)
+
+    def queue_get(
+        self, input_queue: queue_proxy_wrapper.QueueProxyWrapper, timeout: "float | None" = None
+    ) -> object:
+        """
+        Gets an item from the queue, returning early if exit is requested.
+
+        timeout: Seconds, None to wait until an item or exit.
+
+        Raises `queue.Empty` if there is no item in time or exit was requested.
+        """
+        # Wrap the item so that None is a valid item
+        items = self.__poll(
+            lambda period: [input_queue.get(timeout=period)], timeout, input_queue.notifier
+        )
+        if items is None:
+            raise queue.Empty
+
+        return items[0]
+
+    def queue_get_latest(
+        self, input_queue: queue_proxy_wrapper.QueueProxyWrapper, timeout: "float | None" = None
+    ) -> "tuple[object, int]":
+        """
+        Same as `queue_get()` but with `QueueProxyWrapper.get_latest()` .
+
+        Returns the newest item and the number of older items skipped.
+        """
+        result = self.__poll(
+            lambda period: input_queue.get_latest(timeout=period), timeout, input_queue.notifier
+        )
+        if result is None:
+            raise queue.Empty
+
+        return result
+
+    def recv_match(
+        self, connection: mavutil.mavfile, timeout: "float | None" = None, **kwargs: object
+    ) -> "object | None":
+        """
+        Receives a MAVLink message, returning early if exit is requested.
+
+        timeout: Seconds, None to wait until a message or exit.
+        kwargs: Other arguments of `recv_match()` , such as type.
+
+        Returns the message, or None if there is none in time or exit was requested.
+        """
+        # Routed connections have the notifier of their router, MAVLink connections have none
+        return self.__poll(
+            lambda period: connection.recv_match(blocking=True, timeout=period, **kwargs),
+            timeout,
+            getattr(connection, "notifier", None),
+        )
+
+    def get_generation(self) -> int:
+        """
+        Returns the number of pause, resume, exit, and clear requests that changed a flag.
+        """
+        (generation,) = struct.unpack_from(
+            self.__COUNTER_FORMAT, self.__buffer, self.__GENERATION_OFFSET
+        )
+        return generation
+
+    @property
+    def __slot_index(self) -> "int | None":
+        """
+        Slot of the worker in this process, None if it has not reported a status.
+        """
+        if self.__slot_pid != os.getpid():
+            self.__slot_pid = os.getpid()
+            self.__slot_index_value = None
+
+        return self.__slot_index_value
+
+    def __report_if_registered(self, status: WorkerStatus) -> None:
+        """
+        Updates the status if this process has a slot.
+        """
+        if self.__slot_index is not None:
+            self.report_status(status)
+
+    def report_status(self, status: WorkerStatus) -> bool:
+        """
+        Sets the status word of the worker in this process,
+        taking a slot on the first call.
+
+        Returns whether there was a slot available.
+        """
+        index = self.__slot_index
+        if index is None:
+            with self.__lock:
+                (index,) = struct.unpack_from(
+                    self.__COUNTER_FORMAT, self.__buffer, self.__WORKER_COUNT_OFFSET
+                )
+                if index >= self.__max_worker_count:
+                    return False
+
+                struct.pack_into(
+                    self.__COUNTER_FORMAT, self.__buffer, self.__WORKER_COUNT_OFFSET, index + 1
+                )
+
+            self.__slot_index_value = index
+
+        struct.pack_into(
+            self.__SLOT_FORMAT,
+            self.__buffer,
+            self.__HEADER_SIZE + index * self.__SLOT_SIZE,
+            os.getpid(),
+            status.value,
+        )
+
+        return True
+
+    def run_worker(self, target: "(...) -> object", args: "tuple") -> None:  # type: ignore
+        """
+        Calls the worker function as the target of its process,
+        reporting RUNNING before and EXITED after it returns.
+        A worker that raises stays RUNNING, so main can tell that it crashed.
+
+        target: Worker function.
+        args: Arguments of the worker function.
+        """
+        self.report_status(WorkerStatus.RUNNING)
+        target(*args)
+        self.report_status(WorkerStatus.EXITED)
+
+    def find_unfinished_workers(
+        self, workers: "list[mp.Process]"
+    ) -> "tuple[list[mp.Process], list[mp.Process]]":
+        """
+        Checks joined worker processes started with `run_worker()` .
+
+        Returns the workers still alive, and the workers that ended without reporting EXITED.
+        """
+        statuses = self.get_worker_statuses()
+        stuck_workers = []
+        crashed_workers = []
+        for worker in workers:
+            if worker.is_alive():
+                stuck_workers.append(worker)
+            elif statuses.get(worker.pid) != WorkerStatus.EXITED:
+                crashed_workers.append(worker)
+
+        return stuck_workers, crashed_workers
+
+    def get_worker_statuses(self) -> "dict[int, WorkerStatus]":
+        """
+        Returns the last reported status of each worker process by process ID.
+        """
+        (worker_count,) = struct.unpack_from(
+            self.__COUNTER_FORMAT, self.__buffer, self.__WORKER_COUNT_OFFSET
+        )
+
+        statuses = {}
+        for index in range(worker_count):
+            pid, status = struct.unpack_from(
+                self.__SLOT_FORMAT, self.__buffer, self.__HEADER_SIZE + index * self.__SLOT_SIZE
+            )
+            # Slot taken but not written yet
+            if status == 0:
+                continue
+
+            statuses[pid] = WorkerStatus(status)
+
+        return statuses
@@ -0,0 +1,32 @@
+"""
+Logger setup shared by the workers.
+"""
+
+import os
+import pathlib
+
+from modules.common.modules.logger import logger
+
+
+def create_worker_logger(worker_path: str) -> "tuple[bool, logger.Logger | None]":
+    """
+    Creates the logger of a worker, named after its module and process,
+    and logs that it is initialized.
+
+    worker_path: Path of the worker module, `__file__` .
+
+    Returns whether the logger was created and the logger. Prints an error if it was not.
+    """
+    worker_name = pathlib.Path(worker_path).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return False, None
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    return True, local_logger
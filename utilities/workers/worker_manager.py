@@ -110,6 +110,12 @@ class WorkerProperties:
         """
         return self.__input_queues
 
+    def get_controller(self) -> worker_controller.WorkerController:
+        """
+        Returns the worker controller.
+        """
+        return self.__controller
+
     def get_target_name(self) -> str:
         """
         Returns the name of the target.
@@ -178,16 +184,17 @@ class WorkerManager:
     @staticmethod
     def __create_single_worker(target: "(...) -> object", args: "tuple", local_logger: logger.Logger) -> "tuple[bool, mp.Process | None]":  # type: ignore
         """
-        Creates a single worker.
+        Creates a single worker, which reports its status through the controller.
 
         target: Function.
-        args: Target function arguments.
+        args: Target function arguments, ending with the controller.
         local_logger: Existing logger from process.
 
         Returns whether a worker was created and the worker.
         """
+        controller: worker_controller.WorkerController = args[-1]
         try:
-            worker = mp.Process(target=target, args=args)
+            worker = mp.Process(target=controller.run_worker, args=(target, args))
         # Catching all exceptions for library call
         # pylint: disable-next=broad-exception-caught
         except Exception as e:
@@ -203,12 +210,34 @@ class WorkerManager:
         for worker in self.__workers:
             worker.start()
 
-    def join_workers(self) -> None:
+    def join_workers(self, timeout: "float | None" = None) -> bool:
         """
-        Join workers.
+        Join workers, logging any that is stuck or has crashed.
+
+        timeout: Seconds to wait for each worker, None to wait until it exits.
+
+        Returns whether every worker exited normally.
         """
         for worker in self.__workers:
-            worker.join()
+            worker.join(timeout)
+
+        stuck_workers, crashed_workers = (
+            self.__worker_properties.get_controller().find_unfinished_workers(self.__workers)
+        )
+        for worker in stuck_workers:
+            self.__local_logger.error(
+                f"Worker stuck: {self.__worker_properties.get_target_name()} {worker.name}",
+                True,
+            )
+
+        for worker in crashed_workers:
+            self.__local_logger.error(
+                f"Worker crashed: {self.__worker_properties.get_target_name()} {worker.name}, "
+                f"exit code {worker.exitcode}",
+                True,
+            )
+
+        return len(stuck_workers) == 0 and len(crashed_workers) == 0
 
     def check_and_restart_dead_workers(self) -> bool:
         """